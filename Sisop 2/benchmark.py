@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Benchmark untuk File System Simulator
+
+Membangun tree sintetis yang deterministik (seed) dengan fan-out, depth
+dan distribusi ukuran file yang bisa diatur, lalu mengukur mkdir, touch,
+ls, find, cp -r, rm -r, save_filesystem dan load_filesystem untuk setiap
+ukuran tree. Setiap operasi dilaporkan sebagai ops/detik, latency p50/p99
+dan peak memory (tracemalloc, diukur terpisah agar tidak memperlambat
+timing). Hasil disimpan sebagai JSON sehingga bisa dibandingkan antar
+commit dengan --compare.
+
+Penggunaan:
+    python benchmark.py [--sizes 1000,10000,100000,1000000] [--fanout 10]
+                        [--files-per-dir 10] [--max-depth 8]
+                        [--size-dist fixed|uniform|lognormal|zero] [--mean-size 4096]
+                        [--seed 42] [--samples 200] [--ops mkdir,touch,...]
+                        [--storage snapshot|image|sharded] [--format binary|json]
+                        [--output benchmark_results.json]
+                        [--compare OLD.json] [--threshold 0.2]
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from file_system import FileSystemSimulator
+from disk_image import BYTES_PER_INODE
+
+OPERATIONS = ("mkdir", "touch", "ls", "find", "cp", "rm", "save", "load")
+SIZE_DISTRIBUTIONS = ("fixed", "uniform", "lognormal", "zero")
+EXTENSIONS = (".txt", ".py", ".log", ".bin")
+# Jumlah path file yang disimpan untuk dipilih acak oleh find
+FILE_SAMPLE = 10000
+# Cadangan entry untuk disk image: salinan cp/rm dan entry baru selama benchmark
+IMAGE_HEADROOM = 4
+
+
+class SyntheticTree:
+    """Ringkasan tree hasil generate_tree()"""
+    
+    def __init__(self):
+        self.directories: List[str] = []  # Tanpa root
+        self.sample_files: List[str] = []
+        self.files = 0
+    
+    @property
+    def entries(self) -> int:
+        return len(self.directories) + self.files
+
+
+def file_size(rng: random.Random, distribution: str, mean: int) -> int:
+    """Ukuran file acak dengan rata-rata kurang lebih mean"""
+    if distribution == "zero" or mean <= 0:
+        return 0
+    if distribution == "fixed":
+        return mean
+    if distribution == "uniform":
+        return rng.randint(0, 2 * mean)
+    if distribution == "lognormal":
+        # sigma 1.5: kebanyakan file kecil, sedikit file besar
+        sigma = 1.5
+        return int(rng.lognormvariate(0, sigma) * mean / 3.08)  # E[X] = e^(sigma^2/2)
+    raise ValueError(f"Unknown size distribution '{distribution}'")
+
+
+def _jitter(rng: random.Random, value: int) -> int:
+    """value +-50% agar tree tidak seragam sempurna"""
+    return rng.randint(value - value // 2, value + value // 2) if value > 1 else value
+
+
+def generate_tree(fs: FileSystemSimulator, entries: int, fanout: int = 10,
+                  files_per_dir: int = 10, max_depth: int = 8, size_dist: str = "fixed",
+                  mean_size: int = 4096, seed: int = 42) -> SyntheticTree:
+    """Bangun tree sintetis (BFS) berisi tepat entries entry jika kapasitas cukup
+    
+    Dengan seed yang sama, tree yang dihasilkan selalu sama. Semua entry
+    dibuat dalam satu transaksi sehingga persist hanya sekali.
+    """
+    rng = random.Random(seed)
+    tree = SyntheticTree()
+    queue = deque([("", 0)])
+    count = 0
+    with fs.transaction():
+        while queue and count < entries:
+            path, depth = queue.popleft()
+            for _ in range(_jitter(rng, files_per_dir)):
+                if count >= entries:
+                    break
+                file_path = f"{path}/file{count}{rng.choice(EXTENSIONS)}"
+                fs.touch(file_path, file_size(rng, size_dist, mean_size))
+                count += 1
+                tree.files += 1
+                # Reservoir sampling: contoh file seragam tanpa menyimpan semua path
+                if len(tree.sample_files) < FILE_SAMPLE:
+                    tree.sample_files.append(file_path)
+                else:
+                    slot = rng.randrange(tree.files)
+                    if slot < FILE_SAMPLE:
+                        tree.sample_files[slot] = file_path
+            if depth >= max_depth:
+                continue
+            for _ in range(_jitter(rng, fanout)):
+                if count >= entries:
+                    break
+                dir_path = f"{path}/dir{count}"
+                fs.mkdir(dir_path)
+                count += 1
+                tree.directories.append(dir_path)
+                queue.append((dir_path, depth + 1))
+    return tree
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentile nearest-rank dari list yang sudah urut"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float]) -> Dict[str, Any]:
+    """Latency (detik) -> ops/detik, mean, p50, p99 (milidetik)"""
+    total = sum(latencies)
+    ordered = sorted(latencies)
+    return {
+        "samples": len(latencies),
+        "ops_per_second": len(latencies) / total if total > 0 else None,
+        "mean_ms": total / len(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0
+    }
+
+
+def peak_rss() -> Optional[int]:
+    """Peak resident memory proses sejauh ini (byte); None tanpa modul resource"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux: KB
+
+
+def measure_peak_memory(operation: Callable[[], Any]) -> int:
+    """Peak alokasi Python (byte) selama satu kali operasi"""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        operation()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def disk_size_for(options: argparse.Namespace, entries: int) -> int:
+    """disk_size (MB) untuk satu ukuran tree
+    
+    Backend snapshot/sharded hanya memakai disk_size sebagai kuota, jadi
+    dibuat sangat besar agar benchmark tidak gagal karena kuota. Backend
+    image membuat file sparse sebesar disk_size, sehingga ukurannya
+    diturunkan dari tree: inode dan isi file rata-rata per entry.
+    """
+    if options.storage != "image":
+        return 1 << 30
+    capacity = IMAGE_HEADROOM * entries + 4 * options.samples
+    per_entry = BYTES_PER_INODE + max(options.mean_size, 0)
+    return 64 + -(-capacity * per_entry // (1024 * 1024))
+
+
+class SizeBenchmark:
+    """Semua operasi untuk satu ukuran tree di directory sementara"""
+    
+    def __init__(self, options: argparse.Namespace, entries: int, directory: str):
+        self.options = options
+        self.entries = entries
+        self.rng = random.Random(options.seed + entries)
+        extension = ".json" if options.format == "json" else ".simfs"
+        # Mode quiet: tanpa output per operasi, kegagalan menghentikan benchmark
+        self.fs = FileSystemSimulator(disk_size=disk_size_for(options, entries),
+                                      data_file=os.path.join(directory, "bench" + extension),
+                                      journal=options.journal, storage=options.storage,
+                                      quiet=True)
+        self.tree: Optional[SyntheticTree] = None
+        self.counter = 0
+    
+    def _name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+    
+    def _random_dir(self) -> str:
+        if not self.tree.directories:
+            return "/"
+        return self.rng.choice(self.tree.directories)
+    
+    def setup(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        self.tree = generate_tree(self.fs, self.entries, self.options.fanout,
+                                  self.options.files_per_dir, self.options.max_depth,
+                                  self.options.size_dist, self.options.mean_size,
+                                  self.options.seed)
+        return {"entries": self.entries,
+                "actual_entries": self.tree.entries,
+                "directories": len(self.tree.directories),
+                "files": self.tree.files,
+                "used_space": self.fs.used_space,
+                "generate_seconds": time.perf_counter() - started}
+    
+    def operation(self, name: str) -> Callable[[], Any]:
+        """Operasi acak berikutnya (target dipilih sebelum timing dimulai)"""
+        fs = self.fs
+        if name == "mkdir":
+            path = f"{self._random_dir()}/{self._name('bench_dir')}"
+            return lambda: fs.mkdir(path)
+        if name == "touch":
+            path = f"{self._random_dir()}/{self._name('bench_file')}.txt"
+            return lambda: fs.touch(path)
+        if name == "ls":
+            path = self._random_dir()
+            return lambda: fs.ls(path)
+        if name == "find":
+            file_name = os.path.basename(self.rng.choice(self.tree.sample_files or ["/none"]))
+            return lambda: fs.find(file_name, "/", exact=True)
+        if name == "cp":
+            source, destination = self._random_dir(), "/" + self._name("bench_copy")
+            return lambda: fs.cp(source, destination, recursive=True)
+        if name == "rm":
+            # Yang dihapus adalah salinan subtree acak (dibuat di luar timing)
+            source, target = self._random_dir(), "/" + self._name("bench_remove")
+            fs.cp(source, target, recursive=True)
+            return lambda: fs.rm(target, recursive=True)
+        if name == "save":
+            return fs.save_filesystem
+        if name == "load":
+            return fs.load_filesystem
+        raise ValueError(f"Unknown operation '{name}'")
+    
+    def run(self, name: str) -> Dict[str, Any]:
+        samples = self.options.samples if name not in ("save", "load") else self.options.io_samples
+        if name == "find":
+            # Index nama dibangun oleh find pertama; diukur terpisah
+            started = time.perf_counter()
+            self.operation("find")()
+            index_seconds = time.perf_counter() - started
+        latencies = []
+        for _ in range(samples):
+            operation = self.operation(name)
+            started = time.perf_counter()
+            operation()
+            latencies.append(time.perf_counter() - started)
+        result = summarize(latencies)
+        if name == "find":
+            result["index_build_ms"] = index_seconds * 1000
+        if self.options.memory:
+            result["peak_memory_bytes"] = measure_peak_memory(self.operation(name))
+        return result
+    
+    def close(self):
+        self.fs.close()
+
+
+def run_benchmark(options: argparse.Namespace) -> Dict[str, Any]:
+    """Jalankan semua ukuran tree dan kembalikan hasil dalam bentuk dict"""
+    results = []
+    for entries in options.sizes:
+        directory = tempfile.mkdtemp(prefix="simfs-bench-")
+        bench = None
+        try:
+            bench = SizeBenchmark(options, entries, directory)
+            result = bench.setup()
+            result["operations"] = {name: bench.run(name) for name in options.ops}
+            bench.close()
+            result["peak_rss_bytes"] = peak_rss()
+            results.append(result)
+            report_size(result)
+        finally:
+            del bench
+            gc.collect()
+            shutil.rmtree(directory, ignore_errors=True)
+    return {"meta": metadata(options), "results": results}
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(options: argparse.Namespace) -> Dict[str, Any]:
+    config = {key: value for key, value in vars(options).items()
+              if key not in ("output", "compare", "threshold")}
+    return {"created": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config}
+
+
+def _format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+
+
+def report_size(result: Dict[str, Any]):
+    """Cetak tabel hasil satu ukuran tree"""
+    print(f"\n{result['actual_entries']} entries ({result['directories']} dirs, "
+          f"{result['files']} files) generated in {result['generate_seconds']:.2f}s, "
+          f"peak RSS {_format_bytes(result['peak_rss_bytes'])}")
+    print(f"{'op':<8}{'ops/sec':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak mem':>12}")
+    for name, op in result["operations"].items():
+        ops = f"{op['ops_per_second']:.1f}" if op["ops_per_second"] else "-"
+        print(f"{name:<8}{ops:>12}{op['p50_ms']:>10.3f}{op['p99_ms']:>10.3f}"
+              f"{_format_bytes(op.get('peak_memory_bytes')):>12}")
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> List[str]:
+    """Bandingkan ops/detik per (ukuran, operasi); hasil = daftar regresi"""
+    baseline = {(result["entries"], name): op["ops_per_second"]
+                for result in old["results"] for name, op in result["operations"].items()}
+    regressions = []
+    print(f"\n{'entries':>9} {'op':<8}{'old ops/s':>12}{'new ops/s':>12}{'change':>9}")
+    for result in new["results"]:
+        for name, op in result["operations"].items():
+            before, after = baseline.get((result["entries"], name)), op["ops_per_second"]
+            if not before or not after:
+                continue
+            change = after / before - 1
+            flag = ""
+            if change < -threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} @ {result['entries']}: {change:+.1%}")
+            print(f"{result['entries']:>9} {name:<8}{before:>12.1f}{after:>12.1f}"
+                  f"{change:>+9.1%}{flag}")
+    return regressions
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(float(item)) for item in value.split(",") if item]
+
+
+def _ops_list(value: str) -> List[str]:
+    ops = [item for item in value.split(",") if item]
+    unknown = set(ops) - set(OPERATIONS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown operation(s): {', '.join(sorted(unknown))}")
+    return ops
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="File System Simulator benchmark")
+    parser.add_argument("--sizes", type=_int_list, default=[1000, 10000, 100000, 1000000],
+                        help="comma separated tree sizes in entries (default 1e3..1e6)")
+    parser.add_argument("--fanout", type=int, default=10, help="subdirectories per directory")
+    parser.add_argument("--files-per-dir", type=int, default=10)
+    parser.add_argument("--max-depth", type=int, default=8)
+    parser.add_argument("--size-dist", choices=SIZE_DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--mean-size", type=int, default=4096, help="mean file size in bytes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--samples", type=int, default=200, help="samples per operation")
+    parser.add_argument("--io-samples", type=int, default=3, help="samples for save/load")
+    parser.add_argument("--ops", type=_ops_list, default=list(OPERATIONS))
+    parser.add_argument("--storage", choices=("snapshot", "image", "sharded"), default="snapshot")
+    parser.add_argument("--format", choices=("binary", "json"), default="binary",
+                        help="checkpoint format for the snapshot backend")
+    parser.add_argument("--no-journal", dest="journal", action="store_false",
+                        help="rewrite the full snapshot on every mutation")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the tracemalloc pass")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="OLD", help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="ops/sec drop reported as a regression (default 0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Main function"""
+    options = parse_args(argv)
+    results = run_benchmark(options)
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to '{options.output}'")
+    
+    if options.compare:
+        with open(options.compare, "r") as f:
+            regressions = compare(json.load(f), results, options.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): " + "; ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
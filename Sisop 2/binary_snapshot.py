@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Format snapshot biner untuk File System Simulator
+
+Layout file (little-endian):
+    header      : magic, versi, disk_size, used_space, next_inode,
+                  cwd_inode, generation, sparse_space, jumlah string,
+                  jumlah inode
+    string table: untuk setiap string -> panjang (u32) + bytes UTF-8
+    inode table : record berukuran tetap (RECORD), satu per inode
+
+Nama, permission, owner dan daftar chunk isi file disimpan sebagai index
+ke string table (versi 1 belum punya field chunk, versi 1-2 belum punya
+generation di header, versi 1-3 belum punya sparse_space), dan
+timestamp sebagai integer mikrodetik. Isi children tidak disimpan karena
+bisa dibangun ulang dari pointer parent + nama setiap inode.
+"""
+
+import sys
+import struct
+from typing import Dict, Any, BinaryIO
+
+from inode import Inode, DIRECTORY, NO_CHUNKS, encode_chunks, decode_chunks
+
+MAGIC = b"SIMFSBIN"
+VERSION = 4
+
+HEADER = struct.Struct("<8sHqqqqqqII")
+HEADER_V3 = struct.Struct("<8sHqqqqqII")
+HEADER_V2 = struct.Struct("<8sHqqqqII")
+STRING_LENGTH = struct.Struct("<I")
+# ino, parent, size, created, modified, tree_size, tree_count,
+# name_idx, permissions_idx, owner_idx, kind, chunks_idx
+RECORD = struct.Struct("<qqqqqqqIIIBI")
+RECORD_V1 = struct.Struct("<qqqqqqqIIIB")
+
+
+def is_binary_snapshot(path: str) -> bool:
+    """Cek magic bytes di awal file"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def format_for_path(path: str) -> str:
+    """Format snapshot berdasarkan ekstensi file: .json atau biner"""
+    return "json" if path.endswith(".json") else "binary"
+
+
+def dump(state: Dict[str, Any], f: BinaryIO):
+    """Tulis state filesystem ke file biner"""
+    strings = []
+    string_ids = {}
+    
+    def string_id(value: str) -> int:
+        idx = string_ids.get(value)
+        if idx is None:
+            idx = string_ids[value] = len(strings)
+            strings.append(value)
+        return idx
+    
+    records = bytearray()
+    pack = RECORD.pack
+    for ino, node in state["inodes"].items():
+        is_dir = node.kind == DIRECTORY
+        records += pack(ino, node.parent, node.size, node.created, node.modified,
+                        node.tree_size if is_dir else -1,
+                        node.tree_count if is_dir else -1,
+                        string_id(node.name), string_id(node.permissions),
+                        string_id(node.owner), node.kind,
+                        string_id("" if is_dir else encode_chunks(node.chunks)))
+    
+    f.write(HEADER.pack(MAGIC, VERSION, state["disk_size"], state["used_space"],
+                        state["next_inode"], state["cwd_inode"], state.get("generation", 0),
+                        state["sparse_space"], len(strings), len(state["inodes"])))
+    for value in strings:
+        data = value.encode("utf-8")
+        f.write(STRING_LENGTH.pack(len(data)))
+        f.write(data)
+    f.write(records)
+
+
+def load(f: BinaryIO) -> Dict[str, Any]:
+    """Baca state filesystem dari file biner"""
+    buffer = f.read()
+    magic, version = struct.unpack_from("<8sH", buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary filesystem snapshot")
+    if version not in (1, 2, 3, VERSION):
+        raise ValueError(f"Unsupported snapshot version {version}")
+    # None: sparse_space dihitung ulang setelah load
+    sparse_space = None
+    if version == VERSION:
+        (_, _, disk_size, used_space, next_inode, cwd_inode, generation,
+         sparse_space, string_count, inode_count) = HEADER.unpack_from(buffer, 0)
+        offset = HEADER.size
+    elif version == 3:
+        (_, _, disk_size, used_space, next_inode, cwd_inode, generation,
+         string_count, inode_count) = HEADER_V3.unpack_from(buffer, 0)
+        offset = HEADER_V3.size
+    else:
+        (_, _, disk_size, used_space, next_inode, cwd_inode,
+         string_count, inode_count) = HEADER_V2.unpack_from(buffer, 0)
+        generation = 0
+        offset = HEADER_V2.size
+    
+    strings = []
+    for _ in range(string_count):
+        (length,) = STRING_LENGTH.unpack_from(buffer, offset)
+        offset += STRING_LENGTH.size
+        strings.append(buffer[offset:offset + length].decode("utf-8"))
+        offset += length
+    
+    record = RECORD_V1 if version == 1 else RECORD
+    end = offset + inode_count * record.size
+    inodes = {}
+    new_inode = Inode.__new__
+    for fields in record.iter_unpack(buffer[offset:end]):
+        (ino, parent, size, created, modified, tree_size, tree_count,
+         name_idx, perm_idx, owner_idx, kind) = fields[:11]
+        node = new_inode(Inode)
+        node.kind = kind
+        node.parent = parent
+        node.size = size
+        node.created = created
+        node.modified = modified
+        node.name = strings[name_idx]
+        node.permissions = sys.intern(strings[perm_idx])
+        node.owner = sys.intern(strings[owner_idx])
+        if kind == DIRECTORY:
+            node.children = {}
+            node.tree_size = tree_size
+            node.tree_count = tree_count
+            node.chunks = None
+        else:
+            node.children = None
+            node.tree_size = None
+            node.tree_count = None
+            node.chunks = decode_chunks(strings[fields[11]]) if len(fields) > 11 else NO_CHUNKS
+        inodes[ino] = node
+    
+    # Bangun ulang children dari pointer parent
+    for ino, node in inodes.items():
+        parent = inodes.get(node.parent)
+        if parent is not None and parent.kind == DIRECTORY:
+            parent.children[node.name] = ino
+    
+    return {
+        "inodes": inodes,
+        "next_inode": next_inode,
+        "cwd_inode": cwd_inode,
+        "used_space": used_space,
+        "sparse_space": sparse_space,
+        "disk_size": disk_size,
+        "generation": generation
+    }
+
+
+def convert(source: str, destination: str):
+    """Konversi snapshot antar format (JSON <-> biner) sesuai ekstensi"""
+    from file_system import FileSystemSimulator
+    
+    fs = FileSystemSimulator(data_file=source)
+    fs.export_snapshot(destination)
+
+
+def main():
+    """Converter: binary_snapshot.py <source> <destination>"""
+    if len(sys.argv) != 3:
+        print("Usage: python3 binary_snapshot.py <source> <destination>")
+        print("Format ditentukan dari ekstensi: .json untuk JSON, lainnya biner")
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
+    print(f"'{sys.argv[1]}' converted to '{sys.argv[2]}' ({format_for_path(sys.argv[2])})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Penyimpanan isi file (chunk) untuk File System Simulator
+
+Isi file dipecah menjadi chunk berukuran CHUNK_SIZE dan setiap chunk
+disimpan sebagai file tersendiri di luar metadata. Chunk di-key dengan
+hash SHA-256 isinya (content-addressed): isi yang sama hanya disimpan
+sekali dan jumlah referensinya dicatat di refs.json. Chunk tidak pernah
+diubah setelah ditulis, sehingga berbagi chunk antar file aman dan
+penulisan ke salinan otomatis menjadi copy-on-write.
+"""
+
+import os
+import json
+import hashlib
+from collections import Counter
+from typing import Dict, Iterable, List
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ChunkStore:
+    """Chunk immutable berbasis hash dengan reference count"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.refs_file = os.path.join(directory, "refs.json")
+        # id chunk -> [jumlah referensi, ukuran byte]
+        self.refs: Dict[str, List[int]] = {}
+        self.physical_bytes = 0
+        self.bytes_written = 0  # Byte chunk baru yang ditulis (metrics)
+
+    def _path(self, chunk_id: str) -> str:
+        # Fan-out 2 karakter agar satu directory tidak terlalu besar
+        return os.path.join(self.directory, chunk_id[:2], chunk_id)
+
+    def load(self) -> bool:
+        """Baca reference count; False jika belum ada refs.json"""
+        self.refs = {}
+        self.physical_bytes = 0
+        if not os.path.exists(self.refs_file):
+            return False
+        with open(self.refs_file, "r") as f:
+            self.refs = json.load(f)
+        self.physical_bytes = sum(size for _, size in self.refs.values())
+        return True
+
+    def save(self):
+        """Simpan reference count secara atomic"""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_file = self.refs_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.refs, f, separators=(",", ":"))
+        os.replace(tmp_file, self.refs_file)
+
+    def rebuild(self, chunk_ids: Iterable[str]):
+        """Hitung ulang reference count dari semua referensi di metadata"""
+        self.refs = {}
+        self.physical_bytes = 0
+        for chunk_id in chunk_ids:
+            if os.path.exists(self._path(chunk_id)):
+                self.incref(chunk_id)
+
+    def put(self, data: bytes) -> str:
+        """Simpan chunk (jika belum ada) dan kembalikan id-nya
+
+        Reference count tidak berubah; pemanggil mencatat referensi
+        dengan incref() setelah metadata yang memakainya tersimpan.
+        """
+        chunk_id = hashlib.sha256(data).hexdigest()
+        path = self._path(chunk_id)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_file = path + ".tmp"
+            with open(tmp_file, "wb") as f:
+                f.write(data)
+            os.replace(tmp_file, path)
+            self.bytes_written += len(data)
+        return chunk_id
+
+    def get(self, chunk_id: str) -> bytes:
+        """Baca isi chunk"""
+        with open(self._path(chunk_id), "rb") as f:
+            return f.read()
+
+    def size(self, chunk_id: str) -> int:
+        """Ukuran chunk dalam byte (juga untuk chunk yang belum direferensikan)"""
+        entry = self.refs.get(chunk_id)
+        return entry[1] if entry is not None else os.path.getsize(self._path(chunk_id))
+
+    def physical_after(self, added: Iterable[str], dropped: Iterable[str]) -> int:
+        """physical_bytes seandainya incref(added) lalu decref(dropped) diterapkan"""
+        change = Counter(added)
+        change.subtract(dropped)
+        total = self.physical_bytes
+        for chunk_id, delta in change.items():
+            entry = self.refs.get(chunk_id)
+            count = entry[0] if entry is not None else 0
+            if count <= 0 < count + delta:
+                total += self.size(chunk_id)
+            elif count > 0 >= count + delta:
+                total -= entry[1]
+        return total
+
+    def incref(self, chunk_id: str):
+        entry = self.refs.get(chunk_id)
+        if entry is None:
+            size = os.path.getsize(self._path(chunk_id))
+            self.refs[chunk_id] = [1, size]
+            self.physical_bytes += size
+        else:
+            entry[0] += 1
+
+    def decref(self, chunk_id: str):
+        """Kurangi referensi; chunk dihapus saat tidak direferensikan lagi"""
+        entry = self.refs.get(chunk_id)
+        if entry is None:
+            return
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del self.refs[chunk_id]
+            self.physical_bytes -= entry[1]
+            self.delete(chunk_id)
+
+    def discard(self, chunk_id: str):
+        """Hapus chunk yang ditulis tapi tidak pernah direferensikan"""
+        if chunk_id not in self.refs:
+            self.delete(chunk_id)
+
+    def delete(self, chunk_id: str):
+        """Hapus file chunk (diabaikan jika sudah tidak ada)"""
+        try:
+            os.remove(self._path(chunk_id))
+        except FileNotFoundError:
+            pass
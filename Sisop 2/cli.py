@@ -3,15 +3,167 @@
 Command Line Interface untuk Sistem Manajemen File
 """
 
+import re
 import sys
+import time
 import shlex
+import codecs
+import argparse
+import contextlib
+from typing import List, Optional, Tuple
 from file_system import FileSystemSimulator
+from errors import FileSystemError
+from results import listing_lines, find_lines, snapshot_lines, diff_lines
+
+# Karakter brace di dalam tanda kutip/setelah backslash diganti sementara
+# dengan karakter private-use agar tidak ikut di-expand
+PROTECTED = {"{": "\ue000", "}": "\ue001", ",": "\ue002"}
+UNPROTECT = {ord(marker): char for char, marker in PROTECTED.items()}
+BRACE_RANGE = re.compile(r"(-?\d+)\.\.(-?\d+)(?:\.\.(-?\d+))?$")
+LETTER_RANGE = re.compile(r"([a-zA-Z])\.\.([a-zA-Z])$")
+
+
+def protect_quoted(line: str) -> str:
+    """Tandai { } , yang di-quote atau di-escape sebelum shlex"""
+    output = []
+    quote = None
+    escaped = False
+    for char in line:
+        if escaped:
+            if char in PROTECTED:
+                # shlex membuang backslash di luar kutip, di dalam "..." tidak
+                output.append(("\\" if quote else "") + PROTECTED[char])
+            else:
+                output.append("\\" + char)
+            escaped = False
+        elif char == "\\" and quote != "'":
+            escaped = True
+        elif quote:
+            if char == quote:
+                quote = None
+            output.append(PROTECTED.get(char, char))
+        else:
+            if char in "'\"":
+                quote = char
+            output.append(char)
+    if escaped:
+        output.append("\\")
+    return "".join(output)
+
+
+def brace_range(body: str) -> Optional[List[str]]:
+    """{2020..2025}, {01..12} (lebar dipertahankan), {a..e}, {0..10..2}"""
+    match = BRACE_RANGE.match(body)
+    if match:
+        first, last, step = match.groups()
+        start, stop = int(first), int(last)
+        step = abs(int(step or 1)) or 1
+        padded = any(len(bound.lstrip("-")) > 1 and bound.lstrip("-").startswith("0")
+                     for bound in (first, last))
+        width = max(len(first), len(last)) if padded else 0
+        values = range(start, stop + 1, step) if start <= stop else range(start, stop - 1, -step)
+        return [str(value).zfill(width) for value in values]
+    match = LETTER_RANGE.match(body)
+    if match:
+        start, stop = (ord(char) for char in match.groups())
+        values = range(start, stop + 1) if start <= stop else range(start, stop - 1, -1)
+        return [chr(value) for value in values]
+    return None
+
+
+def expand_braces(word: str) -> List[str]:
+    """Brace expansion gaya shell: a{b,c}d -> abd acd, x{1..3} -> x1 x2 x3
+    
+    Bisa bersarang dan digabung (logs/{2020..2025}/{01..12}); brace tanpa
+    koma atau range (misalnya {} atau {a}) dibiarkan apa adanya.
+    """
+    for start, char in enumerate(word):
+        if char != "{":
+            continue
+        depth = 0
+        commas = []
+        for end in range(start, len(word)):
+            if word[end] == "{":
+                depth += 1
+            elif word[end] == "}":
+                depth -= 1
+                if not depth:
+                    break
+            elif word[end] == "," and depth == 1:
+                commas.append(end)
+        else:
+            continue
+        if commas:
+            bounds = [start] + commas + [end]
+            alternatives = [word[a + 1:b] for a, b in zip(bounds, bounds[1:])]
+        else:
+            alternatives = brace_range(word[start + 1:end])
+            if alternatives is None:
+                continue
+        prefix, suffix = word[:start], word[end + 1:]
+        return [expanded for alternative in alternatives
+                for expanded in expand_braces(prefix + alternative + suffix)]
+    return [word]
+
+
+def expand_words(tokens: List[str]) -> List[str]:
+    """Expand brace setiap token hasil shlex dari protect_quoted()"""
+    return [word.translate(UNPROTECT) for token in tokens for word in expand_braces(token)]
+
 
 class FileSystemCLI:
-    def __init__(self):
-        self.fs = FileSystemSimulator()
+    def __init__(self, fs=None):
+        # fs bisa FileSystemSimulator lokal atau RemoteFileSystem (--connect).
+        # Default fs lokal mode quiet: CLI yang menampilkan hasil dan error
+        self.fs = fs if fs is not None else FileSystemSimulator(quiet=True)
         self.running = True
+        self.failed = False  # Perintah yang sedang berjalan gagal (untuk mode script)
+    
+    @property
+    def render(self) -> bool:
+        """True jika fs tidak mencetak sendiri (mode quiet)"""
+        return getattr(self.fs, "quiet", False)
+    
+    def show(self, lines: list):
+        """Cetak baris hasil sekaligus (hanya jika fs mode quiet)"""
+        if self.render and lines:
+            print("\n".join(lines))
+    
+    def error(self, message: str):
+        """Cetak pesan error dan tandai perintah yang sedang berjalan gagal"""
+        print(message)
+        self.failed = True
+    
+    def call(self, operation, *args, message: str = None, **kwargs):
+        """Jalankan satu operasi; error quiet dicetak agar target berikutnya tetap jalan"""
+        try:
+            result = operation(*args, **kwargs)
+        except FileSystemError as e:
+            self.error(str(e))
+            return None
+        if result is False and not self.render:
+            # fs yang mencetak sendiri (RemoteFileSystem) melaporkan gagal lewat False
+            self.failed = True
+        if message and result:
+            self.show([message])
+        return result
+    
+    def bulk(self, operation: str, paths: list, messages: list, **kwargs) -> bool:
+        """Buat banyak path lewat mkdir_many/touch_many (fs lokal mode quiet)
         
+        Jika ada path yang tidak valid batch tidak membuat apa pun; hasilnya
+        False dan handler mengulang per path seperti shell (path yang valid
+        tetap dibuat, error dicetak per path).
+        """
+        if len(paths) < 2 or not self.render or not hasattr(self.fs, operation):
+            return False
+        try:
+            getattr(self.fs, operation)(paths, **kwargs)
+        except FileSystemError:
+            return False
+        self.show(messages)
+        return True
+    
     def get_prompt(self) -> str:
         """Dapatkan prompt untuk CLI"""
         return f"simfs:{self.fs.current_directory}$ "
@@ -19,18 +171,18 @@ class FileSystemCLI:
     def parse_command(self, command_line: str) -> tuple:
         """Parse command line input"""
         try:
-            parts = shlex.split(command_line.strip())
+            parts = expand_words(shlex.split(protect_quoted(command_line.strip())))
             if not parts:
                 return None, []
             return parts[0], parts[1:]
         except ValueError:
-            print("Error: Invalid command syntax")
+            self.error("Error: Invalid command syntax")
             return None, []
     
     def handle_mkdir(self, args: list):
         """Handle mkdir command"""
         if not args:
-            print("Usage: mkdir [-p] <directory>...")
+            self.error("Usage: mkdir [-p] <directory>...")
             return
         
         recursive = False
@@ -45,25 +197,41 @@ class FileSystemCLI:
             i += 1
         
         if not dirs:
-            print("Usage: mkdir [-p] <directory>...")
+            self.error("Usage: mkdir [-p] <directory>...")
             return
         
+        messages = [f"Directory '{directory}' created successfully" for directory in dirs]
+        if self.bulk("mkdir_many", dirs, messages, recursive=recursive):
+            return
         for directory in dirs:
-            self.fs.mkdir(directory, recursive=recursive)
+            self.call(self.fs.mkdir, directory, recursive=recursive,
+                      message=f"Directory '{directory}' created successfully")
     
     def handle_touch(self, args: list):
         """Handle touch command"""
         if not args:
-            print("Usage: touch <file>...")
+            self.error("Usage: touch <file>...")
             return
         
+        messages = []
+        seen = set()  # Path yang muncul dua kali sudah dibuat oleh yang pertama
         for file_path in args:
-            self.fs.touch(file_path)
+            if self.render and (self.fs.path_exists(file_path) or
+                                self.fs.get_absolute_path(file_path) in seen):
+                messages.append(f"File '{file_path}' timestamp updated")
+            else:
+                messages.append(f"File '{file_path}' created successfully")
+            if self.render:
+                seen.add(self.fs.get_absolute_path(file_path))
+        if self.bulk("touch_many", args, messages):
+            return
+        for file_path, message in zip(args, messages):
+            self.call(self.fs.touch, file_path, message=message)
     
     def handle_rm(self, args: list):
         """Handle rm command"""
         if not args:
-            print("Usage: rm [-rf] <file/directory>...")
+            self.error("Usage: rm [-rf] <file/directory>...")
             return
         
         recursive = False
@@ -82,11 +250,14 @@ class FileSystemCLI:
             i += 1
         
         if not files:
-            print("Usage: rm [-rf] <file/directory>...")
+            self.error("Usage: rm [-rf] <file/directory>...")
             return
         
         for file_path in files:
-            self.fs.rm(file_path, recursive=recursive, force=force)
+            if force and not self.fs.path_exists(file_path):
+                continue
+            self.call(self.fs.rm, file_path, recursive=recursive, force=force,
+                      message=f"'{file_path}' removed successfully")
     
     def handle_ls(self, args: list):
         """Handle ls command"""
@@ -111,60 +282,259 @@ class FileSystemCLI:
         for path in paths:
             if len(paths) > 1 and path:
                 print(f"\n{path}:")
-            self.fs.ls(path, long_format=long_format, all_files=all_files)
+            entries = self.call(self.fs.ls, path, long_format=long_format, all_files=all_files)
+            if entries is not None and self.render:
+                self.show(listing_lines(entries, long_format) if entries else ["Directory is empty"])
     
     def handle_cd(self, args: list):
         """Handle cd command"""
-        if not args:
-            self.fs.cd("/")  # Go to root if no argument
-        else:
-            self.fs.cd(args[0])
+        self.call(self.fs.cd, args[0] if args else "/")  # Go to root if no argument
     
     def handle_pwd(self, args: list):
         """Handle pwd command"""
-        self.fs.pwd()
+        self.show([self.fs.pwd()])
     
     def handle_cp(self, args: list):
         """Handle cp command"""
-        if len(args) != 2:
-            print("Usage: cp <source> <destination>")
+        recursive = False
+        paths = []
+        
+        for arg in args:
+            if arg.startswith("-"):
+                if "r" in arg or "R" in arg:
+                    recursive = True
+            else:
+                paths.append(arg)
+        
+        if len(paths) != 2:
+            self.error("Usage: cp [-r] <source> <destination>")
             return
         
-        self.fs.cp(args[0], args[1])
+        self.call(self.fs.cp, paths[0], paths[1], recursive=recursive,
+                  message=f"'{paths[0]}' copied to '{paths[1]}'")
     
     def handle_mv(self, args: list):
         """Handle mv command"""
         if len(args) != 2:
-            print("Usage: mv <source> <destination>")
+            self.error("Usage: mv <source> <destination>")
             return
         
-        self.fs.mv(args[0], args[1])
+        self.call(self.fs.mv, args[0], args[1], message=f"'{args[0]}' moved to '{args[1]}'")
     
     def handle_df(self, args: list):
         """Handle df command"""
-        self.fs.df()
+        usage = self.fs.df()
+        if self.render:
+            self.show(usage.lines())
+    
+    def handle_du(self, args: list):
+        """Handle du command"""
+        summarize = False
+        max_depth = None
+        paths = []
+        
+        i = 0
+        while i < len(args):
+            if args[i] == "-s":
+                summarize = True
+            elif args[i] == "-d":
+                if i + 1 >= len(args) or not args[i + 1].isdigit():
+                    self.error("Usage: du [-s] [-d N] [path]...")
+                    return
+                max_depth = int(args[i + 1])
+                i += 1
+            else:
+                paths.append(args[i])
+            i += 1
+        
+        if not paths:
+            paths = [None]  # Current directory
+        
+        for path in paths:
+            entries = self.call(self.fs.du, path, summarize=summarize, max_depth=max_depth)
+            if entries and self.render:
+                self.show([entry.line() for entry in entries])
     
     def handle_find(self, args: list):
         """Handle find command"""
         if not args:
-            print("Usage: find <name> [path]")
+            self.error("Usage: find <name> [path]")
+            print("       find [path] [-name PATTERN] [-regex REGEX] [-maxdepth N] [-mindepth N] [-prune PATTERN]")
+            return
+        
+        if not any(arg.startswith("-") for arg in args):
+            # Bentuk lama: substring lewat index nama
+            name = args[0]
+            path = args[1] if len(args) > 1 else None
+            self.show(find_lines(self.fs.find(name, path), name))
+            return
+        
+        options = {"path": None, "name": None, "regex": None,
+                   "maxdepth": None, "mindepth": 0, "prune": []}
+        
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg in ("-name", "-regex", "-maxdepth", "-mindepth", "-prune"):
+                if i + 1 >= len(args):
+                    self.error(f"find: missing argument to '{arg}'")
+                    return
+                value = args[i + 1]
+                key = arg[1:]
+                if key in ("maxdepth", "mindepth"):
+                    if not value.isdigit():
+                        self.error(f"find: invalid depth '{value}'")
+                        return
+                    options[key] = int(value)
+                elif key == "prune":
+                    options["prune"].append(value)
+                else:
+                    options[key] = value
+                i += 2
+            elif arg.startswith("-"):
+                self.error(f"find: unknown option '{arg}'")
+                return
+            else:
+                options["path"] = arg
+                i += 1
+        
+        found = False
+        try:
+            for path in self.fs.iter_find(**options):
+                print(path)
+                found = True
+        except re.error as e:
+            self.error(f"find: invalid regex: {e}")
             return
         
-        name = args[0]
-        path = args[1] if len(args) > 1 else None
-        self.fs.find(name, path)
+        if not found:
+            print("No files or directories found")
+    
+    def handle_cat(self, args: list):
+        """Handle cat command"""
+        if not args:
+            self.error("Usage: cat <file>...")
+            return
+        
+        for path in args:
+            stream = self.call(self.fs.read_stream, path)
+            if stream is None:
+                continue
+            # Decode per chunk; karakter multi-byte boleh terpotong antar chunk
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for piece in stream:
+                sys.stdout.write(decoder.decode(piece))
+            sys.stdout.write(decoder.decode(b"", final=True))
+        sys.stdout.flush()
+    
+    def handle_write(self, args: list):
+        """Handle write command"""
+        usage = "Usage: write [-a] <file> <text>...  |  write [-a] <file> -f <host_file>"
+        append = False
+        if args and args[0] == "-a":
+            append = True
+            args = args[1:]
+        if len(args) < 2:
+            self.error(usage)
+            return
+        
+        path = args[0]
+        write = self.fs.append if append else self.fs.write
+        if args[1] == "-f":
+            if len(args) != 3:
+                self.error(usage)
+                return
+            # Salin file dari host secara streaming
+            try:
+                with open(args[2], "rb") as source:
+                    written = self.call(write, path, source)
+                    size = source.tell()
+            except OSError as e:
+                self.error(f"Cannot read '{args[2]}': {e}")
+                return
+        else:
+            text = " ".join(args[1:]) + "\n"
+            written = self.call(write, path, text)
+            size = len(text.encode("utf-8"))
+        if written:
+            self.show([f"{size} bytes written to '{path}'"])
+    
+    def handle_snapshot(self, args: list):
+        """Handle snapshot command"""
+        usage = "Usage: snapshot create [name] | list | restore <name> | diff <name> [other] | delete <name>"
+        if not args:
+            self.error(usage)
+            return
+        
+        action, rest = args[0], args[1:]
+        if action == "create" and len(rest) <= 1:
+            if self.call(self.fs.snapshot_create, rest[0] if rest else None) and self.render:
+                # Nama default dibuat oleh fs: ambil dari snapshot terbaru
+                self.show([f"Snapshot '{self.fs.snapshot_list()[-1]['name']}' created"])
+        elif action == "list" and not rest:
+            self.show(snapshot_lines(self.fs.snapshot_list()))
+        elif action == "restore" and len(rest) == 1:
+            self.call(self.fs.snapshot_restore, rest[0], message=f"Restored snapshot '{rest[0]}'")
+        elif action == "diff" and len(rest) in (1, 2):
+            changes = self.call(self.fs.snapshot_diff, *rest)
+            if changes is not None:
+                self.show(diff_lines(changes))
+        elif action == "delete" and len(rest) == 1:
+            self.call(self.fs.snapshot_delete, rest[0], message=f"Snapshot '{rest[0]}' deleted")
+        else:
+            self.error(usage)
     
     def handle_stat(self, args: list):
         """Handle stat command"""
         if not args:
-            print("Usage: stat <file/directory>")
+            self.error("Usage: stat <file/directory>")
             return
         
         for path in args:
-            self.fs.stat(path)
+            info = self.call(self.fs.stat, path)
+            if info and self.render:
+                self.show(info.lines())
             if len(args) > 1:
                 print()
     
+    def handle_stats(self, args: list):
+        """Handle stats command"""
+        usage = "Usage: stats [on | off | reset | export <file>]"
+        fs = self.fs
+        if not hasattr(fs, "enable_metrics"):
+            # RemoteFileSystem: statistik server (dan metrics-nya jika aktif)
+            if args:
+                self.error(usage)
+                return
+            for key, value in fs.stats().items():
+                print(f"{key}: {value}")
+            return
+        
+        action = args[0] if args else "show"
+        if action == "on" and len(args) == 1:
+            fs.enable_metrics()
+            print("Metrics enabled")
+        elif action == "off" and len(args) == 1:
+            fs.disable_metrics()
+            print("Metrics disabled")
+        elif action in ("show", "reset", "export") and fs.metrics is None:
+            self.error("Metrics are disabled (use 'stats on')")
+        elif action == "show":
+            for line in fs.metrics.report():
+                print(line)
+        elif action == "reset" and len(args) == 1:
+            fs.metrics.reset()
+            print("Metrics reset")
+        elif action == "export" and len(args) == 2:
+            try:
+                fs.metrics.export(args[1])
+            except OSError as e:
+                self.error(f"Cannot write '{args[1]}': {e}")
+                return
+            print(f"Metrics exported to '{args[1]}'")
+        else:
+            self.error(usage)
+    
     def handle_help(self, args: list):
         """Handle help command"""
         print("Available commands:")
@@ -174,11 +544,18 @@ class FileSystemCLI:
         print("  ls [-la] [path]...      - List directory contents")
         print("  cd [path]               - Change directory")
         print("  pwd                     - Print working directory")
-        print("  cp <src> <dst>          - Copy file/directory")
+        print("  cp [-r] <src> <dst>     - Copy file/directory")
         print("  mv <src> <dst>          - Move/rename file/directory")
         print("  df                      - Display filesystem usage")
+        print("  du [-s] [-d N] [path]   - Display directory usage")
         print("  find <name> [path]      - Find files/directories")
+        print("  find [path] -name PAT   - Find with glob/-regex/-maxdepth/-mindepth/-prune")
         print("  stat <path>             - Display file/directory info")
+        print("  cat <file>...           - Print file contents")
+        print("  write [-a] <file> <txt> - Write (or append) text to a file")
+        print("  write [-a] <file> -f H  - Write contents of host file H")
+        print("  snapshot create [name]  - Take a snapshot (also list/restore/diff/delete)")
+        print("  stats [on|off|reset]    - Show operation latency metrics (export <file>)")
         print("  clear                   - Clear screen")
         print("  help                    - Show this help")
         print("  exit, quit              - Exit the program")
@@ -193,8 +570,9 @@ class FileSystemCLI:
         print("Goodbye!")
         self.running = False
     
-    def execute_command(self, command: str, args: list):
-        """Execute a command"""
+    def execute_command(self, command: str, args: list) -> bool:
+        """Execute a command; False jika perintah gagal"""
+        self.failed = False
         commands = {
             'mkdir': self.handle_mkdir,
             'touch': self.handle_touch,
@@ -205,8 +583,13 @@ class FileSystemCLI:
             'cp': self.handle_cp,
             'mv': self.handle_mv,
             'df': self.handle_df,
+            'du': self.handle_du,
             'find': self.handle_find,
             'stat': self.handle_stat,
+            'cat': self.handle_cat,
+            'write': self.handle_write,
+            'snapshot': self.handle_snapshot,
+            'stats': self.handle_stats,
             'help': self.handle_help,
             'clear': self.handle_clear,
             'exit': self.handle_exit,
@@ -216,11 +599,89 @@ class FileSystemCLI:
         if command in commands:
             try:
                 commands[command](args)
+            except FileSystemError as e:
+                self.error(str(e))
             except Exception as e:
-                print(f"Error executing command: {e}")
+                self.error(f"Error executing command: {e}")
         else:
-            print(f"Unknown command: {command}")
+            self.error(f"Unknown command: {command}")
             print("Type 'help' for available commands")
+        return not self.failed
+    
+    def parse_script(self, text: str) -> Tuple[List[Tuple[int, str, list]], List[str]]:
+        """Parse seluruh script sebelum dijalankan
+        
+        Perintah dipisah baris baru atau ';' (di luar tanda kutip); baris
+        yang diawali '#' adalah komentar. Hasilnya (nomor baris, command,
+        args) dan daftar error parse.
+        """
+        commands, errors = [], []
+        for number, line in enumerate(text.splitlines(), 1):
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            lexer = shlex.shlex(protect_quoted(line), posix=True, punctuation_chars=";")
+            lexer.whitespace_split = True
+            lexer.commenters = ""
+            try:
+                tokens = expand_words(list(lexer))
+            except ValueError as e:
+                errors.append(f"line {number}: {e}")
+                continue
+            current = []
+            for token in tokens + [";"]:
+                if token and set(token) == {";"}:
+                    if current:
+                        commands.append((number, current[0], current[1:]))
+                    current = []
+                else:
+                    current.append(token)
+        return commands, errors
+    
+    def run_script(self, text: str, stop_on_error: bool = False) -> int:
+        """Jalankan script dalam satu batch (persist sekali di akhir)
+        
+        Perintah snapshot tidak bisa berjalan di dalam transaksi, jadi batch
+        di-commit dan dimulai ulang di sekitarnya. Dengan stop_on_error
+        eksekusi berhenti pada perintah pertama yang gagal; perintah
+        sebelumnya tetap tersimpan. Kembalikan jumlah perintah yang gagal.
+        """
+        started = time.perf_counter()
+        commands, errors = self.parse_script(text)
+        for message in errors:
+            print(message, file=sys.stderr)
+        if errors:
+            print(f"{len(errors)} parse error(s); nothing executed", file=sys.stderr)
+            return len(errors)
+        
+        # RemoteFileSystem tidak punya transaksi: server persist per request
+        transaction = getattr(self.fs, "transaction", None)
+        executed = failed = 0
+        stopped = None
+        position = 0
+        while position < len(commands) and self.running and stopped is None:
+            outside = commands[position][1] == "snapshot"
+            batch = transaction() if transaction and not outside else contextlib.nullcontext()
+            with batch:
+                while position < len(commands) and self.running:
+                    number, command, args = commands[position]
+                    if (command == "snapshot") != outside:
+                        break
+                    position += 1
+                    executed += 1
+                    if not self.execute_command(command, args):
+                        failed += 1
+                        if stop_on_error:
+                            stopped = number
+                            break
+                    if outside:
+                        break
+        
+        elapsed = time.perf_counter() - started
+        summary = f"{executed} command(s), {failed} failed in {elapsed:.3f}s"
+        if stopped is not None:
+            summary += f" (stopped at line {stopped})"
+        print(summary, file=sys.stderr)
+        return failed
     
     def run(self):
         """Main CLI loop"""
@@ -239,7 +700,7 @@ class FileSystemCLI:
                 
                 if command:
                     self.execute_command(command, args)
-                
+            
             except KeyboardInterrupt:
                 print("\nUse 'exit' or 'quit' to exit the program")
             except EOFError:
@@ -248,10 +709,67 @@ class FileSystemCLI:
             except Exception as e:
                 print(f"Unexpected error: {e}")
 
-def main():
+def main(argv: list = None) -> int:
     """Main function"""
-    cli = FileSystemCLI()
-    cli.run()
+    parser = argparse.ArgumentParser(
+        description="File System Simulator CLI. Without -c or a script, commands are "
+                    "read interactively (or from stdin when it is not a terminal).")
+    parser.add_argument("script", nargs="?",
+                        help="run commands from this file ('-' for stdin) in one batch")
+    parser.add_argument("-c", dest="commands", metavar="COMMANDS",
+                        help="run commands separated by ';' in one batch")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="stop a batch at the first failing command")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record per-operation latency (see 'stats')")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--shared", action="store_true", default=True,
+                        help="share the data file with other processes (default)")
+    target.add_argument("--no-shared", dest="shared", action="store_false",
+                        help="use the data file without locking (single process only)")
+    # Metrics remote diaktifkan di server (server.py --metrics)
+    target.add_argument("--connect", metavar="ADDRESS",
+                        help="use a server at HOST:PORT or unix:PATH")
+    options = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if options.script is not None and options.commands is not None:
+        parser.error("use either -c or a script file, not both")
+    if options.connect and options.metrics:
+        parser.error("--metrics applies to the server when using --connect")
+    
+    script = options.commands
+    if options.script == "-" or (options.script is None and script is None
+                                 and not sys.stdin.isatty()):
+        script = sys.stdin.read()
+    elif options.script is not None:
+        try:
+            with open(options.script) as f:
+                script = f.read()
+        except OSError as e:
+            print(f"Cannot read '{options.script}': {e}", file=sys.stderr)
+            return 1
+    
+    if options.connect:
+        from client import RemoteFileSystem
+        try:
+            fs = RemoteFileSystem(options.connect)
+        except (OSError, ValueError) as e:
+            print(f"Cannot connect to '{options.connect}': {e}")
+            return 1
+        if script is None:
+            print(f"Connected to {options.connect}")
+    else:
+        # Default shared: CLI lain, GUI dan worker server boleh memakai data
+        # file yang sama tanpa kehilangan update
+        fs = FileSystemSimulator(shared=options.shared, metrics=options.metrics, quiet=True)
+    
+    cli = FileSystemCLI(fs)
+    try:
+        if script is None:
+            cli.run()
+            return 0
+        return 1 if cli.run_script(script, options.stop_on_error) else 0
+    finally:
+        fs.close()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
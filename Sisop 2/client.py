@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Thin client untuk server.py (dipakai oleh cli.py --connect)
+
+RemoteFileSystem meniru method FileSystemSimulator yang dipakai CLI:
+setiap pemanggilan dikirim sebagai request JSON, output dari server
+dicetak, dan hasilnya dikembalikan. call_many() mengirim beberapa
+request sekaligus lalu membaca semua response (pipelining).
+"""
+
+import re
+import sys
+import json
+import socket
+import builtins
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union, BinaryIO
+
+from chunk_store import CHUNK_SIZE
+from server import OPERATIONS, encode, decode, parse_address
+
+# Jumlah request maksimum yang dikirim sebelum response-nya dibaca; membatasi
+# data yang tertahan di socket agar client dan server tidak saling menunggu
+PIPELINE_WINDOW = 64
+
+
+class RemoteError(Exception):
+    """Exception dari server yang tidak punya padanan builtin"""
+
+
+class RemoteFileSystem:
+    """Proxy FileSystemSimulator lewat socket"""
+    
+    def __init__(self, address: str, timeout: Optional[float] = None):
+        kind, target = parse_address(address)
+        if kind == "unix":
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.settimeout(timeout)
+        self._sock.connect(target)
+        self._reader = self._sock.makefile("rb")
+        self._next_id = 1
+        self.address = address
+    
+    def close(self):
+        self._reader.close()
+        self._sock.close()
+    
+    def call_many(self, calls: Sequence[Tuple[str, tuple, dict]], echo: bool = True) -> List[dict]:
+        """Kirim request per PIPELINE_WINDOW sekaligus, baca response urut request"""
+        responses = []
+        for start in range(0, len(calls), PIPELINE_WINDOW):
+            responses.extend(self._send_window(calls[start:start + PIPELINE_WINDOW], echo))
+        return responses
+    
+    def _send_window(self, calls: Sequence[Tuple[str, tuple, dict]], echo: bool) -> List[dict]:
+        first_id = self._next_id
+        lines = []
+        for op, args, kwargs in calls:
+            lines.append(json.dumps({"id": self._next_id, "op": op, "args": encode(list(args)),
+                                     "kwargs": encode(kwargs)}, separators=(",", ":")))
+            self._next_id += 1
+        self._sock.sendall(("\n".join(lines) + "\n").encode("utf-8"))
+        
+        responses = []
+        for expected in range(first_id, self._next_id):
+            line = self._reader.readline()
+            if not line:
+                raise ConnectionError("Server closed the connection")
+            response = json.loads(line)
+            if response.get("id") != expected:
+                raise RemoteError(f"Out of order response {response.get('id')} (expected {expected})")
+            if echo and response["output"]:
+                sys.stdout.write(response["output"])
+            responses.append(response)
+        return responses
+    
+    @staticmethod
+    def _result(response: dict) -> Any:
+        if response["ok"]:
+            return decode(response["result"])
+        # Exception builtin dan re.error (regex find) dibangkitkan ulang apa adanya
+        module = {"builtins": builtins, "re": re}.get(response.get("module"))
+        error = getattr(module, response["type"], None)
+        if not (isinstance(error, type) and issubclass(error, Exception)):
+            error = RemoteError
+        raise error(response["error"])
+    
+    def call(self, op: str, *args, **kwargs) -> Any:
+        return self._result(self.call_many([(op, args, kwargs)])[0])
+    
+    def __getattr__(self, name: str):
+        if name not in OPERATIONS:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+    
+    @property
+    def current_directory(self) -> str:
+        return self.call("cwd")
+    
+    def stats(self) -> dict:
+        return self.call("stats")
+    
+    def iter_find(self, *args, **kwargs) -> Iterator[str]:
+        return iter(self.call("iter_find", *args, **kwargs))
+    
+    def read_stream(self, path: str, offset: int = 0,
+                    length: Optional[int] = None) -> Optional[Iterator[bytes]]:
+        """Baca file per chunk (satu request per chunk)"""
+        def want(position: int) -> int:
+            if length is None:
+                return CHUNK_SIZE
+            return min(CHUNK_SIZE, offset + length - position)
+        
+        first = self.call("read", path, offset, want(offset))
+        if first is None:
+            return None
+        
+        def chunks():
+            position, piece = offset, first
+            while piece:
+                yield piece
+                requested = want(position)
+                position += len(piece)
+                if len(piece) < requested or want(position) <= 0:
+                    return
+                piece = self.call("read", path, position, want(position))
+        return chunks()
+    
+    def write(self, path: str, data: Union[bytes, str, BinaryIO], offset: int = 0,
+              op: str = "write") -> bool:
+        """Tulis data; stream dikirim per chunk, PIPELINE_WINDOW chunk sekaligus
+        
+        Response satu window dibaca sebelum chunk berikutnya dibaca dari
+        stream, jadi memori client paling banyak satu window.
+        """
+        if isinstance(data, (str, bytes, bytearray)):
+            return self.call(op, path, data, offset) if op == "write" else self.call(op, path, data)
+        
+        position = offset
+        first = True
+        while True:
+            calls = []
+            while len(calls) < PIPELINE_WINDOW:
+                piece = data.read(CHUNK_SIZE)
+                if not piece:
+                    break
+                # Request diproses berurutan, jadi append per chunk tetap urut
+                args = (path, piece, position) if op == "write" else (path, piece)
+                calls.append((op, args, {}))
+                position += len(piece)
+            if not calls:
+                if not first:
+                    break
+                # Stream kosong: tetap buat file
+                calls.append((op, (path, b"", offset) if op == "write" else (path, b""), {}))
+            first = False
+            
+            for response in self._send_window(calls, echo=False):
+                if not (response["ok"] and response["result"]):
+                    sys.stdout.write(response["output"])
+                    return self._result(response)
+            if len(calls) < PIPELINE_WINDOW:
+                break
+        print(f"{position - offset} bytes written to '{path}'")
+        return True
+    
+    def append(self, path: str, data: Union[bytes, str, BinaryIO]) -> bool:
+        return self.write(path, data, op="append")
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Backend disk image (mmap) untuk File System Simulator
+
+Layout image (blok 4096 byte):
+    blok 0            : superblock
+    inode table       : record inode berukuran tetap (INODE_RECORD)
+    inode bitmap      : 1 bit per inode (terpakai/bebas)
+    block bitmap      : 1 bit per blok (terpakai/bebas)
+    data blocks       : isi directory (daftar nama -> nomor inode) dan
+                        daftar id chunk isi file
+
+File image dibuat sparse dengan ukuran disk_size MB, sehingga membuat
+dan membuka image besar hampir instan. Inode dibaca dari mmap hanya saat
+diakses pertama kali, lalu disimpan di cache.
+"""
+
+import os
+import sys
+import mmap
+import struct
+from itertools import chain
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from inode import Inode, DIRECTORY, encode_chunks, decode_chunks
+
+MAGIC = b"SIMFSIMG"
+VERSION = 2
+BLOCK_SIZE = 4096
+BYTES_PER_INODE = 16384  # Satu inode per 16 KB kapasitas disk
+MIN_INODES = 64
+NAME_MAX = 255
+
+# magic, versi, block size, total blocks, inode count, inode table start,
+# inode bitmap start, block bitmap start, data start, disk size (MB),
+# used space, cwd inode, hint alokasi inode, sparse space (versi 1 belum
+# punya sparse space)
+SUPERBLOCK = struct.Struct("<8sHIQQQQQQQqQQq")
+SUPERBLOCK_V1 = struct.Struct("<8sHIQQQQQQQqQQ")
+# kind+1 (0 = bebas), panjang nama, parent, size, created, modified,
+# tree_size, tree_count, blok awal data, jumlah blok, byte terpakai,
+# permissions, owner, nama
+INODE_RECORD = struct.Struct("<BxHxxxxqqqqqqIII10s32s255s17x")
+DIR_ENTRY = struct.Struct("<IH")
+
+
+class DiskImage:
+    """Disk image di atas file yang di-mmap"""
+    
+    def __init__(self, path: str, disk_size: int = 1024):
+        self.path = path
+        exists = os.path.exists(path) and os.path.getsize(path) >= BLOCK_SIZE
+        if not exists:
+            self._format(path, disk_size)
+        
+        self._file = open(path, "r+b")
+        self.mm = mmap.mmap(self._file.fileno(), 0)
+        self.bytes_written = 0  # Record, extent dan superblock (bitmap tidak dihitung)
+        magic, version = struct.unpack_from("<8sH", self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a simfs disk image")
+        if version not in (1, VERSION):
+            raise ValueError(f"Unsupported disk image version {version}")
+        fields = (SUPERBLOCK if version == VERSION else SUPERBLOCK_V1).unpack_from(self.mm, 0)
+        (_, _, block_size, self.total_blocks, self.inode_count,
+         self.inode_table_start, self.inode_bitmap_start, self.block_bitmap_start,
+         self.data_start, self.disk_size, self.used_space, self.cwd_inode,
+         self.inode_hint) = fields[:13]
+        if block_size != BLOCK_SIZE:
+            raise ValueError(f"Unsupported disk image version {version}")
+        # None: image versi 1, dihitung ulang oleh FileSystemSimulator
+        self.sparse_space = fields[13] if len(fields) > 13 else None
+        
+        self.inodes = ImageInodeTable(self)
+    
+    @staticmethod
+    def layout(disk_size: int) -> Tuple[int, ...]:
+        """Hitung (total_blocks, inode_count, itable, ibitmap, bbitmap, data)"""
+        total_blocks = disk_size * 1024 * 1024 // BLOCK_SIZE
+        inode_count = max(MIN_INODES, disk_size * 1024 * 1024 // BYTES_PER_INODE)
+        itable_blocks = -(-inode_count * INODE_RECORD.size // BLOCK_SIZE)
+        ibitmap_blocks = -(-inode_count // 8 // BLOCK_SIZE) or 1
+        bbitmap_blocks = -(-total_blocks // 8 // BLOCK_SIZE) or 1
+        itable = 1
+        ibitmap = itable + itable_blocks
+        bbitmap = ibitmap + ibitmap_blocks
+        data = bbitmap + bbitmap_blocks
+        if data >= total_blocks:
+            raise ValueError(f"Disk size {disk_size}MB is too small for a disk image")
+        return total_blocks, inode_count, itable, ibitmap, bbitmap, data
+    
+    def _format(self, path: str, disk_size: int):
+        """Buat image baru (sparse) berisi root directory"""
+        total_blocks, inode_count, itable, ibitmap, bbitmap, data = self.layout(disk_size)
+        with open(path, "wb") as f:
+            f.truncate(total_blocks * BLOCK_SIZE)
+            f.seek(0)
+            f.write(SUPERBLOCK.pack(MAGIC, VERSION, BLOCK_SIZE, total_blocks, inode_count,
+                                    itable, ibitmap, bbitmap, data, disk_size, 0, 1, 2, 0))
+            # Blok metadata ditandai terpakai di block bitmap
+            f.seek(bbitmap * BLOCK_SIZE)
+            full, rest = divmod(data, 8)
+            f.write(b"\xff" * full + (bytes([(1 << rest) - 1]) if rest else b""))
+        
+        image_file = open(path, "r+b")
+        try:
+            mm = mmap.mmap(image_file.fileno(), 0)
+            # Inode 0 dicadangkan, inode 1 adalah root
+            mm[ibitmap * BLOCK_SIZE] = 0b11
+            root = Inode(DIRECTORY, 0, "")
+            mm[itable * BLOCK_SIZE + INODE_RECORD.size:
+               itable * BLOCK_SIZE + 2 * INODE_RECORD.size] = self._pack_inode(root, 0, 0, 0)
+            mm.flush()
+            mm.close()
+        finally:
+            image_file.close()
+    
+    # ---- record inode -------------------------------------------------
+    
+    @staticmethod
+    def _pack_inode(node: Inode, block: int, blocks: int, used: int) -> bytes:
+        name = node.name.encode("utf-8")
+        if len(name) > NAME_MAX:
+            raise ValueError(f"Name too long: '{node.name}'")
+        is_dir = node.kind == DIRECTORY
+        return INODE_RECORD.pack(node.kind + 1, len(name), node.parent, node.size,
+                                 node.created, node.modified,
+                                 node.tree_size if is_dir else 0,
+                                 node.tree_count if is_dir else 0,
+                                 block, blocks, used,
+                                 node.permissions.encode("ascii"),
+                                 node.owner.encode("utf-8"), name)
+    
+    def _record_offset(self, ino: int) -> int:
+        return self.inode_table_start * BLOCK_SIZE + ino * INODE_RECORD.size
+    
+    def read_inode(self, ino: int) -> Optional[Tuple[Inode, Tuple[int, int, int]]]:
+        """Decode inode dari mmap; None jika slot bebas"""
+        if not 0 < ino < self.inode_count:
+            return None
+        (kind, name_len, parent, size, created, modified, tree_size, tree_count,
+         block, blocks, used, permissions, owner, name) = INODE_RECORD.unpack_from(
+            self.mm, self._record_offset(ino))
+        if kind == 0:
+            return None
+        node = Inode(kind - 1, parent, name[:name_len].decode("utf-8"), size,
+                     created=created, modified=modified,
+                     permissions=sys.intern(permissions.rstrip(b"\0").decode("ascii")),
+                     owner=sys.intern(owner.rstrip(b"\0").decode("utf-8")))
+        if node.kind == DIRECTORY:
+            node.tree_size = tree_size
+            node.tree_count = tree_count
+            node.children = self._read_listing(block, used)
+        elif used:
+            node.chunks = decode_chunks(self.read_extent(block, used).decode("ascii"))
+        return node, (block, blocks, used)
+    
+    def write_inode(self, ino: int, node: Inode, extent: Tuple[int, int, int]):
+        offset = self._record_offset(ino)
+        self.mm[offset:offset + INODE_RECORD.size] = self._pack_inode(node, *extent)
+        self.bytes_written += INODE_RECORD.size
+    
+    def clear_inode(self, ino: int):
+        offset = self._record_offset(ino)
+        self.mm[offset:offset + INODE_RECORD.size] = bytes(INODE_RECORD.size)
+        self.bytes_written += INODE_RECORD.size
+    
+    # ---- bitmap -------------------------------------------------------
+    
+    def _test_bit(self, start_block: int, index: int) -> bool:
+        return bool(self.mm[start_block * BLOCK_SIZE + index // 8] & (1 << (index % 8)))
+    
+    def _set_bit(self, start_block: int, index: int, value: bool):
+        offset = start_block * BLOCK_SIZE + index // 8
+        if value:
+            self.mm[offset] = self.mm[offset] | (1 << (index % 8))
+        else:
+            self.mm[offset] = self.mm[offset] & ~(1 << (index % 8)) & 0xFF
+    
+    def inode_in_use(self, ino: int) -> bool:
+        return 0 < ino < self.inode_count and self._test_bit(self.inode_bitmap_start, ino)
+    
+    def allocate_inode(self) -> int:
+        """Cari slot inode bebas mulai dari hint (first-fit, wrap around)"""
+        start = self.inode_bitmap_start * BLOCK_SIZE
+        count_bytes = -(-self.inode_count // 8)
+        hint_byte = self.inode_hint // 8
+        for byte_index in chain(range(hint_byte, count_bytes), range(0, hint_byte)):
+            value = self.mm[start + byte_index]
+            if value == 0xFF:
+                continue
+            for bit in range(8):
+                ino = byte_index * 8 + bit
+                if not value & (1 << bit) and 0 < ino < self.inode_count:
+                    self._set_bit(self.inode_bitmap_start, ino, True)
+                    self.inode_hint = ino + 1
+                    return ino
+        raise OSError("No free inodes left in disk image")
+    
+    def free_inode(self, ino: int):
+        self._set_bit(self.inode_bitmap_start, ino, False)
+        self.clear_inode(ino)
+    
+    def used_inodes(self) -> Iterator[int]:
+        """Iterasi nomor inode yang terpakai menurut inode bitmap"""
+        start = self.inode_bitmap_start * BLOCK_SIZE
+        count_bytes = -(-self.inode_count // 8)
+        for byte_index in range(count_bytes):
+            value = self.mm[start + byte_index]
+            if not value:
+                continue
+            for bit in range(8):
+                if value & (1 << bit):
+                    ino = byte_index * 8 + bit
+                    if 0 < ino < self.inode_count:
+                        yield ino
+    
+    def allocate_blocks(self, count: int) -> int:
+        """Alokasikan extent blok berurutan (rata ke grup 8 blok)"""
+        start = self.block_bitmap_start * BLOCK_SIZE
+        bitmap_bytes = -(-self.total_blocks // 8)
+        group_bytes = -(-count // 8)
+        offset = self.mm.find(b"\0" * group_bytes, start, start + bitmap_bytes)
+        if offset < 0:
+            raise OSError("No free blocks left in disk image")
+        first = (offset - start) * 8
+        if first + count > self.total_blocks:
+            raise OSError("No free blocks left in disk image")
+        for block in range(first, first + count):
+            self._set_bit(self.block_bitmap_start, block, True)
+        return first
+    
+    def free_blocks(self, first: int, count: int):
+        for block in range(first, first + count):
+            self._set_bit(self.block_bitmap_start, block, False)
+    
+    def free_block_count(self) -> int:
+        start = self.block_bitmap_start * BLOCK_SIZE
+        bitmap = self.mm[start:start + -(-self.total_blocks // 8)]
+        used = int.from_bytes(bitmap, "little").bit_count()
+        return self.total_blocks - used
+    
+    # ---- data blocks --------------------------------------------------
+    
+    def read_extent(self, block: int, used: int) -> bytes:
+        offset = block * BLOCK_SIZE
+        return self.mm[offset:offset + used]
+    
+    def write_extent(self, data: bytes,
+                     extent: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """Tulis data ke extent; extent diperbesar (kelipatan 2) bila perlu"""
+        block, blocks, _ = extent
+        needed = -(-len(data) // BLOCK_SIZE)
+        if needed > blocks:
+            if blocks:
+                self.free_blocks(block, blocks)
+            blocks = 1
+            while blocks < needed:
+                blocks *= 2
+            block = self.allocate_blocks(blocks)
+        elif not data and blocks:
+            self.free_blocks(block, blocks)
+            block, blocks = 0, 0
+        
+        if data:
+            offset = block * BLOCK_SIZE
+            self.mm[offset:offset + len(data)] = data
+            self.bytes_written += len(data)
+        return block, blocks, len(data)
+    
+    def _read_listing(self, block: int, used: int) -> Dict[str, int]:
+        children = {}
+        offset = block * BLOCK_SIZE
+        end = offset + used
+        while offset < end:
+            ino, name_len = DIR_ENTRY.unpack_from(self.mm, offset)
+            offset += DIR_ENTRY.size
+            children[self.mm[offset:offset + name_len].decode("utf-8")] = ino
+            offset += name_len
+        return children
+    
+    def write_listing(self, children: Dict[str, int],
+                      extent: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """Tulis isi directory ke data blocks"""
+        data = bytearray()
+        for name, ino in children.items():
+            encoded = name.encode("utf-8")
+            data += DIR_ENTRY.pack(ino, len(encoded))
+            data += encoded
+        return self.write_extent(bytes(data), extent)
+    
+    # ---- superblock ---------------------------------------------------
+    
+    def write_superblock(self, used_space: int, sparse_space: int, cwd_inode: int):
+        self.used_space = used_space
+        self.sparse_space = sparse_space
+        self.cwd_inode = cwd_inode
+        self.mm[0:SUPERBLOCK.size] = SUPERBLOCK.pack(
+            MAGIC, VERSION, BLOCK_SIZE, self.total_blocks, self.inode_count,
+            self.inode_table_start, self.inode_bitmap_start, self.block_bitmap_start,
+            self.data_start, self.disk_size, used_space, cwd_inode, self.inode_hint,
+            sparse_space)
+        self.bytes_written += SUPERBLOCK.size
+    
+    def flush(self):
+        self.mm.flush()
+    
+    def close(self):
+        self.mm.close()
+        self._file.close()
+
+
+class ImageInodeTable(MutableMapping):
+    """Inode table yang dibaca malas dari disk image
+    
+    Inode yang sudah diakses disimpan di cache. Perubahan (set/del) hanya
+    dicatat di memori dan ditulis ke image saat flush(), sehingga
+    transaksi dan rollback bekerja sama seperti pada inode table dict.
+    """
+    
+    def __init__(self, image: DiskImage):
+        self.image = image
+        self._cache: Dict[int, Inode] = {}
+        self._extents: Dict[int, Tuple[int, int, int]] = {}
+        self._deleted = set()
+    
+    def __getitem__(self, ino: int) -> Inode:
+        node = self._cache.get(ino)
+        if node is not None:
+            return node
+        if ino in self._deleted or not self.image.inode_in_use(ino):
+            raise KeyError(ino)
+        loaded = self.image.read_inode(ino)
+        if loaded is None:
+            raise KeyError(ino)
+        node, self._extents[ino] = loaded
+        self._cache[ino] = node
+        return node
+    
+    def __contains__(self, ino: object) -> bool:
+        if ino in self._cache:
+            return True
+        return (isinstance(ino, int) and ino not in self._deleted
+                and self.image.inode_in_use(ino))
+    
+    def __setitem__(self, ino: int, node: Inode):
+        if not 0 < ino < self.image.inode_count:
+            raise OSError(f"Inode {ino} is outside the disk image inode table")
+        self._deleted.discard(ino)
+        if not self.image.inode_in_use(ino):
+            self.image._set_bit(self.image.inode_bitmap_start, ino, True)
+        self._cache[ino] = node
+    
+    def __delitem__(self, ino: int):
+        if ino not in self:
+            raise KeyError(ino)
+        self._cache.pop(ino, None)
+        self._deleted.add(ino)
+    
+    def __iter__(self) -> Iterator[int]:
+        for ino in self.image.used_inodes():
+            if ino not in self._deleted:
+                yield ino
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    @property
+    def cached_count(self) -> int:
+        """Jumlah inode yang sudah dibaca ke memori"""
+        return len(self._cache)
+    
+    def flush(self, inos: Iterable[int]):
+        """Tulis inode yang berubah (dan data block-nya) ke image"""
+        # Inode yang dihapus selalu dibebaskan, termasuk hasil rollback
+        for ino in set(inos) | self._deleted:
+            node = self._cache.get(ino)
+            if node is None:
+                if ino in self._deleted:
+                    block, blocks, _ = self._extents.pop(ino, (0, 0, 0))
+                    if blocks:
+                        self.image.free_blocks(block, blocks)
+                    self.image.free_inode(ino)
+                    self._deleted.discard(ino)
+                continue
+            extent = self._extents.get(ino, (0, 0, 0))
+            if node.kind == DIRECTORY:
+                extent = self.image.write_listing(node.children, extent)
+            else:
+                extent = self.image.write_extent(
+                    encode_chunks(node.chunks).encode("ascii"), extent)
+            self._extents[ino] = extent
+            self.image.write_inode(ino, node, extent)
+    
+    def flush_all(self):
+        self.flush(self._cache)
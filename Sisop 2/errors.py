@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Exception FileSystemSimulator untuk mode quiet (quiet=True)
+
+Di mode quiet operasi tidak mencetak apa pun: kegagalan dibangkitkan
+sebagai subclass FileSystemError dengan pesan yang sama seperti yang
+dicetak mode biasa. Setiap subclass juga turunan exception builtin yang
+sepadan (FileNotFoundError, NotADirectoryError, ...) sehingga kode yang
+menangkap OSError/ValueError tetap jalan.
+"""
+
+
+class FileSystemError(Exception):
+    """Dasar semua error operasi filesystem"""
+
+
+class PathNotFoundError(FileSystemError, FileNotFoundError):
+    """Path (atau parent-nya) tidak ada"""
+
+
+class PathExistsError(FileSystemError, FileExistsError):
+    """Tujuan sudah ada"""
+
+
+class NotDirectoryError(FileSystemError, NotADirectoryError):
+    """Operasi directory pada file"""
+
+
+class IsDirectoryError(FileSystemError, IsADirectoryError):
+    """Operasi file pada directory"""
+
+
+class DirectoryNotEmptyError(FileSystemError, OSError):
+    """rm tanpa recursive pada directory berisi"""
+
+
+class DiskFullError(FileSystemError, OSError):
+    """Kuota disk_size terlampaui"""
+
+
+class InvalidOperationError(FileSystemError, ValueError):
+    """Argumen atau operasi tidak valid (root, offset, copy ke dirinya sendiri)"""
+
+
+class SnapshotError(FileSystemError, LookupError):
+    """Snapshot tidak ada, sudah ada, atau tidak bisa dipakai saat ini"""
+
+
+class StorageError(FileSystemError, OSError):
+    """Gagal membaca atau menulis data ke disk host"""
@@ -6,69 +6,920 @@ Tugas Sistem Operasi
 
 import os
 import json
+import re
 import time
-from datetime import datetime
-from typing import Dict, List, Any, Optional
+import fnmatch
+import itertools
+import contextlib
+from contextlib import contextmanager
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Dict, List, Any, Optional, Iterator, Union, BinaryIO, Tuple
+import io
 import shutil
+import threading
+from inode import Inode, FILE, DIRECTORY, ROOT_INODE, now_timestamp, timestamp_to_iso
+from chunk_store import ChunkStore, CHUNK_SIZE
+from snapshots import Snapshot, SnapshotStore
+from name_index import NameIndex
+import binary_snapshot
+from disk_image import DiskImage
+from shard_store import ShardedInodeTable
+from locking import LockManager
+from shared_access import SharedAccess
+from metrics import Metrics
+from errors import (FileSystemError, PathNotFoundError, PathExistsError, NotDirectoryError,
+                    IsDirectoryError, DirectoryNotEmptyError, DiskFullError,
+                    InvalidOperationError, SnapshotError, StorageError)
+from results import (DirEntry, StatResult, DiskUsage, UsageEntry, listing_lines, find_lines,
+                     snapshot_lines, diff_lines)
+
+FORMAT_VERSION = 2
+# Checkpoint default berformat biner; filesystem_data.json lama dimuat
+# sekali lalu disimpan ulang sebagai biner (lihat load_filesystem)
+DEFAULT_DATA_FILE = "filesystem_data.simfs"
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    """Baca tepat size byte dari stream (kurang hanya jika EOF)"""
+    data = b""
+    while len(data) < size:
+        piece = stream.read(size - len(data))
+        if not piece:
+            break
+        data += piece
+    return data
+
+
+class EntryView(Mapping):
+    """View dict-compatible dari satu inode, dengan children berupa path"""
+    
+    HIDDEN_KEYS = ("parent", "name", "chunks")
+    
+    def __init__(self, fs: "FileSystemSimulator", ino: int, path: str):
+        self._fs = fs
+        self._entry = fs.inodes[ino]
+        self._path = path
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == "content" and self._entry.kind == FILE:
+            # Isi file dibaca hanya jika diminta (tidak ikut dict(view))
+            return self._fs.read(self._path).decode("utf-8", errors="replace")
+        if key in self.HIDDEN_KEYS:
+            raise KeyError(key)
+        value = self._entry[key]
+        if key == "children":
+            return {name: self._fs._join(self._path, name) for name in value}
+        return value
+    
+    def __iter__(self) -> Iterator[str]:
+        return (key for key in self._entry if key not in self.HIDDEN_KEYS)
+    
+    def __len__(self) -> int:
+        # Directory tidak punya chunks: hitung key yang benar-benar terlihat
+        return sum(1 for key in self._entry if key not in self.HIDDEN_KEYS)
+
+
+class FileSystemView(Mapping):
+    """View read-only file_system yang di-key dengan absolute path"""
+    
+    def __init__(self, fs: "FileSystemSimulator"):
+        self._fs = fs
+    
+    def __getitem__(self, path: str) -> EntryView:
+        ino = self._fs._resolve(path)[1]
+        if ino is None:
+            raise KeyError(path)
+        return EntryView(self._fs, ino, path)
+    
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and self._fs._resolve(path)[1] is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        stack = [(ROOT_INODE, "/")]
+        while stack:
+            ino, path = stack.pop()
+            yield path
+            entry = self._fs.inodes[ino]
+            if entry.kind == DIRECTORY:
+                for name, child in entry.children.items():
+                    stack.append((child, self._fs._join(path, name)))
+    
+    def __len__(self) -> int:
+        return len(self._fs.inodes)
+
 
 class FileSystemSimulator:
-    def __init__(self, disk_size: int = 1024):  # Size in MB
+    def __init__(self, disk_size: int = 1024,  # Size in MB
+                 data_file: str = DEFAULT_DATA_FILE,
+                 journal: bool = False, checkpoint_interval: int = 1000,
+                 path_cache_size: int = 4096, storage: str = "snapshot",
+                 shard_memory_limit: int = 64 * 1024 * 1024,
+                 thread_safe: bool = False, shared: bool = False,
+                 metrics: bool = False, quiet: bool = False):
         self.disk_size = disk_size
+        # quiet: tanpa print; kegagalan dibangkitkan sebagai FileSystemError
+        # (errors.py) dan ls/stat/df/du mengembalikan objek hasil (results.py)
+        self.quiet = quiet
         self.used_space = 0
-        self.current_directory = "/"
-        self.file_system = {
-            "/": {
-                "type": "directory",
-                "created": datetime.now().isoformat(),
-                "modified": datetime.now().isoformat(),
-                "size": 0,
-                "permissions": "rwxr-xr-x",
-                "owner": "user",
-                "children": {}
-            }
-        }
-        self.load_filesystem()
+        # Byte file yang tidak didukung chunk (hole), dijaga seperti used_space
+        self.sparse_space = 0
+        # Inode table: entry disimpan per nomor inode, directory
+        # memetakan nama ke nomor inode (bukan ke absolute path)
+        self.inodes = {ROOT_INODE: Inode(DIRECTORY, 0, "")}
+        self.next_inode = ROOT_INODE + 1
+        self.cwd_inode = ROOT_INODE
+        self.file_system = FileSystemView(self)
+        # LRU cache (cwd, path) -> (absolute path, inode)
+        self.path_cache_size = path_cache_size
+        self._path_cache = OrderedDict()
+        self.path_cache_hits = 0
+        self.path_cache_misses = 0
+        # Journal mode: mutasi ditulis ke log append-only, lalu dilipat
+        # ke checkpoint (data_file) setiap checkpoint_interval record
+        # storage="image": inode table disimpan di disk image (mmap) berukuran
+        # disk_size MB dan dibaca malas; perubahan ditulis langsung ke image.
+        # storage="sharded": satu shard per directory di data_file (directory),
+        # dimuat saat disentuh dan dibuang LRU di atas shard_memory_limit byte
+        if storage not in ("snapshot", "image", "sharded"):
+            raise ValueError(f"Unknown storage backend '{storage}'")
+        if thread_safe and storage != "snapshot":
+            raise ValueError("thread_safe requires storage='snapshot'")
+        if shared and (storage != "snapshot" or thread_safe):
+            raise ValueError("shared requires storage='snapshot' without thread_safe")
+        snapshot_name = data_file == DEFAULT_DATA_FILE or data_file.endswith(".json")
+        if storage == "image" and snapshot_name:
+            data_file = os.path.splitext(data_file)[0] + ".img"
+        if storage == "sharded" and snapshot_name:
+            data_file = os.path.splitext(data_file)[0] + ".shards"
+        self.storage = storage
+        self.image = None
+        self.shards = None
+        self.shard_memory_limit = shard_memory_limit
+        self.data_file = data_file
+        # Format checkpoint: JSON untuk *.json, biner untuk ekstensi lain;
+        # saat load mengikuti format file yang ditemukan
+        self.snapshot_format = binary_snapshot.format_for_path(data_file)
+        self.journal_file = os.path.splitext(data_file)[0] + ".journal"
+        # shared: beberapa proses memakai data_file yang sama (shared_access.py);
+        # perubahan proses lain dibaca dari journal, jadi journal selalu aktif
+        self.journal = journal or shared
+        self.checkpoint_interval = checkpoint_interval
+        self._journal_records = 0
+        self._journal_offset = 0  # Posisi byte journal yang sudah diterapkan
+        # Generation naik setiap commit; dicatat di record journal dan checkpoint
+        self.generation = 0
+        self._checkpoint_generation = 0
+        # Isi file disimpan per chunk (di-key dengan hash) di luar metadata.
+        # Perubahan reference count ditunda sampai metadata tersimpan
+        self.chunk_store = ChunkStore(os.path.splitext(data_file)[0] + ".chunks")
+        self._added_refs = []
+        self._dropped_refs = []
+        # Snapshot copy-on-write: delta pre-image per snapshot
+        self.snapshots = SnapshotStore(os.path.splitext(data_file)[0] + ".snapshots")
+        self._snapshot_pending = {}  # Pre-image baru yang belum ditulis ke disk
+        self._dirty = set()
+        self._undo = None  # Pre-image inode selama transaksi aktif
+        # Byte yang ditulis ke disk per jenis (dibaca metrics, lihat persisted_bytes)
+        self._bytes_persisted = {"journal": 0, "checkpoint": 0, "image": 0, "shards": 0}
+        self.name_index = NameIndex()
+        # thread_safe: lock per directory (locking.py) untuk struktur tree,
+        # _state_lock untuk state bersama (used_space, agregat, index, persist)
+        self._state_lock = threading.RLock() if thread_safe else contextlib.nullcontext()
+        self._cache_lock = threading.Lock() if thread_safe else contextlib.nullcontext()
+        started = time.perf_counter()
+        self.shared = None
+        if shared:
+            self.shared = SharedAccess(self)
+            with self.shared.locked(True, sync=False):
+                self.load_filesystem()
+            self.shared.install()
+        else:
+            self.load_filesystem()
+        self.locks = None
+        if thread_safe:
+            self.locks = LockManager(self)
+            self.locks.install()
+        # metrics: latency per operasi (metrics.py); tanpa wrapper saat tidak aktif
+        self.metrics = None
+        if metrics:
+            self.enable_metrics().record("load_filesystem", time.perf_counter() - started)
+    
+    @property
+    def current_directory(self) -> str:
+        """Absolute path dari current directory"""
+        return self._path_of(self.cwd_inode)
+    
+    @current_directory.setter
+    def current_directory(self, path: str):
+        ino = self._resolve(path)[1]
+        if ino is None or self.inodes[ino].kind != DIRECTORY:
+            ino = ROOT_INODE
+        self.cwd_inode = ino
+    
+    def _fail(self, error: FileSystemError, result: Any = False) -> Any:
+        """Mode quiet: raise error; selain itu cetak pesannya dan kembalikan result"""
+        if self.quiet:
+            raise error
+        print(error)
+        return result
+    
+    def _info(self, message: str):
+        """Pesan sukses (tidak dicetak di mode quiet)"""
+        if not self.quiet:
+            print(message)
+    
+    def _show(self, lines: List[str]):
+        """Cetak hasil ls/find/du/... dalam satu write, bukan per baris"""
+        if not self.quiet and lines:
+            print("\n".join(lines))
     
     def save_filesystem(self):
-        """Simpan filesystem ke file JSON"""
+        """Simpan filesystem ke data_file (checkpoint penuh)"""
+        if self.image is not None:
+            self._flush_image(all_inodes=True)
+            return
+        if self.shards is not None:
+            self._flush_shards(all_shards=True)
+            return
+        self._checkpoint(self.generation + 1)
+    
+    def _checkpoint(self, generation: int):
+        """Tulis checkpoint dengan generation tertentu lalu buang journal"""
+        try:
+            self._write_snapshot(self.data_file, self.snapshot_format, generation)
+            self._bytes_persisted["checkpoint"] += os.path.getsize(self.data_file)
+            # Semua record journal sudah masuk checkpoint
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+            self.generation = self._checkpoint_generation = generation
+            self._journal_records = 0
+            self._journal_offset = 0
+            self._dirty.clear()
+        except Exception as e:
+            self._fail(StorageError(f"Error saving filesystem: {e}"), None)
+    
+    def load_filesystem(self):
+        """Load filesystem dari data_file lalu replay journal"""
+        self._invalidate_paths()
+        self.sparse_space = None
+        if self.storage == "image":
+            self._open_image()
+        elif self.storage == "sharded":
+            self._open_shards()
+        else:
+            try:
+                self.generation = 0
+                path = self.data_file
+                legacy = os.path.splitext(path)[0] + ".json"
+                if (not os.path.exists(path) and self.snapshot_format == "binary"
+                        and os.path.exists(legacy)):
+                    # Migrasi: baca checkpoint JSON lama, simpan berikutnya biner
+                    path = legacy
+                if os.path.exists(path):
+                    self.generation = self._read_snapshot(path, detect_format=path == self.data_file)
+                self._checkpoint_generation = self.generation
+                self._after_load()
+            except Exception as e:
+                self._fail(StorageError(f"Error loading filesystem: {e}"), None)
+        try:
+            self.snapshots.load()
+        except Exception as e:
+            self._fail(StorageError(f"Error loading snapshots: {e}"), None)
+        if not self.chunk_store.load():
+            self.rebuild_chunk_refs()
+        if self.sparse_space is None:
+            # Data file lama tanpa sparse_space: hitung sekali
+            self.sparse_space = self._scan_sparse()
+    
+    def export_snapshot(self, path: str, snapshot_format: str = None) -> bool:
+        """Export filesystem ke file JSON atau biner (default dari ekstensi)"""
+        try:
+            self._write_snapshot(path, snapshot_format or binary_snapshot.format_for_path(path))
+            return True
+        except Exception as e:
+            return self._fail(StorageError(f"Error exporting filesystem: {e}"))
+    
+    def import_snapshot(self, path: str) -> bool:
+        """Import filesystem dari file JSON atau biner lalu simpan"""
+        if not os.path.exists(path):
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"))
         try:
-            with open("filesystem_data.json", "w") as f:
+            self._invalidate_paths()
+            self._read_snapshot(path, detect_format=False)
+            self.rebuild_index()
+            if any(node.kind == DIRECTORY and node.tree_size is None
+                   for node in self.inodes.values()):
+                self.recompute_tree_stats()
+            if self.sparse_space is None:
+                self.sparse_space = self._scan_sparse()
+            if self.storage == "image":
+                self._import_into_image()
+            elif self.storage == "sharded":
+                self._import_into_shards()
+        except Exception as e:
+            return self._fail(StorageError(f"Error importing filesystem: {e}"))
+        if self.snapshots.snapshots:
+            # Delta snapshot relatif terhadap state lama, tidak berlaku lagi
+            self._info("Existing snapshots discarded")
+            self.snapshots.clear()
+        self.save_filesystem()
+        self.rebuild_chunk_refs()
+        return True
+    
+    def rebuild_chunk_refs(self):
+        """Hitung ulang reference count chunk dari seluruh metadata file"""
+        if not os.path.isdir(self.chunk_store.directory):
+            return
+        nodes = itertools.chain(self.inodes.values(),
+                                (node for snapshot in self.snapshots.snapshots
+                                 for node in snapshot.delta.values() if node is not None))
+        self.chunk_store.rebuild(chunk for node in nodes
+                                 if node.kind == FILE for chunk in node.chunks if chunk)
+        self.chunk_store.save()
+    
+    def _open_image(self):
+        """Buka (atau format) disk image; inode dibaca saat diakses"""
+        if self.image is not None:
+            self.image.close()
+        self.image = DiskImage(self.data_file, self.disk_size)
+        self.inodes = self.image.inodes
+        self.disk_size = self.image.disk_size
+        self.used_space = self.image.used_space
+        self.sparse_space = self.image.sparse_space
+        self.cwd_inode = self.image.cwd_inode if self.image.cwd_inode in self.inodes else ROOT_INODE
+        self._dirty.clear()
+        self.rebuild_index()
+    
+    def _import_into_image(self):
+        """Tulis inode table hasil import ke disk image yang baru"""
+        inodes = self.inodes
+        self.image.close()
+        os.remove(self.data_file)
+        self.image = DiskImage(self.data_file, self.disk_size)
+        for ino, node in inodes.items():
+            self.image.inodes[ino] = node
+        self.inodes = self.image.inodes
+        self.image.inode_hint = self.next_inode
+    
+    def _open_shards(self):
+        """Buka store bersharding; hanya meta.json yang dibaca"""
+        self.shards = ShardedInodeTable(self.data_file, self.shard_memory_limit)
+        self.inodes = self.shards
+        meta = self.shards.meta
+        self.used_space = meta.get("used_space", 0)
+        self.sparse_space = meta.get("sparse_space")
+        self.next_inode = meta.get("next_inode", ROOT_INODE + 1)
+        self.disk_size = meta.get("disk_size", self.disk_size)
+        self._dirty.clear()
+        self.rebuild_index()
+        # cwd disimpan sebagai path agar cukup memuat shard di sepanjang path
+        self.current_directory = meta.get("cwd", "/")
+    
+    def _import_into_shards(self):
+        """Tulis inode table hasil import ke store bersharding yang baru"""
+        inodes = self.inodes
+        if os.path.isdir(self.data_file):
+            shutil.rmtree(self.data_file)
+        self.shards = ShardedInodeTable(self.data_file, self.shard_memory_limit)
+        for ino, node in inodes.items():
+            self.shards[ino] = node
+        self.inodes = self.shards
+    
+    def _flush_shards(self, all_shards: bool = False):
+        """Tulis shard yang berubah dan meta.json"""
+        state = {
+            "format": 1,
+            "used_space": self.used_space,
+            "sparse_space": self.sparse_space,
+            "next_inode": self.next_inode,
+            "disk_size": self.disk_size,
+            "cwd": self.current_directory
+        }
+        written = self.shards.bytes_written
+        try:
+            if all_shards:
+                self.shards.flush_all(state)
+            else:
+                self.shards.flush(self._dirty, state)
+            self._dirty.clear()
+            self._bytes_persisted["shards"] += self.shards.bytes_written - written
+        except Exception as e:
+            self._fail(StorageError(f"Error writing shards: {e}"), None)
+    
+    def _flush_image(self, all_inodes: bool = False):
+        """Tulis inode yang berubah dan superblock ke disk image"""
+        written = self.image.bytes_written
+        try:
+            if all_inodes:
+                self.inodes.flush_all()
+            else:
+                self.inodes.flush(self._dirty)
+            self.image.write_superblock(self.used_space, self.sparse_space, self.cwd_inode)
+            self.image.flush()
+            self._dirty.clear()
+            self._bytes_persisted["image"] += self.image.bytes_written - written
+        except Exception as e:
+            self._fail(StorageError(f"Error writing disk image: {e}"), None)
+    
+    def close(self):
+        """Tutup disk image dan lock file mode shared"""
+        if self.image is not None:
+            self._flush_image()
+            self.image.close()
+            self.image = None
+        if self.shared is not None:
+            self.shared.close()
+    
+    def enable_metrics(self) -> Metrics:
+        """Aktifkan instrumentasi operasi; hasilnya objek Metrics"""
+        if self.metrics is None:
+            self.metrics = Metrics(self)
+            self.metrics.install()
+        return self.metrics
+    
+    def disable_metrics(self):
+        """Lepas instrumentasi; statistik yang terkumpul dibuang"""
+        if self.metrics is not None:
+            self.metrics.uninstall()
+            self.metrics = None
+    
+    def persisted_bytes(self) -> Dict[str, int]:
+        """Byte yang ditulis ke disk sejak instance dibuat, per jenis"""
+        return dict(self._bytes_persisted, chunks=self.chunk_store.bytes_written,
+                    snapshots=self.snapshots.bytes_written)
+    
+    def refresh(self) -> bool:
+        """Mode shared: terapkan commit proses lain sekarang; True jika ada"""
+        if self.shared is None:
+            return False
+        return self.shared.refresh()
+    
+    def _after_load(self):
+        """Bangun index, replay journal, lengkapi agregat setelah load"""
+        self.rebuild_index()
+        self.replay_journal()
+        if any(node.kind == DIRECTORY and node.tree_size is None
+               for node in self.inodes.values()):
+            self.recompute_tree_stats()
+    
+    def _write_snapshot(self, path: str, snapshot_format: str, generation: int = None):
+        """Tulis snapshot penuh secara atomic (tmp file + rename)"""
+        generation = self.generation if generation is None else generation
+        tmp_file = path + ".tmp"
+        if snapshot_format == "binary":
+            with open(tmp_file, "wb") as f:
+                binary_snapshot.dump({
+                    "inodes": self.inodes,
+                    "next_inode": self.next_inode,
+                    "cwd_inode": self.cwd_inode,
+                    "used_space": self.used_space,
+                    "sparse_space": self.sparse_space,
+                    "disk_size": self.disk_size,
+                    "generation": generation
+                }, f)
+        else:
+            with open(tmp_file, "w") as f:
                 json.dump({
-                    "file_system": self.file_system,
-                    "current_directory": self.current_directory,
+                    "format": FORMAT_VERSION,
+                    "inodes": {ino: node.to_dict() for ino, node in self.inodes.items()},
+                    "next_inode": self.next_inode,
+                    "cwd_inode": self.cwd_inode,
                     "used_space": self.used_space,
-                    "disk_size": self.disk_size
+                    "sparse_space": self.sparse_space,
+                    "disk_size": self.disk_size,
+                    "generation": generation
                 }, f, indent=2)
+        os.replace(tmp_file, path)
+    
+    def _read_snapshot(self, path: str, detect_format: bool = True) -> int:
+        """Baca snapshot JSON/biner (format dari magic bytes); hasil = generation"""
+        if binary_snapshot.is_binary_snapshot(path):
+            with open(path, "rb") as f:
+                data = binary_snapshot.load(f)
+            self.inodes = data["inodes"]
+            self.next_inode = data["next_inode"]
+            self.cwd_inode = data["cwd_inode"]
+            if detect_format:
+                self.snapshot_format = "binary"
+        else:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if "inodes" in data:
+                self.inodes = {int(ino): Inode.from_dict(entry)
+                               for ino, entry in data["inodes"].items()}
+                self.next_inode = data.get("next_inode", max(self.inodes) + 1)
+                self.cwd_inode = data.get("cwd_inode", ROOT_INODE)
+            elif "file_system" in data:
+                # Format lama: tabel di-key dengan absolute path
+                self._import_path_table(data["file_system"])
+                self.current_directory = data.get("current_directory", "/")
+            if detect_format:
+                self.snapshot_format = "json"
+        self.used_space = data.get("used_space", 0)
+        self.sparse_space = data.get("sparse_space")
+        self.disk_size = data.get("disk_size", 1024)
+        return data.get("generation", 0)
+    
+    def _import_path_table(self, file_system: Dict[str, Any]):
+        """Konversi tabel lama {path: entry} ke inode table"""
+        self.inodes = {}
+        self.next_inode = ROOT_INODE
+        seen = set()
+        stack = [("/", 0, "")]
+        while stack:
+            path, parent, name = stack.pop()
+            if path in seen or path not in file_system:
+                continue
+            seen.add(path)
+            
+            entry = Inode.from_dict(file_system[path])
+            ino = self.next_inode
+            self.next_inode += 1
+            entry.parent = parent
+            entry.name = name
+            if entry.kind == DIRECTORY:
+                children = file_system[path]["children"]
+                entry.children = {}
+                for child_name, child_path in children.items():
+                    stack.append((child_path, ino, child_name))
+            self.inodes[ino] = entry
+            if parent:
+                self.inodes[parent].children[name] = ino
+    
+    def rebuild_index(self):
+        """Tandai index nama basi; dibangun ulang saat find() berikutnya"""
+        self.name_index.invalidate()
+    
+    def _ensure_index(self) -> NameIndex:
+        """Bangun index nama dari seluruh inode table jika belum ada"""
+        if not self.name_index.ready:
+            self.name_index.build((ino, node.name) for ino, node in self.inodes.items()
+                                  if ino != ROOT_INODE)
+        return self.name_index
+    
+    def recompute_tree_stats(self):
+        """Hitung ulang tree_size/tree_count semua directory (post-order)"""
+        order = self._collect_subtree(ROOT_INODE)
+        for ino in order:
+            node = self.inodes[ino]
+            if node.kind == DIRECTORY:
+                node.tree_size = 0
+                node.tree_count = 0
+                if self.shards is not None:
+                    self.shards.adjust(ino, node)
+        for ino in reversed(order):
+            node = self.inodes[ino]
+            if ino != ROOT_INODE:
+                size, count = node.usage()
+                parent = self.inodes[node.parent]
+                parent.tree_size += size
+                parent.tree_count += count
+                if self.shards is not None:
+                    self.shards.adjust(node.parent, parent)
+    
+    def _adjust_ancestors(self, ino: int, size_delta: int, count_delta: int):
+        """Update ukuran/jumlah entry agregat dari ino sampai root"""
+        while ino:
+            # Store bersharding: agregat ditulis ke index, shard ancestor tidak
+            self._mark(ino, aggregate=True)
+            node = self.inodes[ino]
+            node.tree_size += size_delta
+            node.tree_count += count_delta
+            if self.shards is not None:
+                self.shards.adjust(ino, node)
+            ino = node.parent
+    
+    def _replace_inode(self, ino: int, node: Optional[Inode]):
+        """Ganti/hapus inode sambil menjaga index nama tetap sinkron"""
+        self._invalidate_paths()
+        old = self.inodes.pop(ino, None)
+        if old is not None and ino != ROOT_INODE:
+            self.name_index.remove(old.name, ino)
+        if node is not None:
+            self.inodes[ino] = node
+            if ino != ROOT_INODE:
+                self.name_index.add(node.name, ino)
+    
+    def replay_journal(self, offset: int = 0) -> int:
+        """Terapkan record journal di atas checkpoint terakhir
+        
+        offset melanjutkan dari posisi byte tertentu (mode shared). Record
+        dengan gen <= generation sudah ada di state dan dilewati. Hasilnya
+        jumlah record yang diterapkan.
+        """
+        if not offset:
+            self._journal_records = 0
+        self._journal_offset = offset
+        if not os.path.exists(self.journal_file):
+            return 0
+        
+        applied = 0
+        with open(self.journal_file, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError
+                    record = json.loads(line)
+                except ValueError:
+                    # Record terakhir terpotong (crash saat append)
+                    break
+                self._journal_offset += len(line)
+                self._journal_records += 1
+                generation = record.get("gen")
+                if generation is not None and generation <= self.generation:
+                    continue
+                self._apply_record(record)
+                self.generation = generation or self.generation
+                applied += 1
+        return applied
+    
+    def _apply_record(self, record: Dict[str, Any]):
+        """Terapkan satu record journal ke inode table"""
+        for ino in record.get("del", []):
+            self._replace_inode(ino, None)
+        for ino, entry in record.get("set", {}).items():
+            self._replace_inode(int(ino), Inode.from_dict(entry))
+        self.cwd_inode = record.get("cwd", self.cwd_inode)
+        self.used_space = record.get("used", self.used_space)
+        self.sparse_space = record.get("sparse", self.sparse_space)
+        self.next_inode = record.get("next", self.next_inode)
+    
+    def _mark(self, ino: int, aggregate: bool = False):
+        """Tandai inode yang akan diubah (panggil sebelum mutasi)
+        
+        aggregate: hanya tree_size/tree_count yang berubah
+        """
+        if self._undo is not None and ino not in self._undo:
+            # Simpan pre-image sekali per transaksi untuk rollback
+            node = self.inodes.get(ino)
+            self._undo[ino] = node.copy() if node is not None else None
+        if self.shards is not None and not aggregate:
+            self.shards.mark(ino)
+        latest = self.snapshots.latest
+        if latest is not None and ino not in latest.delta:
+            # Copy-on-write: simpan nilai inode saat snapshot terbaru dibuat
+            node = self.inodes.get(ino)
+            node = node.copy() if node is not None else None
+            latest.delta[ino] = node
+            self._snapshot_pending[ino] = node
+            if node is not None and node.kind == FILE:
+                self._added_refs.extend(chunk for chunk in node.chunks if chunk)
+        self._dirty.add(ino)
+    
+    @contextmanager
+    def transaction(self):
+        """Batch operasi: persist sekali saat commit, rollback saat error
+        
+        Transaksi bersarang adalah savepoint: error di dalamnya hanya
+        membatalkan perubahan sejak savepoint (misalnya write yang gagal di
+        tengah batch script), lalu exception diteruskan ke pemanggil.
+        """
+        outer = self._undo
+        self._undo = {}
+        saved_state = self._savepoint()
+        dirty = set(self._dirty) if outer is None else None
+        try:
+            yield self
+        except BaseException:
+            self._rollback(saved_state)
+            if outer is None:
+                self._dirty = dirty
+            self._undo = outer
+            raise
+        if outer is not None:
+            # Commit savepoint: pre-image dari transaksi terluar yang dipakai
+            for ino, entry in self._undo.items():
+                outer.setdefault(ino, entry)
+            self._undo = outer
+            return
+        self._undo = None
+        self._persist()
+    
+    def _savepoint(self) -> Tuple[int, int, int, int, int, int, int]:
+        return (self.used_space, self.sparse_space, self.cwd_inode, self.next_inode,
+                len(self._snapshot_pending), len(self._added_refs), len(self._dropped_refs))
+    
+    def _rollback(self, saved_state: Tuple[int, int, int, int, int, int, int]):
+        """Kembalikan inode di _undo dan state yang dicatat _savepoint()"""
+        for ino, entry in self._undo.items():
+            self._replace_inode(ino, entry)
+        (self.used_space, self.sparse_space, self.cwd_inode, self.next_inode,
+         pending, added, dropped) = saved_state
+        for ino in list(self._snapshot_pending)[pending:]:
+            self.snapshots.latest.delta.pop(ino, None)
+            del self._snapshot_pending[ino]
+        # Chunk yang juga ditulis sebelum savepoint (belum di-incref) tetap dipakai
+        kept = set(self._added_refs[:added])
+        for chunk_id in self._added_refs[added:]:
+            if chunk_id not in kept:
+                self.chunk_store.discard(chunk_id)
+        del self._added_refs[added:]
+        del self._dropped_refs[dropped:]
+    
+    def _persist(self):
+        """Persist perubahan: disk image, journal, atau tulis ulang snapshot"""
+        if self._undo is not None:
+            # Dalam transaksi: tunda sampai commit
+            return
+        failure = None
+        if self._snapshot_pending:
+            # Pre-image ditulis sebelum perubahan live agar snapshot tetap benar
+            try:
+                self.snapshots.append_delta(self.snapshots.latest, self._snapshot_pending)
+            except Exception as e:
+                # Dilaporkan setelah perubahan live tetap di-persist
+                failure = StorageError(f"Error writing snapshot delta: {e}")
+            self._snapshot_pending = {}
+        if self.image is not None:
+            self._flush_image()
+        elif self.shards is not None:
+            self._flush_shards()
+        elif not self.journal:
+            self.save_filesystem()
+        elif self._dirty or self.shared is None:
+            # Mode shared: cwd milik proses sendiri, jadi cd saja bukan commit
+            self._append_journal()
+        self._release_chunks()
+        if failure is not None:
+            self._fail(failure, None)
+    
+    def _append_journal(self):
+        """Tambahkan satu record journal berisi inode yang berubah"""
+        record = {
+            "gen": self.generation + 1,
+            "set": {},
+            "del": [],
+            "cwd": self.cwd_inode,
+            "used": self.used_space,
+            "sparse": self.sparse_space,
+            "next": self.next_inode
+        }
+        for ino in self._dirty:
+            if ino in self.inodes:
+                record["set"][ino] = self.inodes[ino].to_dict()
+            else:
+                record["del"].append(ino)
+        self._dirty.clear()
+        
+        try:
+            encoded = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+            with open(self.journal_file, "ab") as f:
+                f.write(encoded)
+                self._journal_offset = f.tell()
+            self._bytes_persisted["journal"] += len(encoded)
+            self._journal_records += 1
+            self.generation = record["gen"]
         except Exception as e:
-            print(f"Error saving filesystem: {e}")
+            self._fail(StorageError(f"Error writing journal: {e}"), None)
+            return
+        
+        if self._journal_records >= self.checkpoint_interval:
+            self._checkpoint(self.generation)
     
-    def load_filesystem(self):
-        """Load filesystem dari file JSON"""
+    def _release_chunks(self):
+        """Terapkan perubahan reference count setelah metadata tersimpan"""
+        if not self._added_refs and not self._dropped_refs:
+            return
+        # Tambah dulu agar chunk yang dipindah antar file tidak sempat terhapus
+        for chunk_id in self._added_refs:
+            self.chunk_store.incref(chunk_id)
+        for chunk_id in self._dropped_refs:
+            self.chunk_store.decref(chunk_id)
+        self._added_refs = []
+        self._dropped_refs = []
         try:
-            if os.path.exists("filesystem_data.json"):
-                with open("filesystem_data.json", "r") as f:
-                    data = json.load(f)
-                    self.file_system = data.get("file_system", self.file_system)
-                    self.current_directory = data.get("current_directory", "/")
-                    self.used_space = data.get("used_space", 0)
-                    self.disk_size = data.get("disk_size", 1024)
+            self.chunk_store.save()
         except Exception as e:
-            print(f"Error loading filesystem: {e}")
+            self._fail(StorageError(f"Error saving chunk references: {e}"), None)
+    
+    def _allocate_inode(self) -> int:
+        """Nomor inode baru: slot bebas di disk image atau counter"""
+        if self.image is not None:
+            return self.image.allocate_inode()
+        ino = self.next_inode
+        self.next_inode += 1
+        return ino
+    
+    def _create_entry(self, parent: int, name: str, entry_type: int, size: int = 0) -> int:
+        """Alokasikan inode baru dan hubungkan ke parent directory"""
+        ino = self._allocate_inode()
+        self._mark(ino)
+        self._mark(parent)
+        self.inodes[ino] = Inode(entry_type, parent, name, size)
+        self.name_index.add(name, ino)
+        
+        # Update parent directory
+        self.inodes[parent].children[name] = ino
+        self.inodes[parent].modified = now_timestamp()
+        self._adjust_ancestors(parent, size, 1)
+        return ino
+    
+    def _create_entries(self, parent: int, entries: List[Tuple[str, int]], entry_type: int):
+        """Seperti _create_entry untuk banyak entry di satu parent
+        
+        Agregat ancestor cukup diupdate sekali untuk seluruh grup.
+        """
+        self._mark(parent)
+        for name, size in entries:
+            ino = self._allocate_inode()
+            self._mark(ino)
+            self.inodes[ino] = Inode(entry_type, parent, name, size)
+            self.name_index.add(name, ino)
+            self.inodes[parent].children[name] = ino
+        self.inodes[parent].modified = now_timestamp()
+        self._adjust_ancestors(parent, sum(size for _, size in entries), len(entries))
+    
+    def _lookup(self, abs_path: str) -> Optional[int]:
+        """Resolve absolute path ke nomor inode lewat rantai directory"""
+        ino = ROOT_INODE
+        for name in abs_path.split("/"):
+            if not name:
+                continue
+            entry = self.inodes[ino]
+            if entry.kind != DIRECTORY:
+                return None
+            ino = entry.children.get(name)
+            if ino is None:
+                return None
+        return ino
+    
+    def _path_of(self, ino: int) -> str:
+        """Bangun absolute path dari inode dengan mengikuti pointer parent"""
+        names = []
+        while ino != ROOT_INODE:
+            entry = self.inodes[ino]
+            names.append(entry.name)
+            ino = entry.parent
+        return "/" + "/".join(reversed(names))
+    
+    def _join(self, parent_path: str, name: str) -> str:
+        """Gabungkan path directory dan nama entry"""
+        if parent_path == "/":
+            return "/" + name
+        return parent_path.rstrip("/") + "/" + name
+    
+    def _is_ancestor(self, ancestor: int, ino: int) -> bool:
+        """Cek apakah ancestor berada di rantai parent dari ino"""
+        while ino:
+            if ino == ancestor:
+                return True
+            ino = self.inodes[ino].parent
+        return False
+    
+    def normalize_path(self, path: str) -> str:
+        """Normalisasi absolute path: resolve '.', '..' dan slash ganda"""
+        parts = []
+        for part in path.split("/"):
+            if part == "" or part == ".":
+                continue
+            if part == "..":
+                if parts:
+                    parts.pop()
+                continue
+            parts.append(part)
+        return "/" + "/".join(parts)
     
     def get_absolute_path(self, path: str) -> str:
-        """Konversi path relatif ke absolute path"""
-        if path.startswith("/"):
-            return path
+        """Konversi path relatif ke absolute path yang sudah dinormalisasi"""
+        if not path.startswith("/"):
+            path = self.current_directory + "/" + path
+        return self.normalize_path(path)
+    
+    def _resolve(self, path: str):
+        """Resolve path ke (absolute path, inode) lewat LRU cache
         
-        if self.current_directory == "/":
-            return "/" + path
-        else:
-            return self.current_directory + "/" + path
+        Cache di-key dengan (cwd_inode, path) untuk path relatif dan path
+        saja untuk path absolut. Hanya hasil yang ditemukan yang di-cache,
+        sehingga pembuatan entry baru tidak perlu invalidasi.
+        """
+        key = path if path.startswith("/") else (self.cwd_inode, path)
+        with self._cache_lock:
+            cached = self._path_cache.get(key)
+            if cached is not None:
+                self._path_cache.move_to_end(key)
+                self.path_cache_hits += 1
+                return cached
+            self.path_cache_misses += 1
+        
+        abs_path = self.get_absolute_path(path)
+        ino = self._lookup(abs_path)
+        if ino is not None and self.path_cache_size > 0:
+            with self._cache_lock:
+                self._path_cache[key] = (abs_path, ino)
+                if len(self._path_cache) > self.path_cache_size:
+                    self._path_cache.popitem(last=False)
+        return abs_path, ino
+    
+    def _invalidate_paths(self):
+        """Buang cache resolusi path (setelah rename/delete)"""
+        with self._cache_lock:
+            self._path_cache.clear()
     
     def path_exists(self, path: str) -> bool:
         """Cek apakah path ada dalam filesystem"""
-        abs_path = self.get_absolute_path(path)
-        return abs_path in self.file_system
+        return self._resolve(path)[1] is not None
     
     def get_parent_path(self, path: str) -> str:
         """Dapatkan parent directory dari path"""
@@ -88,8 +939,7 @@ class FileSystemSimulator:
         abs_path = self.get_absolute_path(path)
         
         if self.path_exists(abs_path):
-            print(f"Directory '{path}' already exists")
-            return False
+            return self._fail(PathExistsError(f"Directory '{path}' already exists"))
         
         parent_path = self.get_parent_path(abs_path)
         
@@ -97,323 +947,921 @@ class FileSystemSimulator:
             if recursive:
                 self.mkdir(parent_path, recursive=True)
             else:
-                print(f"Parent directory '{parent_path}' does not exist")
-                return False
+                return self._fail(PathNotFoundError(f"Parent directory '{parent_path}' does not exist"))
         
-        if self.file_system[parent_path]["type"] != "directory":
-            print(f"'{parent_path}' is not a directory")
-            return False
+        _, parent = self._resolve(parent_path)
+        if parent is None or self.inodes[parent].kind != DIRECTORY:
+            return self._fail(NotDirectoryError(f"'{parent_path}' is not a directory"))
         
         # Buat directory baru
-        dir_name = self.get_filename(abs_path)
-        self.file_system[abs_path] = {
-            "type": "directory",
-            "created": datetime.now().isoformat(),
-            "modified": datetime.now().isoformat(),
-            "size": 0,
-            "permissions": "rwxr-xr-x",
-            "owner": "user",
-            "children": {}
-        }
-        
-        # Update parent directory
-        self.file_system[parent_path]["children"][dir_name] = abs_path
-        self.file_system[parent_path]["modified"] = datetime.now().isoformat()
+        self._create_entry(parent, self.get_filename(abs_path), DIRECTORY)
         
-        self.save_filesystem()
-        print(f"Directory '{path}' created successfully")
+        self._persist()
+        self._info(f"Directory '{path}' created successfully")
         return True
     
+    def _parent_directory(self, abs_path: str) -> Optional[int]:
+        """Inode parent directory dari abs_path, atau None (dengan pesan error)"""
+        parent_path = self.get_parent_path(abs_path)
+        _, parent = self._resolve(parent_path)
+        
+        if parent is None:
+            return self._fail(PathNotFoundError(f"Parent directory '{parent_path}' does not exist"), None)
+        
+        if self.inodes[parent].kind != DIRECTORY:
+            return self._fail(NotDirectoryError(f"'{parent_path}' is not a directory"), None)
+        return parent
+    
     def touch(self, path: str, size: int = 0) -> bool:
         """Buat file baru atau update timestamp"""
-        abs_path = self.get_absolute_path(path)
+        abs_path, ino = self._resolve(path)
         
-        if self.path_exists(abs_path):
+        if ino is not None:
             # Update timestamp
-            self.file_system[abs_path]["modified"] = datetime.now().isoformat()
-            print(f"File '{path}' timestamp updated")
+            self._mark(ino)
+            self.inodes[ino].modified = now_timestamp()
+            self._persist()
+            self._info(f"File '{path}' timestamp updated")
             return True
         
-        parent_path = self.get_parent_path(abs_path)
-        
-        if not self.path_exists(parent_path):
-            print(f"Parent directory '{parent_path}' does not exist")
+        parent = self._parent_directory(abs_path)
+        if parent is None:
             return False
         
-        if self.file_system[parent_path]["type"] != "directory":
-            print(f"'{parent_path}' is not a directory")
-            return False
+        with self._state_lock:
+            # Cek space
+            if self.used_space + size > self.disk_size * 1024 * 1024:  # Convert MB to bytes
+                return self._fail(DiskFullError("Not enough disk space"))
+            
+            # Buat file baru
+            self._create_entry(parent, self.get_filename(abs_path), FILE, size)
+            
+            self.used_space += size
+            self.sparse_space += size
+        self._persist()
+        self._info(f"File '{path}' created successfully")
+        return True
+    
+    def mkdir_many(self, paths: List[str], recursive: bool = False) -> int:
+        """Buat banyak directory sekaligus
         
-        # Cek space
-        if self.used_space + size > self.disk_size * 1024 * 1024:  # Convert MB to bytes
-            print("Not enough disk space")
-            return False
+        Semua path divalidasi dulu dalam satu pass (gagal: tidak ada yang
+        dibuat), lalu dibuat dalam satu transaksi sehingga persist hanya
+        sekali. Hasilnya jumlah directory yang dibuat.
+        """
+        plan = self._plan_entries(paths, [0] * len(paths), DIRECTORY, recursive)
+        if plan is None:
+            return 0
+        return self._create_planned(plan, DIRECTORY)
+    
+    def touch_many(self, paths: List[str], sizes: Optional[List[int]] = None) -> int:
+        """Buat banyak file (atau update timestamp) sekaligus
         
-        # Buat file baru
-        file_name = self.get_filename(abs_path)
-        self.file_system[abs_path] = {
-            "type": "file",
-            "created": datetime.now().isoformat(),
-            "modified": datetime.now().isoformat(),
-            "size": size,
-            "permissions": "rw-r--r--",
-            "owner": "user",
-            "content": ""
-        }
+        Seperti mkdir_many; sisa space dicek sekali untuk total ukuran
+        semua file baru. Hasilnya jumlah file yang dibuat.
+        """
+        if sizes is None:
+            sizes = [0] * len(paths)
+        elif len(sizes) != len(paths):
+            return self._fail(InvalidOperationError("touch_many: paths and sizes differ in length"), 0)
+        plan = self._plan_entries(paths, sizes, FILE, False)
+        if plan is None:
+            return 0
+        groups, existing, _ = plan
+        total = sum(size for entries in groups.values() for _, size in entries)
+        if self.used_space + total > self.disk_size * 1024 * 1024:
+            return self._fail(DiskFullError("Not enough disk space"), 0)
+        return self._create_planned(plan, FILE)
+    
+    def _plan_entries(self, paths: List[str], sizes: List[int], entry_type: int,
+                      recursive: bool):
+        """Validasi batch mkdir_many/touch_many tanpa mengubah apa pun
         
-        # Update parent directory
-        self.file_system[parent_path]["children"][file_name] = abs_path
-        self.file_system[parent_path]["modified"] = datetime.now().isoformat()
+        Path diurutkan (parent selalu sebelum anaknya) dan dikelompokkan
+        per parent; status setiap path disimpan agar parent yang sama tidak
+        di-resolve berulang. Hasilnya (groups, existing, messages) dengan
+        groups = {parent path: [(nama, size)]}, atau None jika ada path yang
+        tidak valid.
+        """
+        requests = sorted((self.get_absolute_path(path), index, path, size)
+                          for index, (path, size) in enumerate(zip(paths, sizes)))
+        # abs path -> (inode atau None, kind atau None); entry yang akan
+        # dibuat tercatat dengan inode None dan kind-nya
+        known: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+        groups: Dict[str, List[Tuple[str, int]]] = {}
+        existing: List[int] = []
+        messages: List[str] = []
         
-        self.used_space += size
-        self.save_filesystem()
-        print(f"File '{path}' created successfully")
-        return True
+        def lookup(abs_path: str) -> Tuple[Optional[int], Optional[int]]:
+            if abs_path not in known:
+                ino = self._resolve(abs_path)[1]
+                known[abs_path] = (ino, None if ino is None else self.inodes[ino].kind)
+            return known[abs_path]
+        
+        def plan(abs_path: str, size: int):
+            groups.setdefault(self.get_parent_path(abs_path), []).append(
+                (self.get_filename(abs_path), size))
+            known[abs_path] = (None, entry_type)
+        
+        for abs_path, _, path, size in requests:
+            ino, kind = lookup(abs_path)
+            if kind is not None:
+                if entry_type == DIRECTORY:
+                    return self._fail(PathExistsError(f"Directory '{path}' already exists"), None)
+                if ino is not None:
+                    existing.append(ino)
+                messages.append(f"File '{path}' timestamp updated")
+                continue
+            
+            parent_path = self.get_parent_path(abs_path)
+            _, parent_kind = lookup(parent_path)
+            if parent_kind is None:
+                if not recursive:
+                    return self._fail(PathNotFoundError(
+                        f"Parent directory '{parent_path}' does not exist"), None)
+                # mkdir -p: rencanakan ancestor yang belum ada, dari atas
+                missing = []
+                while parent_kind is None:
+                    missing.append(parent_path)
+                    parent_path = self.get_parent_path(parent_path)
+                    _, parent_kind = lookup(parent_path)
+                if parent_kind != DIRECTORY:
+                    return self._fail(NotDirectoryError(f"'{parent_path}' is not a directory"), None)
+                for ancestor in reversed(missing):
+                    plan(ancestor, 0)
+                    messages.append(f"Directory '{ancestor}' created successfully")
+            elif parent_kind != DIRECTORY:
+                return self._fail(NotDirectoryError(f"'{parent_path}' is not a directory"), None)
+            
+            plan(abs_path, size)
+            noun = "Directory" if entry_type == DIRECTORY else "File"
+            messages.append(f"{noun} '{path}' created successfully")
+        return groups, existing, messages
+    
+    def _create_planned(self, plan, entry_type: int) -> int:
+        """Buat hasil _plan_entries dalam satu transaksi"""
+        groups, existing, messages = plan
+        created = 0
+        with self.transaction():
+            # Parent directory selalu dibuat di grup sebelumnya
+            for parent_path, entries in groups.items():
+                self._create_entries(self._resolve(parent_path)[1], entries, entry_type)
+                created += len(entries)
+            for ino in existing:
+                self._mark(ino)
+                self.inodes[ino].modified = now_timestamp()
+            if entry_type == FILE:
+                with self._state_lock:
+                    total = sum(size for entries in groups.values() for _, size in entries)
+                    self.used_space += total
+                    self.sparse_space += total
+        self._show(messages)
+        return created
     
     def rm(self, path: str, recursive: bool = False, force: bool = False) -> bool:
         """Hapus file atau directory"""
-        abs_path = self.get_absolute_path(path)
+        abs_path, ino = self._resolve(path)
         
-        if not self.path_exists(abs_path):
-            if not force:
-                print(f"'{path}' does not exist")
-            return False
+        if ino is None:
+            if force:
+                return False
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"))
         
-        if abs_path == "/":
-            print("Cannot remove root directory")
-            return False
+        if ino == ROOT_INODE:
+            return self._fail(InvalidOperationError("Cannot remove root directory"))
         
-        file_info = self.file_system[abs_path]
+        file_info = self.inodes[ino]
         
         # Jika directory dan tidak kosong
-        if file_info["type"] == "directory" and file_info["children"]:
-            if not recursive:
-                print(f"Directory '{path}' is not empty. Use -r flag to remove recursively")
-                return False
-            
-            # Hapus semua children secara rekursif
-            for child_name, child_path in list(file_info["children"].items()):
-                self.rm(child_path, recursive=True, force=True)
+        if file_info.kind == DIRECTORY and file_info.children and not recursive:
+            return self._fail(DirectoryNotEmptyError(
+                f"Directory '{path}' is not empty. Use -r flag to remove recursively"))
         
-        # Hapus dari parent directory
-        parent_path = self.get_parent_path(abs_path)
-        file_name = self.get_filename(abs_path)
+        self._delete_subtree(ino)
+        self._persist()
+        self._info(f"'{path}' removed successfully")
+        return True
+    
+    def remove_tree(self, path: str) -> Dict[str, int]:
+        """Hapus subtree (rm -rf) dan kembalikan ringkasan"""
+        abs_path, ino = self._resolve(path)
         
-        if parent_path in self.file_system:
-            if file_name in self.file_system[parent_path]["children"]:
-                del self.file_system[parent_path]["children"][file_name]
-            self.file_system[parent_path]["modified"] = datetime.now().isoformat()
+        if ino is None:
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"), {})
         
-        # Update used space
-        if file_info["type"] == "file":
-            self.used_space -= file_info["size"]
+        if ino == ROOT_INODE:
+            return self._fail(InvalidOperationError("Cannot remove root directory"), {})
         
-        # Hapus dari filesystem
-        del self.file_system[abs_path]
+        summary = self._delete_subtree(ino)
+        self._persist()
+        return summary
+    
+    def _collect_subtree(self, ino: int) -> List[int]:
+        """Kumpulkan semua inode dalam subtree secara iteratif (pre-order)"""
+        nodes = []
+        seen = set()
+        stack = [ino]
+        while stack:
+            current = stack.pop()
+            if current in seen or current not in self.inodes:
+                continue
+            seen.add(current)
+            nodes.append(current)
+            info = self.inodes[current]
+            if info.kind == DIRECTORY:
+                stack.extend(info.children.values())
+        return nodes
+    
+    def _delete_subtree(self, ino: int) -> Dict[str, int]:
+        """Hapus subtree dalam satu pass tanpa persist per node"""
+        parent = self.inodes[ino].parent
+        file_name = self.inodes[ino].name
         
-        self.save_filesystem()
-        print(f"'{path}' removed successfully")
-        return True
+        self._invalidate_paths()
+        nodes = self._collect_subtree(ino)
+        freed = 0
+        sparse = 0
+        for node in nodes:
+            info = self.inodes[node]
+            if info.kind == FILE:
+                freed += info.size
+                sparse += self._file_sparse(info)
+                self._dropped_refs.extend(chunk for chunk in info.chunks if chunk)
+            self._mark(node)
+            self.name_index.remove(info.name, node)
+            del self.inodes[node]
+        
+        # Hapus dari parent directory
+        if parent in self.inodes:
+            self._mark(parent)
+            self.inodes[parent].children.pop(file_name, None)
+            self.inodes[parent].modified = now_timestamp()
+        
+        # Update used space
+        self._adjust_ancestors(parent, -freed, -len(nodes))
+        self.used_space -= freed
+        self.sparse_space -= sparse
+        if self.cwd_inode not in self.inodes:
+            self.cwd_inode = ROOT_INODE
+        return {"removed": len(nodes), "freed": freed}
     
-    def ls(self, path: str = None, long_format: bool = False, all_files: bool = False) -> List[str]:
-        """List isi directory"""
+    def ls(self, path: str = None, long_format: bool = False,
+           all_files: bool = False) -> Union[List[str], List[DirEntry]]:
+        """List isi directory
+        
+        Mode quiet: list DirEntry tanpa output; selain itu semua baris
+        dicetak sekaligus dan yang dikembalikan teksnya.
+        """
         if path is None:
             path = self.current_directory
         
-        abs_path = self.get_absolute_path(path)
+        abs_path, ino = self._resolve(path)
         
-        if not self.path_exists(abs_path):
-            print(f"'{path}' does not exist")
-            return []
+        if ino is None:
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"), [])
         
-        if self.file_system[abs_path]["type"] != "directory":
-            print(f"'{path}' is not a directory")
-            return []
+        if self.inodes[ino].kind != DIRECTORY:
+            return self._fail(NotDirectoryError(f"'{path}' is not a directory"), [])
         
-        children = self.file_system[abs_path]["children"]
-        result = []
+        children = self.inodes[ino].children
         
         if not children:
-            print("Directory is empty")
+            self._info("Directory is empty")
             return []
         
-        for name, child_path in sorted(children.items()):
+        entries = []
+        for name, child in sorted(children.items()):
             if not all_files and name.startswith("."):
                 continue
-            
-            child_info = self.file_system[child_path]
-            
-            if long_format:
-                # Format: permissions owner size date name
-                perms = child_info["permissions"]
-                owner = child_info["owner"]
-                size = child_info["size"]
-                modified = datetime.fromisoformat(child_info["modified"]).strftime("%b %d %H:%M")
-                file_type = "d" if child_info["type"] == "directory" else "-"
-                
-                line = f"{file_type}{perms} {owner:>8} {size:>8} {modified} {name}"
-                if child_info["type"] == "directory":
-                    line += "/"
-                
-                result.append(line)
-                print(line)
-            else:
-                display_name = name
-                if child_info["type"] == "directory":
-                    display_name += "/"
-                result.append(display_name)
-                print(display_name, end="  ")
-        
-        if not long_format:
-            print()  # New line after listing
+            node = self.inodes[child]
+            entries.append(DirEntry(name, node.kind, node.size, node.permissions,
+                                    node.owner, node.modified))
+        if self.quiet:
+            return entries
         
-        return result
+        lines = listing_lines(entries, long_format)
+        self._show(lines)
+        return lines if long_format else [entry.display_name for entry in entries]
     
     def cd(self, path: str) -> bool:
         """Change directory"""
         if path == "..":
-            if self.current_directory != "/":
-                self.current_directory = self.get_parent_path(self.current_directory)
+            if self.cwd_inode != ROOT_INODE:
+                self.cwd_inode = self.inodes[self.cwd_inode].parent
             return True
         
-        abs_path = self.get_absolute_path(path)
+        abs_path, ino = self._resolve(path)
         
-        if not self.path_exists(abs_path):
-            print(f"Directory '{path}' does not exist")
-            return False
+        if ino is None:
+            return self._fail(PathNotFoundError(f"Directory '{path}' does not exist"))
         
-        if self.file_system[abs_path]["type"] != "directory":
-            print(f"'{path}' is not a directory")
-            return False
+        if self.inodes[ino].kind != DIRECTORY:
+            return self._fail(NotDirectoryError(f"'{path}' is not a directory"))
         
-        self.current_directory = abs_path
-        self.save_filesystem()
+        self.cwd_inode = ino
+        self._persist()
         return True
     
     def pwd(self) -> str:
         """Print working directory"""
-        print(self.current_directory)
+        self._info(self.current_directory)
         return self.current_directory
     
-    def cp(self, source: str, destination: str) -> bool:
-        """Copy file atau directory"""
-        abs_source = self.get_absolute_path(source)
+    def cp(self, source: str, destination: str, recursive: bool = False) -> bool:
+        """Copy file atau directory (directory butuh recursive=True)"""
+        abs_source, source_ino = self._resolve(source)
         abs_dest = self.get_absolute_path(destination)
         
-        if not self.path_exists(abs_source):
-            print(f"Source '{source}' does not exist")
-            return False
+        if source_ino is None:
+            return self._fail(PathNotFoundError(f"Source '{source}' does not exist"))
         
         if self.path_exists(abs_dest):
-            print(f"Destination '{destination}' already exists")
-            return False
+            return self._fail(PathExistsError(f"Destination '{destination}' already exists"))
         
-        source_info = self.file_system[abs_source]
+        parent_path = self.get_parent_path(abs_dest)
+        _, parent = self._resolve(parent_path)
         
-        # Copy file info
-        new_info = source_info.copy()
-        new_info["created"] = datetime.now().isoformat()
-        new_info["modified"] = datetime.now().isoformat()
+        if parent is None:
+            return self._fail(PathNotFoundError(f"Parent directory '{parent_path}' does not exist"))
         
-        if source_info["type"] == "file":
-            # Cek space
-            if self.used_space + source_info["size"] > self.disk_size * 1024 * 1024:
-                print("Not enough disk space")
-                return False
-            self.used_space += source_info["size"]
+        if self.inodes[parent].kind != DIRECTORY:
+            return self._fail(NotDirectoryError(f"'{parent_path}' is not a directory"))
+        
+        if self.inodes[source_ino].kind == DIRECTORY:
+            if not recursive:
+                return self._fail(IsDirectoryError(
+                    f"'{source}' is a directory. Use -r flag to copy recursively"))
+            if self._is_ancestor(source_ino, parent):
+                return self._fail(InvalidOperationError(f"Cannot copy '{source}' into itself"))
         
-        self.file_system[abs_dest] = new_info
+        nodes = self._collect_subtree(source_ino)
+        
+        with self._state_lock:
+            # Cek space sekali untuk seluruh subtree
+            total_size = sum(self.inodes[node].size for node in nodes
+                             if self.inodes[node].kind == FILE)
+            if self.used_space + total_size > self.disk_size * 1024 * 1024:
+                return self._fail(DiskFullError("Not enough disk space"))
+            
+            self._clone_subtree(nodes, parent, self.get_filename(abs_dest))
+            self.used_space += total_size
+            # Salinan berbagi chunk, jadi hole-nya sama dengan sumber
+            self.sparse_space += sum(self._file_sparse(self.inodes[node]) for node in nodes
+                                     if self.inodes[node].kind == FILE)
+        
+        self._persist()
+        self._info(f"'{source}' copied to '{destination}'")
+        return True
+    
+    def _clone_subtree(self, nodes: List[int], parent: int, name: str) -> int:
+        """Clone semua inode subtree dalam satu pass, kembalikan inode baru"""
+        # Alokasikan nomor inode baru untuk semua node sekaligus
+        mapping = {}
+        for node in nodes:
+            mapping[node] = self._allocate_inode()
+        
+        now = now_timestamp()
+        for node in nodes:
+            new_ino = mapping[node]
+            new_info = self.inodes[node].copy()
+            new_info.created = now
+            new_info.modified = now
+            new_info.parent = mapping.get(new_info.parent, parent)
+            if new_info.kind == DIRECTORY:
+                new_info.children = {
+                    child_name: mapping[child]
+                    for child_name, child in new_info.children.items()
+                    if child in mapping
+                }
+            elif new_info.chunks:
+                # Chunk dibagi dengan file sumber (copy-on-write), cukup tambah referensi
+                self._added_refs.extend(chunk for chunk in new_info.chunks if chunk)
+            self._mark(new_ino)
+            self.inodes[new_ino] = new_info
+        
+        root_copy = mapping[nodes[0]]
+        self.inodes[root_copy].parent = parent
+        self.inodes[root_copy].name = name
+        for node in nodes:
+            self.name_index.add(self.inodes[mapping[node]].name, mapping[node])
         
         # Update parent directory
+        self._mark(parent)
+        self.inodes[parent].children[name] = root_copy
+        self.inodes[parent].modified = now
+        self._adjust_ancestors(parent, *self.inodes[root_copy].usage())
+        return root_copy
+    
+    def mv(self, source: str, destination: str) -> bool:
+        """Move/rename file atau directory (O(1), hanya dua entry directory)"""
+        abs_source, ino = self._resolve(source)
+        abs_dest = self.get_absolute_path(destination)
+        
+        if ino is None:
+            return self._fail(PathNotFoundError(f"Source '{source}' does not exist"))
+        
+        if ino == ROOT_INODE:
+            return self._fail(InvalidOperationError("Cannot move root directory"))
+        
+        if self.path_exists(abs_dest):
+            return self._fail(PathExistsError(f"Destination '{destination}' already exists"))
+        
         parent_path = self.get_parent_path(abs_dest)
-        file_name = self.get_filename(abs_dest)
+        _, new_parent = self._resolve(parent_path)
         
-        if parent_path in self.file_system:
-            self.file_system[parent_path]["children"][file_name] = abs_dest
-            self.file_system[parent_path]["modified"] = datetime.now().isoformat()
+        if new_parent is None:
+            return self._fail(PathNotFoundError(f"Parent directory '{parent_path}' does not exist"))
         
-        self.save_filesystem()
-        print(f"'{source}' copied to '{destination}'")
+        if self.inodes[new_parent].kind != DIRECTORY:
+            return self._fail(NotDirectoryError(f"'{parent_path}' is not a directory"))
+        
+        if self._is_ancestor(ino, new_parent):
+            return self._fail(InvalidOperationError(f"Cannot move '{source}' into itself"))
+        
+        with self._state_lock:
+            entry = self.inodes[ino]
+            old_parent = entry.parent
+            new_name = self.get_filename(abs_dest)
+            now = now_timestamp()
+            
+            self._mark(ino)
+            self._mark(old_parent)
+            self._mark(new_parent)
+            del self.inodes[old_parent].children[entry.name]
+            self.inodes[old_parent].modified = now
+            self.inodes[new_parent].children[new_name] = ino
+            self.inodes[new_parent].modified = now
+            self._invalidate_paths()
+            self.name_index.remove(entry.name, ino)
+            self.name_index.add(new_name, ino)
+            entry.parent = new_parent
+            entry.name = new_name
+            
+            size, count = entry.usage()
+            self._adjust_ancestors(old_parent, -size, -count)
+            self._adjust_ancestors(new_parent, size, count)
+        
+        self._persist()
+        self._info(f"'{source}' moved to '{destination}'")
         return True
     
-    def mv(self, source: str, destination: str) -> bool:
-        """Move/rename file atau directory"""
-        if self.cp(source, destination):
-            return self.rm(source, recursive=True, force=True)
-        return False
+    def _put_chunk(self, data: bytes) -> str:
+        """Simpan chunk dan catat referensi baru (dibatalkan saat rollback)"""
+        chunk_id = self.chunk_store.put(data)
+        self._added_refs.append(chunk_id)
+        return chunk_id
     
-    def df(self) -> Dict[str, Any]:
-        """Display filesystem disk usage"""
-        total_space = self.disk_size * 1024 * 1024  # Convert to bytes
-        used_space = self.used_space
-        free_space = total_space - used_space
-        usage_percent = (used_space / total_space) * 100 if total_space > 0 else 0
-        
-        info = {
-            "total": total_space,
-            "used": used_space,
-            "free": free_space,
-            "usage_percent": usage_percent
-        }
+    def _chunk_data(self, node: Inode, index: int) -> bytes:
+        """Isi chunk ke-index sepanjang bagian file yang dicakup chunk itu"""
+        length = max(0, min(CHUNK_SIZE, node.size - index * CHUNK_SIZE))
+        chunk_id = node.chunks[index] if index < len(node.chunks) else None
+        if chunk_id is None:
+            return bytes(length)
+        data = self.chunk_store.get(chunk_id)
+        if len(data) < length:
+            data += bytes(length - len(data))
+        return data[:length]
+    
+    def _file_inode(self, path: str) -> Optional[int]:
+        """Inode file di path, atau None (dengan pesan error)"""
+        ino = self._resolve(path)[1]
+        if ino is None:
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"), None)
+        if self.inodes[ino].kind != FILE:
+            return self._fail(IsDirectoryError(f"'{path}' is a directory"), None)
+        return ino
+    
+    def _set_size(self, ino: int, new_size: int):
+        """Ubah ukuran file; chunk di luar ukuran baru dibuang"""
+        node = self.inodes[ino]
+        self._mark(ino)
+        if new_size < node.size:
+            keep = -(-new_size // CHUNK_SIZE)
+            chunks = list(node.chunks)
+            dropped = [chunk for chunk in chunks[keep:] if chunk]
+            self._dropped_refs.extend(dropped)
+            # Byte chunk yang dibuang tidak lagi dihitung sebagai hole
+            self.sparse_space += sum(self.chunk_store.size(chunk) for chunk in dropped)
+            del chunks[keep:]
+            # Potong chunk terakhir agar byte lama tidak muncul lagi saat file diperbesar
+            tail = new_size % CHUNK_SIZE
+            if tail and len(chunks) == keep and chunks[-1]:
+                data = self.chunk_store.get(chunks[-1])
+                if len(data) > tail:
+                    self._dropped_refs.append(chunks[-1])
+                    chunks[-1] = self._put_chunk(data[:tail])
+                    self.sparse_space += len(data) - tail
+            node.chunks = chunks
+        delta = new_size - node.size
+        node.size = new_size
+        self.used_space += delta
+        self.sparse_space += delta
+        self._adjust_ancestors(node.parent, delta, 0)
+    
+    def _write_stream(self, ino: int, stream: BinaryIO, offset: int) -> int:
+        """Tulis stream ke file per chunk (copy-on-write), kembalikan jumlah byte"""
+        node = self.inodes[ino]
+        self._mark(ino)
+        if offset > node.size:
+            self._set_size(ino, offset)
+        node.chunks = list(node.chunks)
+        limit = self.disk_size * 1024 * 1024
+        position = offset
+        while True:
+            index, start = divmod(position, CHUNK_SIZE)
+            piece = _read_exact(stream, CHUNK_SIZE - start)
+            if not piece:
+                break
+            end = position + len(piece)
+            if self.used_space + max(0, end - node.size) > limit:
+                raise DiskFullError("Not enough disk space")
+            
+            current = self._chunk_data(node, index)
+            if index >= len(node.chunks):
+                node.chunks.extend([None] * (index + 1 - len(node.chunks)))
+            if node.chunks[index]:
+                self._dropped_refs.append(node.chunks[index])
+                self.sparse_space += self.chunk_store.size(node.chunks[index])
+            data = current[:start] + piece + current[start + len(piece):]
+            node.chunks[index] = self._put_chunk(data)
+            self.sparse_space -= len(data)
+            if end > node.size:
+                self._set_size(ino, end)
+            position = end
+        node.modified = now_timestamp()
+        return position - offset
+    
+    def read_stream(self, path: str, offset: int = 0,
+                    length: Optional[int] = None) -> Optional[Iterator[bytes]]:
+        """Iterator isi file per chunk; memori terpakai paling banyak satu chunk"""
+        ino = self._file_inode(path)
+        if ino is None:
+            return None
+        if offset < 0 or (length is not None and length < 0):
+            return self._fail(InvalidOperationError("Invalid offset or length"), None)
+        node = self.inodes[ino]
+        end = node.size if length is None else min(node.size, offset + length)
         
-        print(f"Filesystem     Size   Used  Avail Use%")
-        print(f"simfs         {self.disk_size}M   {used_space//1024//1024}M   {free_space//1024//1024}M   {usage_percent:.1f}%")
+        def chunks():
+            position = offset
+            while position < end:
+                index, start = divmod(position, CHUNK_SIZE)
+                piece = self._chunk_data(node, index)[start:start + end - position]
+                yield piece
+                position += len(piece)
+        return chunks()
+    
+    def read(self, path: str, offset: int = 0, length: Optional[int] = None) -> Optional[bytes]:
+        """Baca isi file (seluruhnya atau length byte mulai offset)"""
+        stream = self.read_stream(path, offset, length)
+        if stream is None:
+            return None
+        return b"".join(stream)
+    
+    def write(self, path: str, data: Union[bytes, str, BinaryIO], offset: int = 0) -> bool:
+        """Tulis data (bytes, str, atau stream dengan read()) ke file mulai offset
         
-        return info
+        File dibuat jika belum ada. Stream dibaca per chunk sehingga file
+        besar bisa ditulis dengan memori terbatas.
+        """
+        if offset < 0:
+            return self._fail(InvalidOperationError("Invalid offset"))
+        abs_path, ino = self._resolve(path)
+        if ino is not None and self.inodes[ino].kind != FILE:
+            return self._fail(IsDirectoryError(f"'{path}' is a directory"))
+        
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if isinstance(data, (bytes, bytearray)):
+            # Ukuran diketahui: cek space sebelum menulis
+            old_size = self.inodes[ino].size if ino is not None else 0
+            if self.used_space + max(0, offset + len(data) - old_size) > self.disk_size * 1024 * 1024:
+                return self._fail(DiskFullError("Not enough disk space"))
+            data = io.BytesIO(data)
+        
+        try:
+            with self.transaction():
+                if ino is None:
+                    parent = self._parent_directory(abs_path)
+                    if parent is None:
+                        return False
+                    ino = self._create_entry(parent, self.get_filename(abs_path), FILE)
+                written = self._write_stream(ino, data, offset)
+        except DiskFullError as e:
+            # Disk penuh saat streaming: error sama dengan write bytes
+            return self._fail(e)
+        except FileSystemError:
+            raise
+        except OSError as e:
+            return self._fail(StorageError(f"Error writing '{path}': {e}"))
+        self._info(f"{written} bytes written to '{path}'")
+        return True
+    
+    def append(self, path: str, data: Union[bytes, str, BinaryIO]) -> bool:
+        """Tambahkan data di akhir file (file dibuat jika belum ada)"""
+        ino = self._resolve(path)[1]
+        offset = self.inodes[ino].size if ino is not None and self.inodes[ino].kind == FILE else 0
+        return self.write(path, data, offset)
     
-    def find(self, name: str, path: str = None) -> List[str]:
-        """Cari file/directory berdasarkan nama"""
+    def truncate(self, path: str, size: int) -> bool:
+        """Ubah ukuran file; bagian yang diperbesar dibaca sebagai byte nol"""
+        ino = self._file_inode(path)
+        if ino is None:
+            return False
+        if size < 0:
+            return self._fail(InvalidOperationError("Invalid size"))
+        with self._state_lock:
+            if self.used_space + max(0, size - self.inodes[ino].size) > self.disk_size * 1024 * 1024:
+                return self._fail(DiskFullError("Not enough disk space"))
+            self._set_size(ino, size)
+            self.inodes[ino].modified = now_timestamp()
+        self._persist()
+        self._info(f"'{path}' truncated to {size} bytes")
+        return True
+    
+    def snapshot_create(self, name: Optional[str] = None) -> bool:
+        """Buat snapshot O(1): inode baru disalin hanya saat diubah"""
+        if self._undo is not None:
+            return self._fail(InvalidOperationError("Cannot create a snapshot inside a transaction"))
+        snapshot_id = self.snapshots.next_id
+        name = name or f"snapshot-{snapshot_id}"
+        if self.snapshots.position(name) is not None:
+            return self._fail(SnapshotError(f"Snapshot '{name}' already exists"))
+        try:
+            self.snapshots.add(Snapshot(snapshot_id, name, now_timestamp(), self.used_space,
+                                        self.next_inode, self.cwd_inode))
+        except Exception as e:
+            return self._fail(StorageError(f"Error creating snapshot: {e}"))
+        self._info(f"Snapshot '{name}' created")
+        return True
+    
+    def snapshot_list(self) -> List[Dict[str, Any]]:
+        """Daftar snapshot dari yang terlama"""
+        result = []
+        for snapshot in self.snapshots.snapshots:
+            info = {
+                "name": snapshot.name,
+                "created": timestamp_to_iso(snapshot.created),
+                "used": snapshot.used_space,
+                "changes": len(snapshot.delta)
+            }
+            result.append(info)
+        self._show(snapshot_lines(result))
+        return result
+    
+    def _snapshot_position(self, name: str) -> Optional[int]:
+        position = self.snapshots.position(name)
+        if position is None:
+            return self._fail(SnapshotError(f"Snapshot '{name}' does not exist"), None)
+        return position
+    
+    def snapshot_restore(self, name: str) -> bool:
+        """Kembalikan state live ke snapshot (O(jumlah perubahan sejak snapshot))"""
+        if self._undo is not None:
+            return self._fail(InvalidOperationError("Cannot restore a snapshot inside a transaction"))
+        position = self._snapshot_position(name)
+        if position is None:
+            return False
+        snapshot = self.snapshots.snapshots[position]
+        
+        # Hitung semua target dulu sebelum state live diubah
+        targets = {ino: self.snapshots.lookup(position, ino, self.inodes)
+                   for ino in self.snapshots.changed_between(position, len(self.snapshots.snapshots))}
+        with self.transaction():
+            for ino, target in targets.items():
+                current = self.inodes.get(ino)
+                self._mark(ino)
+                if current is not None and current.kind == FILE:
+                    self._dropped_refs.extend(chunk for chunk in current.chunks if chunk)
+                    self.sparse_space -= self._file_sparse(current)
+                target = target.copy() if target is not None else None
+                if target is not None and target.kind == FILE:
+                    self._added_refs.extend(chunk for chunk in target.chunks if chunk)
+                    self.sparse_space += self._file_sparse(target)
+                self._replace_inode(ino, target)
+            self.used_space = snapshot.used_space
+            self.next_inode = max(self.next_inode, snapshot.next_inode)
+            cwd = self.inodes.get(self.cwd_inode)
+            if cwd is None or cwd.kind != DIRECTORY:
+                self.cwd_inode = ROOT_INODE
+        self._info(f"Restored snapshot '{name}' ({len(targets)} inode(s) changed)")
+        return True
+    
+    def _snapshot_path(self, position: int, ino: int) -> str:
+        """Absolute path inode pada snapshot ke-position"""
+        parts = []
+        while ino != ROOT_INODE:
+            node = self.snapshots.lookup(position, ino, self.inodes)
+            if node is None:
+                break
+            parts.append(node.name)
+            ino = node.parent
+        return "/" + "/".join(reversed(parts))
+    
+    def snapshot_diff(self, name: str, other: Optional[str] = None) -> List[Tuple[str, str]]:
+        """Perbedaan snapshot dengan snapshot lain atau state live
+        
+        Hasil berupa (status, path): A = ditambah, D = dihapus,
+        M = isi/atribut berubah, R = dipindah/rename ("lama -> baru").
+        """
+        start = self._snapshot_position(name)
+        if start is None:
+            return []
+        end = len(self.snapshots.snapshots)
+        if other is not None:
+            end = self._snapshot_position(other)
+            if end is None:
+                return []
+        if end < start:
+            start, end = end, start
+        
+        changes = []
+        for ino in self.snapshots.changed_between(start, end):
+            old = self.snapshots.lookup(start, ino, self.inodes)
+            new = self.snapshots.lookup(end, ino, self.inodes)
+            if old is None and new is None:
+                continue
+            if old is None:
+                changes.append(("A", self._snapshot_path(end, ino)))
+            elif new is None:
+                changes.append(("D", self._snapshot_path(start, ino)))
+            else:
+                old_path = self._snapshot_path(start, ino)
+                new_path = self._snapshot_path(end, ino)
+                if old_path != new_path:
+                    changes.append(("R", f"{old_path} -> {new_path}"))
+                elif (old.permissions, old.owner) != (new.permissions, new.owner) or (
+                        old.kind == FILE and (old.size, list(old.chunks), old.modified)
+                        != (new.size, list(new.chunks), new.modified)):
+                    # Perubahan children/agregat directory tidak dilaporkan
+                    changes.append(("M", new_path))
+        changes.sort(key=lambda change: change[1])
+        
+        self._show(diff_lines(changes))
+        return changes
+    
+    def snapshot_delete(self, name: str) -> bool:
+        """Hapus snapshot; delta-nya digabung ke snapshot sebelumnya"""
+        if self._undo is not None:
+            return self._fail(InvalidOperationError("Cannot delete a snapshot inside a transaction"))
+        position = self._snapshot_position(name)
+        if position is None:
+            return False
+        snapshot = self.snapshots.snapshots[position]
+        previous = self.snapshots.snapshots[position - 1] if position > 0 else None
+        released = []
+        for ino, node in snapshot.delta.items():
+            if previous is not None and ino not in previous.delta:
+                previous.delta[ino] = node
+            elif node is not None:
+                released.append(node)
+        try:
+            if previous is not None:
+                self.snapshots.rewrite_delta(previous)
+            self.snapshots.remove(position)
+        except Exception as e:
+            return self._fail(StorageError(f"Error deleting snapshot: {e}"))
+        for node in released:
+            if node.kind == FILE:
+                self._dropped_refs.extend(chunk for chunk in node.chunks if chunk)
+        self._release_chunks()
+        self._info(f"Snapshot '{name}' deleted")
+        return True
+    
+    def df(self) -> Union[Dict[str, Any], DiskUsage]:
+        """Display filesystem disk usage (DiskUsage di mode quiet)"""
+        # Referensi chunk yang belum di-commit (transaksi/batch) ikut dihitung
+        physical = self.chunk_store.physical_after(self._added_refs, self._dropped_refs)
+        usage = DiskUsage(self.disk_size, self.used_space, physical, self.sparse_space)
+        if self.quiet:
+            return usage
+        self._show(usage.lines())
+        return usage.to_dict()
+    
+    def _file_sparse(self, node: Inode) -> int:
+        """Byte file yang tidak didukung chunk (hole dari touch/truncate/write sparse)"""
+        return node.size - sum(self.chunk_store.size(chunk_id)
+                               for chunk_id in node.chunks if chunk_id)
+    
+    def _scan_sparse(self) -> int:
+        """Hitung sparse_space dari seluruh inode (hanya untuk data file lama)"""
+        return sum(self._file_sparse(node) for node in self.inodes.values()
+                   if node.kind == FILE)
+    
+    def du(self, path: str = None, summarize: bool = False,
+           max_depth: Optional[int] = None) -> Union[List[Dict[str, Any]], List[UsageEntry]]:
+        """Disk usage dari ukuran agregat directory (tanpa menjumlah file)"""
         if path is None:
             path = self.current_directory
         
-        abs_path = self.get_absolute_path(path)
+        abs_path, start = self._resolve(path)
+        
+        if start is None:
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"), [])
+        
+        if summarize:
+            max_depth = 0
+        
+        # Hanya directory yang dikunjungi, sampai max_depth
         results = []
+        stack = [(start, abs_path.rstrip("/") or "/", 0)]
+        while stack:
+            ino, current_path, depth = stack.pop()
+            node = self.inodes[ino]
+            size, count = node.usage()
+            results.append(UsageEntry(current_path, size, count - 1))
+            if node.kind == DIRECTORY and (max_depth is None or depth < max_depth):
+                for child_name, child in sorted(node.children.items(), reverse=True):
+                    if self.inodes[child].kind == DIRECTORY:
+                        stack.append((child, self._join(current_path, child_name), depth + 1))
         
-        def search_recursive(current_path: str):
-            if not self.path_exists(current_path):
-                return
-            
-            current_info = self.file_system[current_path]
-            current_name = self.get_filename(current_path)
-            
-            # Check if current item matches
-            if name in current_name or current_name == name:
-                results.append(current_path)
-            
-            # Search in children if directory
-            if current_info["type"] == "directory":
-                for child_name, child_path in current_info["children"].items():
-                    search_recursive(child_path)
+        # Seperti du: child dicetak sebelum parent
+        results.reverse()
+        if self.quiet:
+            return results
+        self._show([item.line() for item in results])
+        return [item.to_dict() for item in results]
+    
+    def find(self, name: str, path: str = None, exact: bool = False) -> List[str]:
+        """Cari file/directory berdasarkan nama (lewat index nama)"""
+        if path is None:
+            path = self.current_directory
         
-        search_recursive(abs_path)
+        abs_path, start = self._resolve(path)
+        results = []
         
-        if results:
-            for result in results:
-                print(result)
-        else:
-            print(f"No files or directories found matching '{name}'")
+        with self._state_lock:
+            if start is not None:
+                if self.shards is not None:
+                    # Store bersharding: telusuri subtree saja, tanpa index global
+                    candidates = [ino for ino in self._collect_subtree(start)
+                                  if ino != ROOT_INODE and (self.inodes[ino].name == name if exact
+                                                            else name in self.inodes[ino].name)]
+                elif exact:
+                    candidates = self._ensure_index().exact(name)
+                elif name:
+                    candidates = self._ensure_index().substring(name)
+                else:
+                    # Query kosong cocok dengan semua entry
+                    candidates = self._collect_subtree(start)
+                
+                # Filter hasil ke subtree dari path awal
+                results = sorted(self._path_of(ino) for ino in candidates
+                                 if self._is_ancestor(start, ino))
         
+        self._show(find_lines(results, name))
         return results
     
-    def stat(self, path: str) -> Dict[str, Any]:
-        """Display detailed file/directory information"""
-        abs_path = self.get_absolute_path(path)
+    def iter_find(self, path: str = None, name: str = None, regex: str = None,
+                  maxdepth: Optional[int] = None, mindepth: int = 0,
+                  prune: Optional[List[str]] = None) -> Iterator[str]:
+        """Generator find: yield path yang cocok segera saat ditemukan
         
-        if not self.path_exists(abs_path):
-            print(f"'{path}' does not exist")
-            return {}
+        name   : pola glob untuk nama entry (-name)
+        regex  : regular expression untuk seluruh path (-regex)
+        maxdepth/mindepth : batas kedalaman relatif terhadap path awal
+        prune  : pola glob; entry yang cocok beserta subtree-nya dilewati
+        """
+        if path is None:
+            path = self.current_directory
         
-        info = self.file_system[abs_path]
+        abs_path, start = self._resolve(path)
+        if start is None:
+            return
         
-        print(f"File: {path}")
-        print(f"Type: {info['type']}")
-        print(f"Size: {info['size']} bytes")
-        print(f"Permissions: {info['permissions']}")
-        print(f"Owner: {info['owner']}")
-        print(f"Created: {info['created']}")
-        print(f"Modified: {info['modified']}")
+        pattern = re.compile(regex) if regex is not None else None
+        prune = prune or []
         
-        if info["type"] == "directory":
-            print(f"Children: {len(info['children'])}")
+        stack = [(start, abs_path.rstrip("/") or "/", 0)]
+        while stack:
+            current, current_path, depth = stack.pop()
+            node = self.inodes.get(current)
+            if node is None:
+                continue
+            
+            if depth > 0 and any(fnmatch.fnmatchcase(node.name, p) for p in prune):
+                continue
+            
+            if (depth >= mindepth
+                    and (name is None or fnmatch.fnmatchcase(node.name, name))
+                    and (pattern is None or pattern.fullmatch(current_path))):
+                yield current_path
+            
+            if node.kind == DIRECTORY and (maxdepth is None or depth < maxdepth):
+                # Dibalik agar anak keluar urut nama dari stack
+                for child_name, child in sorted(node.children.items(), reverse=True):
+                    stack.append((child, self._join(current_path, child_name), depth + 1))
+    
+    def stat(self, path: str) -> Union[Dict[str, Any], StatResult]:
+        """Display detailed file/directory information (StatResult di mode quiet)"""
+        abs_path = self.get_absolute_path(path)
+        
+        if not self.path_exists(abs_path):
+            return self._fail(PathNotFoundError(f"'{path}' does not exist"), {})
         
+        info = dict(self.file_system[abs_path])
+        result = StatResult(path, info)
+        if self.quiet:
+            return result
+        self._show(result.lines())
         return info
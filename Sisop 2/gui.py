@@ -4,21 +4,54 @@ Graphical User Interface untuk Sistem Manajemen File
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from tkinter.scrolledtext import ScrolledText
 import os
+import sys
+import time
+import argparse
 from file_system import FileSystemSimulator
+from errors import FileSystemError
+from results import listing_lines, find_lines
+
+# Tag baris pengganti di bawah directory yang belum dibuka
+PLACEHOLDER = "placeholder"
+
+# Interval (ms) pengecekan commit proses lain di mode shared
+SYNC_INTERVAL = 2000
+
+def open_filesystem(shared: bool = True) -> FileSystemSimulator:
+    """Filesystem untuk GUI
+    
+    Mode quiet: hasil dan error ditampilkan GUI, bukan dicetak ke terminal.
+    Metrics aktif agar panel Statistics terisi. Default shared agar GUI dan
+    CLI yang berjalan bersamaan tidak saling menimpa update.
+    """
+    return FileSystemSimulator(shared=shared, metrics=True, quiet=True)
 
 class FileSystemGUI:
-    def __init__(self, root):
+    def __init__(self, root, shared: bool = True):
         self.root = root
         self.root.title("File System Simulator")
         self.root.geometry("1000x700")
         
-        self.fs = FileSystemSimulator()
+        self.fs = open_filesystem(shared)
+        # Path -> item Treeview, hanya untuk baris yang sudah dibuat
+        self.tree_items = {}
         self.setup_ui()
         self.refresh_file_tree()
-        
+        if self.fs.shared is not None:
+            self.root.after(SYNC_INTERVAL, self.sync_other_processes)
+    
+    def sync_other_processes(self):
+        """Tampilkan perubahan dari proses lain (CLI, worker server)"""
+        try:
+            if self.fs.refresh():
+                self.refresh_file_tree()
+        except FileSystemError as e:
+            self.log_output(f"Sync failed: {e}")
+        self.root.after(SYNC_INTERVAL, self.sync_other_processes)
+    
     def setup_ui(self):
         """Setup UI components"""
         # Main frame
@@ -80,6 +113,7 @@ class FileSystemGUI:
         # Tree events
         self.tree.bind('<Double-1>', self.on_tree_double_click)
         self.tree.bind('<Button-3>', self.on_tree_right_click)
+        self.tree.bind('<<TreeviewOpen>>', self.on_tree_open)
         
         # Right frame for details and operations
         right_frame = ttk.Frame(paned)
@@ -99,6 +133,30 @@ class FileSystemGUI:
         self.info_text = tk.Text(info_frame, height=4, width=40)
         self.info_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # Statistics section (latency per operasi)
+        stats_frame = ttk.LabelFrame(right_frame, text="Statistics")
+        stats_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.stats_tree = ttk.Treeview(stats_frame, height=5, show='headings',
+                                       columns=('Operation', 'Count', 'p50', 'p95', 'p99'))
+        self.stats_tree.column('Operation', width=120, minwidth=100)
+        for column in ('Count', 'p50', 'p95', 'p99'):
+            self.stats_tree.column(column, width=60, minwidth=50, anchor=tk.E)
+        self.stats_tree.heading('Operation', text='Operation', anchor=tk.W)
+        self.stats_tree.heading('Count', text='Count')
+        self.stats_tree.heading('p50', text='p50 ms')
+        self.stats_tree.heading('p95', text='p95 ms')
+        self.stats_tree.heading('p99', text='p99 ms')
+        self.stats_tree.pack(fill=tk.X, padx=5, pady=(5, 0))
+        
+        stats_buttons = ttk.Frame(stats_frame)
+        stats_buttons.pack(fill=tk.X, padx=5, pady=5)
+        self.stats_summary_var = tk.StringVar()
+        ttk.Label(stats_buttons, textvariable=self.stats_summary_var).pack(side=tk.LEFT)
+        ttk.Button(stats_buttons, text="Export", command=self.export_statistics).pack(side=tk.RIGHT)
+        ttk.Button(stats_buttons, text="Reset", command=self.reset_statistics).pack(side=tk.RIGHT, padx=(0, 5))
+        ttk.Button(stats_buttons, text="Refresh", command=self.update_statistics).pack(side=tk.RIGHT, padx=(0, 5))
+        
         # Command section
         cmd_frame = ttk.LabelFrame(right_frame, text="Command Line")
         cmd_frame.pack(fill=tk.BOTH, expand=True)
@@ -143,43 +201,73 @@ class FileSystemGUI:
         return None
     
     def refresh_file_tree(self):
-        """Refresh the file tree display"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        """Refresh the file tree display
+        
+        Anak directory baru diisi saat directory dibuka, jadi refresh hanya
+        membangun ulang directory yang sedang terbuka (bukan seluruh tree).
+        """
+        # Simpan directory yang terbuka dan selection agar tetap sama
+        opened = self.opened_paths() if self.tree_items else ['/']
+        selected = self.get_selected_path()
+        
+        self.tree.delete(*self.tree.get_children())
+        self.tree_items = {}
         
         # Add root
-        self.add_tree_item('', '/', '/')
+        modified = self.fs.file_system['/']['modified'][:16].replace('T', ' ')
+        self.tree_items['/'] = self.tree.insert('', 'end', text='/',
+                                                values=('directory', '-', modified, '/'))
+        self.tree.insert(self.tree_items['/'], 'end', tags=(PLACEHOLDER,))
+        
+        # Parent selalu sebelum anaknya (urutan path)
+        for path in sorted(opened):
+            item = self.tree_items.get(path)
+            if item is not None and self.populate_tree_item(item):
+                self.tree.item(item, open=True)
+        if selected in self.tree_items:
+            self.tree.selection_set(self.tree_items[selected])
         
         # Update current directory
         self.current_dir_var.set(self.fs.current_directory)
         self.update_system_info()
     
-    def add_tree_item(self, parent, path, name):
-        """Add item to tree"""
-        if not self.fs.path_exists(path):
-            return
-        
-        file_info = self.fs.file_system[path]
-        
-        # Format size
-        size_str = str(file_info['size']) if file_info['type'] == 'file' else '-'
+    def opened_paths(self):
+        """Path directory yang sedang terbuka di tree"""
+        return [path for path, item in self.tree_items.items() if self.tree.item(item, 'open')]
+    
+    def populate_tree_item(self, item):
+        """Isi anak directory menggantikan placeholder; False jika path sudah tidak ada"""
+        children = self.tree.get_children(item)
+        if not (children and self.tree.tag_has(PLACEHOLDER, children[0])):
+            return True  # Sudah diisi
         
-        # Format modified date
+        path = self.tree.item(item, 'values')[3]
         try:
-            from datetime import datetime
-            modified = datetime.fromisoformat(file_info['modified']).strftime('%Y-%m-%d %H:%M')
-        except:
-            modified = file_info['modified'][:16]
-        
-        # Insert item
-        item_id = self.tree.insert(parent, 'end', text=name,
-                                  values=(file_info['type'], size_str, modified, path))
-        
-        # Add children for directories
-        if file_info['type'] == 'directory':
-            for child_name, child_path in sorted(file_info['children'].items()):
-                self.add_tree_item(item_id, child_path, child_name)
+            entries = self.fs.ls(path, all_files=True)
+        except FileSystemError:
+            return False
+        
+        self.tree.delete(*children)
+        for entry in entries:
+            child_path = path.rstrip('/') + '/' + entry.name
+            modified = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.modified // 1_000_000))
+            if entry.is_directory:
+                values = ('directory', '-', modified, child_path)
+            else:
+                values = ('file', str(entry.size), modified, child_path)
+            child = self.tree.insert(item, 'end', text=entry.name, values=values)
+            self.tree_items[child_path] = child
+            
+            # Directory berisi diberi placeholder agar bisa dibuka
+            if entry.is_directory and self.fs.file_system[child_path]['tree_count']:
+                self.tree.insert(child, 'end', tags=(PLACEHOLDER,))
+        return True
+    
+    def on_tree_open(self, event):
+        """Handle tree expand: isi anak directory saat pertama dibuka"""
+        item = self.tree.focus()
+        if item:
+            self.populate_tree_item(item)
     
     def on_tree_double_click(self, event):
         """Handle tree double click"""
@@ -232,18 +320,16 @@ class FileSystemGUI:
     def new_folder(self):
         """Create new folder"""
         name = simpledialog.askstring("New Folder", "Enter folder name:")
-        if name:
-            if self.fs.mkdir(name):
-                self.refresh_file_tree()
-                self.log_command(f"mkdir {name}")
+        if name and self.run_operation(self.fs.mkdir, name):
+            self.refresh_file_tree()
+            self.log_command(f"mkdir {name}")
     
     def new_file(self):
         """Create new file"""
         name = simpledialog.askstring("New File", "Enter file name:")
-        if name:
-            if self.fs.touch(name):
-                self.refresh_file_tree()
-                self.log_command(f"touch {name}")
+        if name and self.run_operation(self.fs.touch, name):
+            self.refresh_file_tree()
+            self.log_command(f"touch {name}")
     
     def delete_item(self):
         """Delete selected item"""
@@ -258,7 +344,7 @@ class FileSystemGUI:
         
         name = self.fs.get_filename(path)
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete '{name}'?"):
-            if self.fs.rm(path, recursive=True):
+            if self.run_operation(self.fs.rm, path, recursive=True):
                 self.refresh_file_tree()
                 self.log_command(f"rm -r {name}")
     
@@ -272,10 +358,9 @@ class FileSystemGUI:
         name = self.fs.get_filename(path)
         new_name = simpledialog.askstring("Copy", f"Copy '{name}' to:", initialvalue=f"{name}_copy")
         
-        if new_name:
-            if self.fs.cp(path, new_name):
-                self.refresh_file_tree()
-                self.log_command(f"cp {name} {new_name}")
+        if new_name and self.run_operation(self.fs.cp, path, new_name, recursive=True):
+            self.refresh_file_tree()
+            self.log_command(f"cp -r {name} {new_name}")
     
     def move_item(self):
         """Move selected item"""
@@ -287,10 +372,17 @@ class FileSystemGUI:
         name = self.fs.get_filename(path)
         new_name = simpledialog.askstring("Move", f"Move '{name}' to:", initialvalue=name)
         
-        if new_name:
-            if self.fs.mv(path, new_name):
-                self.refresh_file_tree()
-                self.log_command(f"mv {name} {new_name}")
+        if new_name and self.run_operation(self.fs.mv, path, new_name):
+            self.refresh_file_tree()
+            self.log_command(f"mv {name} {new_name}")
+    
+    def run_operation(self, operation, *args, **kwargs):
+        """Jalankan operasi fs; error ditampilkan sebagai dialog"""
+        try:
+            return operation(*args, **kwargs)
+        except FileSystemError as e:
+            messagebox.showerror("Error", str(e))
+            return None
     
     def show_properties(self):
         """Show properties of selected item"""
@@ -303,10 +395,45 @@ class FileSystemGUI:
         info_text = f"Disk Size: {self.fs.disk_size} MB\n"
         info_text += f"Used Space: {self.fs.used_space // 1024 // 1024} MB\n"
         info_text += f"Free Space: {(self.fs.disk_size * 1024 * 1024 - self.fs.used_space) // 1024 // 1024} MB\n"
-        info_text += f"Usage: {(self.fs.used_space / (self.fs.disk_size * 1024 * 1024) * 100):.1f}%"
+        info_text += f"Usage: {(self.fs.used_space / (self.fs.disk_size * 1024 * 1024) * 100):.1f}%\n"
+        info_text += f"Physical: {self.fs.chunk_store.physical_bytes // 1024} KB (dedup)"
         
         self.info_text.delete(1.0, tk.END)
         self.info_text.insert(1.0, info_text)
+        self.update_statistics()
+    
+    def update_statistics(self):
+        """Update statistics panel from fs.metrics"""
+        self.stats_tree.delete(*self.stats_tree.get_children())
+        if self.fs.metrics is None:
+            self.stats_summary_var.set("Metrics disabled")
+            return
+        
+        data = self.fs.metrics.snapshot()
+        for name, op in data["operations"].items():
+            self.stats_tree.insert('', tk.END, values=(name, op["count"], f"{op['p50_ms']:.3f}",
+                                                       f"{op['p95_ms']:.3f}", f"{op['p99_ms']:.3f}"))
+        resolutions = data["path_resolutions"]
+        self.stats_summary_var.set(f"Persisted: {data['bytes_persisted']['total'] // 1024} KB, "
+                                   f"paths: {resolutions['total']}")
+    
+    def reset_statistics(self):
+        """Reset collected metrics"""
+        if self.fs.metrics is not None:
+            self.fs.metrics.reset()
+        self.update_statistics()
+    
+    def export_statistics(self):
+        """Export metrics to a JSON file"""
+        if self.fs.metrics is None:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            try:
+                self.fs.metrics.export(path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Cannot write '{path}': {e}")
     
     def execute_command(self, event=None):
         """Execute command from command line"""
@@ -328,38 +455,54 @@ class FileSystemGUI:
         try:
             if cmd == "ls":
                 path = args[0] if args else None
-                self.fs.ls(path)
+                entries = self.fs.ls(path)
+                self.log_output("\n".join(listing_lines(entries)) if entries else "Directory is empty")
             elif cmd == "cd":
                 path = args[0] if args else "/"
                 if self.fs.cd(path):
                     self.current_dir_var.set(self.fs.current_directory)
                     self.refresh_file_tree()
             elif cmd == "pwd":
-                self.fs.pwd()
+                self.log_output(self.fs.pwd())
             elif cmd == "mkdir":
-                for directory in args:
-                    self.fs.mkdir(directory)
-                self.refresh_file_tree()
+                try:
+                    for directory in args:
+                        self.fs.mkdir(directory)
+                        self.log_output(f"Directory '{directory}' created successfully")
+                finally:
+                    self.refresh_file_tree()
             elif cmd == "touch":
-                for file_path in args:
-                    self.fs.touch(file_path)
-                self.refresh_file_tree()
+                try:
+                    for file_path in args:
+                        self.fs.touch(file_path)
+                finally:
+                    self.refresh_file_tree()
             elif cmd == "rm":
-                for file_path in args:
-                    self.fs.rm(file_path, recursive=True)
-                self.refresh_file_tree()
+                try:
+                    for file_path in args:
+                        self.fs.rm(file_path, recursive=True)
+                        self.log_output(f"'{file_path}' removed successfully")
+                finally:
+                    self.refresh_file_tree()
             elif cmd == "df":
-                self.fs.df()
+                self.log_output("\n".join(self.fs.df().lines()))
                 self.update_system_info()
             elif cmd == "find":
                 name = args[0] if args else ""
                 path = args[1] if len(args) > 1 else None
-                self.fs.find(name, path)
+                self.log_output("\n".join(find_lines(self.fs.find(name, path), name)))
+            elif cmd == "stats":
+                if self.fs.metrics is not None:
+                    for line in self.fs.metrics.report():
+                        self.log_output(line)
+                self.update_statistics()
             elif cmd == "clear":
                 self.command_text.delete(1.0, tk.END)
             else:
                 self.log_output(f"Unknown command: {cmd}")
         
+        except FileSystemError as e:
+            self.log_output(str(e))
         except Exception as e:
             self.log_output(f"Error: {e}")
     
@@ -373,12 +516,17 @@ class FileSystemGUI:
         self.command_text.insert(tk.END, f"{output}\n")
         self.command_text.see(tk.END)
 
-def main():
+def main(argv: list = None):
     """Main function"""
+    parser = argparse.ArgumentParser(description="File System Simulator GUI")
+    parser.add_argument("--no-shared", dest="shared", action="store_false",
+                        help="use the data file without locking (single process only)")
+    options = parser.parse_args(sys.argv[1:] if argv is None else argv)
     try:
         root = tk.Tk()
-        app = FileSystemGUI(root)
+        app = FileSystemGUI(root, options.shared)
         root.mainloop()
+        app.fs.close()
     except Exception as e:
         print(f"Error starting GUI: {e}")
         print("Please try CLI mode instead.")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Record inode ringkas untuk File System Simulator
+"""
+
+import sys
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional, Iterator, List
+
+# Inode directory root
+ROOT_INODE = 1
+
+# Tipe entry di-encode sebagai integer kecil
+FILE = 0
+DIRECTORY = 1
+TYPE_NAMES = ("file", "directory")
+TYPE_CODES = {name: code for code, name in enumerate(TYPE_NAMES)}
+
+DIR_PERMISSIONS = sys.intern("rwxr-xr-x")
+FILE_PERMISSIONS = sys.intern("rw-r--r--")
+DEFAULT_OWNER = sys.intern("user")
+# File tanpa isi tersimpan berbagi tuple kosong yang sama
+NO_CHUNKS = ()
+
+
+def now_timestamp() -> int:
+    """Timestamp sekarang dalam mikrodetik sejak epoch"""
+    return time.time_ns() // 1000
+
+
+def encode_chunks(chunks) -> str:
+    """Daftar id chunk sebagai satu string (hole ditulis sebagai string kosong)"""
+    return ",".join(chunk or "" for chunk in chunks)
+
+
+def decode_chunks(text: str) -> List[Optional[str]]:
+    """Kebalikan encode_chunks"""
+    if not text:
+        return NO_CHUNKS
+    return [chunk or None for chunk in text.split(",")]
+
+
+def timestamp_to_iso(timestamp: int) -> str:
+    """Konversi timestamp mikrodetik ke string ISO-8601"""
+    seconds, micros = divmod(timestamp, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros).isoformat()
+
+
+def iso_to_timestamp(value: str) -> int:
+    """Konversi string ISO-8601 ke timestamp mikrodetik"""
+    dt = datetime.fromisoformat(value)
+    return int(dt.replace(microsecond=0).timestamp()) * 1_000_000 + dt.microsecond
+
+
+class Inode:
+    """Metadata satu file/directory dengan __slots__ (tanpa dict per entry)"""
+    
+    __slots__ = ("kind", "created", "modified", "size", "permissions",
+                 "owner", "parent", "name", "children", "tree_size", "tree_count",
+                 "chunks")
+    
+    # Key yang terlihat lewat akses dict-compatible (inode["type"], dst.)
+    # tree_size/tree_count: total ukuran file dan jumlah entry di subtree
+    # chunks: id chunk isi file per CHUNK_SIZE byte; None atau index di luar
+    # daftar berarti hole (dibaca sebagai byte nol)
+    DIR_KEYS = ("type", "created", "modified", "size", "permissions",
+                "owner", "parent", "name", "children", "tree_size", "tree_count")
+    FILE_KEYS = ("type", "created", "modified", "size", "permissions",
+                 "owner", "parent", "name", "chunks")
+    
+    def __init__(self, kind: int, parent: int, name: str, size: int = 0,
+                 created: Optional[int] = None, modified: Optional[int] = None,
+                 permissions: Optional[str] = None, owner: str = DEFAULT_OWNER):
+        if created is None:
+            created = now_timestamp()
+        self.kind = kind
+        self.created = created
+        self.modified = created if modified is None else modified
+        self.size = size
+        if permissions is None:
+            permissions = DIR_PERMISSIONS if kind == DIRECTORY else FILE_PERMISSIONS
+        self.permissions = permissions
+        self.owner = owner
+        self.parent = parent
+        self.name = name
+        self.children = {} if kind == DIRECTORY else None
+        self.tree_size = 0 if kind == DIRECTORY else None
+        self.tree_count = 0 if kind == DIRECTORY else None
+        self.chunks = None if kind == DIRECTORY else NO_CHUNKS
+    
+    @property
+    def is_dir(self) -> bool:
+        return self.kind == DIRECTORY
+    
+    def keys(self):
+        return self.DIR_KEYS if self.kind == DIRECTORY else self.FILE_KEYS
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+    
+    def __len__(self) -> int:
+        return len(self.keys())
+    
+    def __getitem__(self, key: str) -> Any:
+        """Akses dict-compatible untuk caller lama"""
+        if key == "type":
+            return TYPE_NAMES[self.kind]
+        if key == "created":
+            return timestamp_to_iso(self.created)
+        if key == "modified":
+            return timestamp_to_iso(self.modified)
+        if key == "chunks" and self.kind == FILE:
+            return list(self.chunks)
+        if key in self.keys():
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def copy(self) -> "Inode":
+        """Salinan inode; dict children ikut disalin"""
+        clone = Inode.__new__(Inode)
+        for slot in Inode.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        if self.children is not None:
+            clone.children = dict(self.children)
+        if self.chunks:
+            clone.chunks = list(self.chunks)
+        return clone
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Bentuk dict untuk serialisasi JSON"""
+        return {key: self[key] for key in self.keys()}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Inode":
+        """Buat inode dari bentuk dict (JSON/format lama)"""
+        node = cls(TYPE_CODES[data["type"]], data.get("parent", 0),
+                   data.get("name", ""), data.get("size", 0),
+                   created=iso_to_timestamp(data["created"]),
+                   modified=iso_to_timestamp(data["modified"]),
+                   permissions=sys.intern(data["permissions"]),
+                   owner=sys.intern(data["owner"]))
+        if node.kind == DIRECTORY:
+            node.children = dict(data.get("children", {}))
+            # None berarti belum diketahui (data lama), dihitung ulang saat load
+            node.tree_size = data.get("tree_size")
+            node.tree_count = data.get("tree_count")
+        elif data.get("chunks"):
+            node.chunks = list(data["chunks"])
+        return node
+    
+    def usage(self):
+        """(ukuran, jumlah entry) yang disumbangkan inode ini ke ancestor"""
+        if self.kind == DIRECTORY:
+            return self.tree_size, self.tree_count + 1
+        return self.size, 1
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Locking untuk FileSystemSimulator(thread_safe=True)
+
+Setiap directory punya reader/writer lock sendiri. Operasi mengambil
+read lock pada semua directory di sepanjang path dan write lock pada
+directory yang isinya diubah; operasi subtree (rm -r, du, sumber cp)
+mengunci semua directory di subtree. Lock diambil urut absolute path
+(ancestor selalu sebelum descendant) sehingga tidak ada deadlock.
+
+Di atas semua lock directory ada tree lock: operasi biasa memegangnya
+sebagai reader, sedangkan operasi global (transaksi, snapshot,
+import/export, cd) memegangnya sebagai writer.
+"""
+
+import inspect
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from inode import DIRECTORY, ROOT_INODE
+from operations import OPERATIONS
+
+READ, WRITE = "r", "w"
+
+# Helper internal yang mengubah state bersama; dijalankan dengan _state_lock
+SYNCHRONIZED = ("_mark", "_persist", "_create_entry", "_create_entries",
+                "_delete_subtree", "_set_size", "_ensure_index")
+
+
+
+class RWLock:
+    """Reader/writer lock: banyak reader bersamaan atau satu writer
+    
+    Writer yang menunggu didahulukan agar tidak kelaparan oleh reader
+    baru. Tidak reentrant.
+    """
+    
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+    
+    def acquire_read(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+    
+    def release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+    
+    def acquire_write(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+    
+    def release_write(self):
+        with self._cond:
+            self._writer = False
+            self._cond.notify_all()
+    
+    def acquire(self, mode: str):
+        if mode == WRITE:
+            self.acquire_write()
+        else:
+            self.acquire_read()
+    
+    def release(self, mode: str):
+        if mode == WRITE:
+            self.release_write()
+        else:
+            self.release_read()
+    
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+    
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+# Rencana lock: ino directory -> (absolute path, mode)
+Plan = Dict[int, Tuple[str, str]]
+
+
+class LockManager:
+    """Lock per directory dan wrapper operasi publik FileSystemSimulator"""
+    
+    def __init__(self, fs):
+        self.fs = fs
+        self.tree = RWLock()
+        self.locks: Dict[int, RWLock] = {}
+        self._local = threading.local()
+        self.retries = 0
+        self._planners: Dict[str, Callable[[Dict[str, Any]], Plan]] = {
+            "mkdir": lambda a: self._walk(self._parent(a["path"]), WRITE),
+            "touch": lambda a: self._walk(self._parent(a["path"]), WRITE),
+            "truncate": lambda a: self._walk(self._parent(a["path"]), WRITE),
+            "rm": lambda a: self._remove(a["path"]),
+            "remove_tree": lambda a: self._remove(a["path"]),
+            "cp": lambda a: self._merge(self._subtree(a["source"], READ),
+                                        self._walk(self._parent(a["destination"]), WRITE)),
+            "mv": lambda a: self._merge(self._walk(a["source"], WRITE),
+                                        self._walk(self._parent(a["source"]), WRITE),
+                                        self._walk(self._parent(a["destination"]), WRITE)),
+            "ls": lambda a: self._walk(a.get("path"), READ),
+            "stat": lambda a: self._walk(a["path"], READ),
+            "read": lambda a: self._walk(a["path"], READ),
+            "read_stream": lambda a: self._walk(a["path"], READ),
+            "path_exists": lambda a: self._walk(a["path"], READ),
+            "find": lambda a: self._walk(a.get("path"), READ),
+            "du": lambda a: self._subtree(a.get("path"), READ),
+            "iter_find": lambda a: self._subtree(a.get("path"), READ),
+        }
+    
+    def install(self):
+        """Ganti operasi publik instance fs dengan versi yang mengunci"""
+        fs = self.fs
+        # Operasi tanpa rencana lock mengunci seluruh tree. write/append dan
+        # mkdir_many/touch_many memakai transaksi (rollback saat stream/validasi
+        # gagal) yang state-nya global; cd mengubah arti path relatif untuk
+        # semua thread.
+        for name, operation in OPERATIONS.items():
+            setattr(fs, name, self._wrap(getattr(fs, name), self._planners.get(name),
+                                         operation.iterator))
+        fs.transaction = self._wrap_transaction(fs.transaction)
+        for name in SYNCHRONIZED:
+            setattr(fs, name, self._synchronized(getattr(fs, name)))
+    
+    # ---- rencana lock -------------------------------------------------
+    
+    def _parent(self, path: str) -> str:
+        return self.fs.get_parent_path(self.fs.get_absolute_path(path))
+    
+    def _walk(self, path: Optional[str], mode: str) -> Plan:
+        """Read lock di sepanjang path; directory terdalam yang ada dapat mode"""
+        fs = self.fs
+        abs_path = fs.get_absolute_path(path if path is not None else fs.current_directory)
+        plan = {ROOT_INODE: ("/", READ)}
+        last, current = ROOT_INODE, "/"
+        for name in abs_path.split("/"):
+            if not name:
+                continue
+            child = fs.inodes[last].children.get(name)
+            if child is None or fs.inodes[child].kind != DIRECTORY:
+                break
+            current = fs._join(current, name)
+            plan[child] = (current, READ)
+            last = child
+        plan[last] = (plan[last][0], mode)
+        return plan
+    
+    def _subtree(self, path: Optional[str], mode: str) -> Plan:
+        """Lock path beserta semua directory di subtree-nya"""
+        fs = self.fs
+        plan = self._walk(path, mode)
+        abs_path, ino = fs._resolve(path if path is not None else fs.current_directory)
+        if ino is None or fs.inodes[ino].kind != DIRECTORY:
+            return plan
+        stack = [(ino, abs_path)]
+        while stack:
+            current, current_path = stack.pop()
+            plan[current] = (current_path, mode)
+            for name, child in fs.inodes[current].children.items():
+                if fs.inodes[child].kind == DIRECTORY:
+                    stack.append((child, fs._join(current_path, name)))
+        return plan
+    
+    def _remove(self, path: str) -> Plan:
+        return self._merge(self._walk(self._parent(path), WRITE), self._subtree(path, WRITE))
+    
+    @staticmethod
+    def _merge(*plans: Plan) -> Plan:
+        """Gabungkan rencana; write lock mengalahkan read lock"""
+        merged = {}
+        for plan in plans:
+            for ino, (path, mode) in plan.items():
+                if merged.get(ino, (path, READ))[1] == WRITE:
+                    mode = WRITE
+                merged[ino] = (path, mode)
+        return merged
+    
+    # ---- acquire/release ----------------------------------------------
+    
+    def _acquire(self, planner, arguments: Dict[str, Any]) -> List[Tuple[int, RWLock, str]]:
+        """Ambil lock sesuai rencana; ulangi jika tree berubah sebelum terkunci"""
+        state_lock = self.fs._state_lock
+        while True:
+            with state_lock:
+                plan = planner(arguments)
+                held = [(ino, self.locks.setdefault(ino, RWLock()), mode)
+                        for ino, (_, mode) in sorted(plan.items(), key=lambda item: item[1][0])]
+            for _, lock, mode in held:
+                lock.acquire(mode)
+            with state_lock:
+                if planner(arguments) == plan:
+                    return held
+            self._release(held)
+            self.retries += 1
+    
+    def _release(self, held: List[Tuple[int, RWLock, str]]):
+        for _, lock, mode in reversed(held):
+            lock.release(mode)
+        with self.fs._state_lock:
+            # Lock milik directory yang sudah dihapus tidak dipakai lagi
+            for ino, _, _ in held:
+                if ino not in self.fs.inodes:
+                    self.locks.pop(ino, None)
+    
+    def _synchronized(self, method):
+        state_lock = self.fs._state_lock
+        
+        @functools.wraps(method)
+        def synchronized(*args, **kwargs):
+            with state_lock:
+                return method(*args, **kwargs)
+        return synchronized
+    
+    def _wrap(self, method, planner, materialize: bool):
+        signature = inspect.signature(method)
+        
+        @functools.wraps(method)
+        def locked(*args, **kwargs):
+            if getattr(self._local, "active", False):
+                # Dipanggil dari operasi lain yang sudah memegang lock
+                return method(*args, **kwargs)
+            self._local.active = True
+            try:
+                if planner is None:
+                    with self.tree.write():
+                        return method(*args, **kwargs)
+                bound = signature.bind(*args, **kwargs)
+                with self.tree.read():
+                    held = self._acquire(planner, bound.arguments)
+                    try:
+                        result = method(*args, **kwargs)
+                        if materialize and result is not None:
+                            result = iter(list(result))
+                        return result
+                    finally:
+                        self._release(held)
+            finally:
+                self._local.active = False
+        return locked
+    
+    def _wrap_transaction(self, method):
+        @functools.wraps(method)
+        @contextmanager
+        def transaction():
+            if getattr(self._local, "active", False):
+                with method() as fs:
+                    yield fs
+                return
+            self._local.active = True
+            try:
+                with self.tree.write():
+                    with method() as fs:
+                        yield fs
+            finally:
+                self._local.active = False
+        return transaction
@@ -43,7 +43,7 @@ def main():
                 
                 try:
                     from cli import main as cli_main
-                    cli_main()
+                    cli_main([])
                 except KeyboardInterrupt:
                     print("\nKeluar dari CLI mode...")
                 except ImportError as e:
@@ -56,7 +56,7 @@ def main():
                 try:
                     import tkinter as tk
                     from gui import main as gui_main
-                    gui_main()
+                    gui_main([])
                 except ImportError:
                     print("Error: Tkinter tidak tersedia. Gunakan CLI mode.")
                 except Exception as e:
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Instrumentasi operasi FileSystemSimulator (metrics=True / enable_metrics())
+
+Saat aktif, setiap operasi publik dibungkus wrapper yang mencatat jumlah
+pemanggilan, kegagalan (exception atau hasil False) dan latency ke
+histogram logaritmik: 4 bucket per kelipatan dua, sehingga p50/p95/p99
+meleset paling banyak ~19%. Hanya pemanggilan terluar yang dihitung
+(mkdir -p atau write yang memanggil operasi lain tercatat sekali).
+Persist internal (_persist, _checkpoint) dicatat terpisah agar terlihat
+bagian latency yang habis untuk menulis ke disk.
+
+Byte yang di-persist dan jumlah resolusi path diambil dari counter yang
+selalu ada di filesystem (selisih sejak metrics diaktifkan atau di-reset).
+Saat tidak aktif tidak ada wrapper sama sekali.
+"""
+
+import json
+import time
+import bisect
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from operations import names
+
+# Operasi publik yang diukur
+OPERATIONS = names(iterator=False)
+
+# Operasi yang mengembalikan iterator: latency dihitung sampai iterator habis
+ITERATORS = names(iterator=True)
+
+# Helper internal yang dicatat walaupun dipanggil dari operasi lain
+INTERNAL = {"_persist": "persist", "_checkpoint": "checkpoint"}
+
+# Batas atas bucket latency (detik): 1 us * 2^(i/4), sampai ~134 detik
+BOUNDS = [1e-6 * 2 ** (i / 4) for i in range(4 * 27 + 1)]
+
+
+class OperationStats:
+    """Jumlah pemanggilan dan histogram latency satu operasi"""
+    
+    __slots__ = ("count", "failures", "total", "max", "buckets")
+    
+    def __init__(self):
+        self.clear()
+    
+    def clear(self):
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BOUNDS) + 1)
+    
+    def add(self, seconds: float, failed: bool):
+        self.count += 1
+        self.failures += failed
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BOUNDS, seconds)] += 1
+    
+    def percentile(self, fraction: float) -> float:
+        """Batas atas bucket tempat percentile berada (detik)"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(BOUNDS[index] if index < len(BOUNDS) else self.max, self.max)
+        return self.max
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(0.50) * 1000,
+            "p95_ms": self.percentile(0.95) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class _Depth(threading.local):
+    """Kedalaman pemanggilan per thread (default kelas: tanpa AttributeError)"""
+    depth = 0
+
+
+class Metrics:
+    """Wrapper pengukur untuk operasi satu instance FileSystemSimulator"""
+    
+    def __init__(self, fs):
+        self.fs = fs
+        self.operations: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+        self._local = _Depth()
+        self._originals: Dict[str, Any] = {}
+        self.reset()
+    
+    def _counters(self) -> Dict[str, int]:
+        fs = self.fs
+        counters = {f"bytes_{kind}": value for kind, value in fs.persisted_bytes().items()}
+        counters["path_cache_hits"] = fs.path_cache_hits
+        counters["path_cache_misses"] = fs.path_cache_misses
+        return counters
+    
+    def reset(self):
+        """Kosongkan semua statistik"""
+        with self._lock:
+            # Objek statistik dipakai ulang karena sudah dipegang wrapper
+            for stats in self.operations.values():
+                stats.clear()
+            self.started = time.time()
+            self._baseline = self._counters()
+    
+    # ---- install ------------------------------------------------------
+    
+    def install(self):
+        """Pasang wrapper pada instance fs (di luar lock, jika ada)"""
+        fs = self.fs
+        for name in OPERATIONS + ITERATORS + tuple(INTERNAL) + ("transaction",):
+            # Simpan atribut instance lama (wrapper lock) untuk uninstall
+            self._originals[name] = fs.__dict__.get(name)
+        for name in OPERATIONS:
+            setattr(fs, name, self._wrap(name, getattr(fs, name)))
+        for name in ITERATORS:
+            setattr(fs, name, self._wrap_iterator(name, getattr(fs, name)))
+        for name, label in INTERNAL.items():
+            setattr(fs, name, self._wrap_internal(label, getattr(fs, name)))
+        fs.transaction = self._wrap_transaction(fs.transaction)
+    
+    def uninstall(self):
+        """Lepas wrapper; operasi kembali ke method asli (atau wrapper lock)"""
+        fs = self.fs
+        for name, original in self._originals.items():
+            if original is None:
+                fs.__dict__.pop(name, None)
+            else:
+                setattr(fs, name, original)
+        self._originals = {}
+    
+    # ---- pencatatan ---------------------------------------------------
+    
+    def _stats(self, name: str) -> OperationStats:
+        with self._lock:
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            return stats
+    
+    def record(self, name: str, seconds: float, failed: bool = False):
+        stats = self._stats(name)
+        with self._lock:
+            stats.add(seconds, failed)
+    
+    def _wrap(self, name: str, method):
+        # Semua yang dibutuhkan di jalur cepat diikat ke variabel lokal
+        local, lock, stats = self._local, self._lock, self._stats(name)
+        clock = time.perf_counter
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if local.depth:
+                # Dipanggil dari operasi lain: sudah termasuk latency operasi itu
+                return method(*args, **kwargs)
+            local.depth = 1
+            failed = True
+            started = clock()
+            try:
+                result = method(*args, **kwargs)
+                failed = result is False
+                return result
+            finally:
+                elapsed = clock() - started
+                local.depth = 0
+                with lock:
+                    stats.add(elapsed, failed)
+        return timed
+    
+    def _wrap_iterator(self, name: str, method):
+        local = self._local
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if local.depth:
+                return method(*args, **kwargs)
+            local.depth = 1
+            started = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self.record(name, time.perf_counter() - started, True)
+                raise
+            finally:
+                local.depth = 0
+            elapsed = time.perf_counter() - started
+            if result is None:
+                self.record(name, elapsed, True)
+                return None
+            return self._timed_iterator(name, result, elapsed)
+        return timed
+    
+    def _timed_iterator(self, name: str, iterator: Iterator, elapsed: float) -> Iterator:
+        """Jumlahkan waktu di dalam next(); dicatat saat habis atau ditutup"""
+        local = self._local
+        failed = True
+        try:
+            while True:
+                local.depth = 1
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - started
+                    local.depth = 0
+                yield item
+            failed = False
+        finally:
+            self.record(name, elapsed, failed)
+    
+    def _wrap_internal(self, label: str, method):
+        fs = self.fs
+        
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            if label == "persist" and fs._undo is not None:
+                # Di dalam transaksi _persist langsung kembali; bukan persist
+                return method(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(label, time.perf_counter() - started)
+        return timed
+    
+    def _wrap_transaction(self, method):
+        local = self._local
+        
+        @functools.wraps(method)
+        @contextmanager
+        def transaction():
+            if local.depth:
+                # Transaksi internal (misalnya write)
+                with method() as fs:
+                    yield fs
+                return
+            # Operasi di dalam blok tetap dicatat sendiri-sendiri
+            failed = True
+            started = time.perf_counter()
+            try:
+                with method() as fs:
+                    yield fs
+                failed = False
+            finally:
+                self.record("transaction", time.perf_counter() - started, failed)
+        return transaction
+    
+    # ---- laporan ------------------------------------------------------
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Semua statistik sebagai dict (siap di-JSON-kan)"""
+        with self._lock:
+            operations = {name: stats.to_dict()
+                          for name, stats in sorted(self.operations.items()) if stats.count}
+            current = self._counters()
+            delta = {key: value - self._baseline.get(key, 0) for key, value in current.items()}
+            started = self.started
+        hits, misses = delta.pop("path_cache_hits"), delta.pop("path_cache_misses")
+        persisted = {key[len("bytes_"):]: value for key, value in delta.items()}
+        persisted["total"] = sum(persisted.values())
+        return {
+            "since": started,
+            "uptime": time.time() - started,
+            "operations": operations,
+            "bytes_persisted": persisted,
+            "path_resolutions": {
+                "total": hits + misses,
+                "cache_hits": hits,
+                "cache_misses": misses,
+                "cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0
+            }
+        }
+    
+    def report(self) -> List[str]:
+        """Baris tabel untuk CLI/GUI"""
+        data = self.snapshot()
+        lines = [f"{'operation':<18}{'count':>8}{'fail':>6}{'p50 ms':>10}"
+                 f"{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for name, op in data["operations"].items():
+            lines.append(f"{name:<18}{op['count']:>8}{op['failures']:>6}{op['p50_ms']:>10.3f}"
+                         f"{op['p95_ms']:>10.3f}{op['p99_ms']:>10.3f}{op['max_ms']:>10.3f}")
+        if not data["operations"]:
+            lines.append("(no operations recorded)")
+        persisted = data["bytes_persisted"]
+        lines.append("Bytes persisted: " + ", ".join(f"{kind} {value}"
+                                                     for kind, value in persisted.items() if value)
+                     + ("" if persisted["total"] else "0"))
+        resolutions = data["path_resolutions"]
+        lines.append(f"Path resolutions: {resolutions['total']} "
+                     f"({resolutions['cache_hit_rate']:.1%} cache hits)")
+        return lines
+    
+    def export(self, path: str):
+        """Tulis statistik ke file JSON"""
+        with open(path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
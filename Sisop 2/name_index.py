@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Index nama untuk find() pada File System Simulator
+"""
+
+from typing import Dict, Set, Iterable, Tuple
+
+
+def trigrams(name: str) -> Set[str]:
+    """Semua substring 3 karakter dari nama"""
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+
+class NameIndex:
+    """Index nama -> inode dan trigram -> nama untuk pencarian substring"""
+    
+    def __init__(self):
+        self.by_name: Dict[str, Set[int]] = {}
+        self.by_trigram: Dict[str, Set[str]] = {}
+        # Index dibangun malas: selama belum ready, add/remove diabaikan
+        # karena build() berikutnya membaca state terbaru
+        self.ready = True
+    
+    def __len__(self) -> int:
+        return sum(len(inos) for inos in self.by_name.values())
+    
+    def clear(self):
+        self.by_name.clear()
+        self.by_trigram.clear()
+    
+    def invalidate(self):
+        """Kosongkan index; harus di-build ulang sebelum dipakai"""
+        self.clear()
+        self.ready = False
+    
+    def build(self, entries: Iterable[Tuple[int, str]]):
+        """Bangun ulang index dari pasangan (inode, nama)"""
+        self.clear()
+        self.ready = True
+        for ino, name in entries:
+            self.add(name, ino)
+    
+    def add(self, name: str, ino: int):
+        """Daftarkan inode dengan nama tertentu"""
+        if not self.ready:
+            return
+        inos = self.by_name.get(name)
+        if inos is None:
+            inos = self.by_name[name] = set()
+            for gram in trigrams(name):
+                self.by_trigram.setdefault(gram, set()).add(name)
+        inos.add(ino)
+    
+    def remove(self, name: str, ino: int):
+        """Hapus inode dari index; nama dihapus jika tidak dipakai lagi"""
+        if not self.ready:
+            return
+        inos = self.by_name.get(name)
+        if inos is None:
+            return
+        inos.discard(ino)
+        if inos:
+            return
+        del self.by_name[name]
+        for gram in trigrams(name):
+            names = self.by_trigram.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self.by_trigram[gram]
+    
+    def exact(self, name: str) -> Set[int]:
+        """Inode dengan nama persis sama"""
+        return set(self.by_name.get(name, ()))
+    
+    def matching_names(self, query: str) -> Set[str]:
+        """Nama yang mengandung query sebagai substring"""
+        if len(query) < 3:
+            # Query terlalu pendek untuk trigram: scan nama unik saja
+            return {name for name in self.by_name if query in name}
+        
+        candidates = None
+        for gram in sorted(trigrams(query), key=lambda g: len(self.by_trigram.get(g, ()))):
+            names = self.by_trigram.get(gram)
+            if not names:
+                return set()
+            candidates = set(names) if candidates is None else candidates & names
+            if not candidates:
+                return set()
+        return {name for name in candidates if query in name}
+    
+    def substring(self, query: str) -> Set[int]:
+        """Inode yang namanya mengandung query"""
+        result = set()
+        for name in self.matching_names(query):
+            result |= self.by_name[name]
+        return result
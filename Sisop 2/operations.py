@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Registry operasi publik FileSystemSimulator
+
+Satu daftar untuk semua wrapper: locking.py (thread_safe), shared_access.py
+(shared), metrics.py dan server.py membaca jenis operasi dari sini, jadi
+operasi baru cukup didaftarkan sekali.
+"""
+
+from typing import Dict
+
+# Hanya membaca state (cd hanya mengubah cwd milik pemanggil)
+READ = "read"
+# Mengubah state yang di-commit
+MUTATE = "mutate"
+# Membangun ulang state dari data file; dipakai sinkronisasi mode shared
+# sendiri sehingga tidak dibungkus flock
+RELOAD = "reload"
+
+
+class Operation:
+    """Jenis akses dan sifat satu operasi"""
+    
+    __slots__ = ("access", "out_of_band", "iterator", "remote")
+    
+    def __init__(self, access: str, out_of_band: bool = False, iterator: bool = False,
+                 remote: bool = False):
+        self.access = access
+        # Mengubah file di luar journal (index snapshot, refs chunk)
+        self.out_of_band = out_of_band
+        # Mengembalikan iterator: wrapper lock membacanya penuh selama lock dipegang
+        self.iterator = iterator
+        # Boleh dipanggil client lewat server.py
+        self.remote = remote
+
+
+OPERATIONS: Dict[str, Operation] = {
+    "mkdir": Operation(MUTATE, remote=True),
+    "touch": Operation(MUTATE, remote=True),
+    "mkdir_many": Operation(MUTATE, remote=True),
+    "touch_many": Operation(MUTATE, remote=True),
+    "rm": Operation(MUTATE, remote=True),
+    "remove_tree": Operation(MUTATE, remote=True),
+    "cp": Operation(MUTATE, remote=True),
+    "mv": Operation(MUTATE, remote=True),
+    "write": Operation(MUTATE, remote=True),
+    "append": Operation(MUTATE, remote=True),
+    "truncate": Operation(MUTATE, remote=True),
+    "ls": Operation(READ, remote=True),
+    "cd": Operation(READ, remote=True),
+    "pwd": Operation(READ, remote=True),
+    "df": Operation(READ, remote=True),
+    "du": Operation(READ, remote=True),
+    "find": Operation(READ, remote=True),
+    "iter_find": Operation(READ, iterator=True, remote=True),
+    "stat": Operation(READ, remote=True),
+    "path_exists": Operation(READ, remote=True),
+    "read": Operation(READ, remote=True),
+    "read_stream": Operation(READ, iterator=True),
+    "snapshot_create": Operation(MUTATE, out_of_band=True, remote=True),
+    "snapshot_list": Operation(READ, remote=True),
+    "snapshot_restore": Operation(MUTATE, remote=True),
+    "snapshot_diff": Operation(READ, remote=True),
+    "snapshot_delete": Operation(MUTATE, out_of_band=True, remote=True),
+    "import_snapshot": Operation(MUTATE),
+    "export_snapshot": Operation(READ),
+    "save_filesystem": Operation(MUTATE),
+    "rebuild_chunk_refs": Operation(MUTATE, out_of_band=True),
+    "load_filesystem": Operation(RELOAD),
+    "replay_journal": Operation(RELOAD),
+    "recompute_tree_stats": Operation(RELOAD),
+    "refresh": Operation(RELOAD),
+}
+
+
+def names(access: str = None, **flags) -> tuple:
+    """Nama operasi dengan akses dan flag tertentu (urutan registry)"""
+    return tuple(name for name, operation in OPERATIONS.items()
+                 if (access is None or operation.access == access)
+                 and all(getattr(operation, flag) == value for flag, value in flags.items()))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Hasil terstruktur operasi FileSystemSimulator untuk mode quiet
+
+Di mode quiet ls/stat/df/du mengembalikan objek di bawah ini dan tidak
+mencetak apa pun; CLI dan GUI yang menampilkannya. Fungsi *_lines()
+membentuk teks yang sama dengan output mode biasa (yang juga memakai
+fungsi ini, tetapi mencetak semua baris sekaligus).
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from inode import DIRECTORY
+
+
+class DirEntry:
+    """Satu entry hasil ls"""
+    
+    __slots__ = ("name", "kind", "size", "permissions", "owner", "modified")
+    
+    def __init__(self, name: str, kind: int, size: int, permissions: str,
+                 owner: str, modified: int):
+        self.name = name
+        self.kind = kind
+        self.size = size
+        self.permissions = permissions
+        self.owner = owner
+        self.modified = modified  # Timestamp mikrodetik
+    
+    @property
+    def is_directory(self) -> bool:
+        return self.kind == DIRECTORY
+    
+    @property
+    def display_name(self) -> str:
+        return self.name + "/" if self.is_directory else self.name
+    
+    def long_line(self) -> str:
+        """Format: permissions owner size date name"""
+        modified = datetime.fromtimestamp(self.modified // 1_000_000).strftime("%b %d %H:%M")
+        file_type = "d" if self.is_directory else "-"
+        return f"{file_type}{self.permissions} {self.owner:>8} {self.size:>8} {modified} {self.display_name}"
+    
+    def __repr__(self) -> str:
+        return f"DirEntry({self.display_name!r}, size={self.size})"
+
+
+class StatResult:
+    """Hasil stat satu path"""
+    
+    __slots__ = ("path", "type", "size", "permissions", "owner", "created", "modified",
+                 "children", "tree_size", "tree_count")
+    
+    def __init__(self, path: str, info: Dict[str, Any]):
+        self.path = path
+        self.type = info["type"]
+        self.size = info["size"]
+        self.permissions = info["permissions"]
+        self.owner = info["owner"]
+        self.created = info["created"]
+        self.modified = info["modified"]
+        # Hanya untuk directory: jumlah anak langsung dan agregat subtree
+        self.children: Optional[int] = len(info["children"]) if "children" in info else None
+        self.tree_size: Optional[int] = info.get("tree_size")
+        self.tree_count: Optional[int] = info.get("tree_count")
+    
+    def lines(self) -> List[str]:
+        lines = [f"File: {self.path}",
+                 f"Type: {self.type}",
+                 f"Size: {self.size} bytes",
+                 f"Permissions: {self.permissions}",
+                 f"Owner: {self.owner}",
+                 f"Created: {self.created}",
+                 f"Modified: {self.modified}"]
+        if self.type == "directory":
+            lines += [f"Children: {self.children}",
+                      f"Total size: {self.tree_size} bytes",
+                      f"Total entries: {self.tree_count}"]
+        return lines
+
+
+class DiskUsage:
+    """Hasil df (semua ukuran dalam byte)"""
+    
+    __slots__ = ("disk_size", "total", "used", "free", "usage_percent", "physical", "sparse")
+    
+    def __init__(self, disk_size: int, used: int, physical: int, sparse: int = 0):
+        self.disk_size = disk_size  # MB
+        self.total = disk_size * 1024 * 1024
+        self.used = used
+        self.free = self.total - used
+        self.usage_percent = used / self.total * 100 if self.total > 0 else 0
+        self.physical = physical
+        self.sparse = sparse  # Byte hole: terbaca sebagai nol, tidak disimpan
+    
+    @property
+    def logical(self) -> int:
+        return self.used
+    
+    @property
+    def saved(self) -> int:
+        # Penghematan dedup saja: logical dikurangi byte chunk yang
+        # benar-benar tersimpan dan hole (hole dilaporkan di sparse)
+        return self.used - self.sparse - self.physical
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "used": self.used,
+            "free": self.free,
+            "usage_percent": self.usage_percent,
+            "logical": self.logical,
+            "physical": self.physical,
+            "saved": self.saved,
+            "sparse": self.sparse
+        }
+    
+    def lines(self) -> List[str]:
+        return [f"Filesystem     Size   Used  Avail Use%",
+                f"simfs         {self.disk_size}M   {self.used//1024//1024}M   {self.free//1024//1024}M   {self.usage_percent:.1f}%",
+                f"Logical: {self.logical} bytes, physical: {self.physical} bytes, saved: {self.saved} bytes, "
+                f"sparse: {self.sparse} bytes"]
+
+
+class UsageEntry:
+    """Satu baris du: ukuran agregat directory/file"""
+    
+    __slots__ = ("path", "size", "entries")
+    
+    def __init__(self, path: str, size: int, entries: int):
+        self.path = path
+        self.size = size
+        self.entries = entries  # Jumlah entry di bawah path (tanpa path itu sendiri)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"path": self.path, "size": self.size, "entries": self.entries}
+    
+    def line(self) -> str:
+        return f"{self.size:<12} {self.path}"
+    
+    def __repr__(self) -> str:
+        return f"UsageEntry({self.path!r}, size={self.size}, entries={self.entries})"
+
+
+def listing_lines(entries: Sequence[DirEntry], long_format: bool = False) -> List[str]:
+    """Baris output ls; format pendek berupa satu baris nama"""
+    if long_format:
+        return [entry.long_line() for entry in entries]
+    return ["".join(entry.display_name + "  " for entry in entries)]
+
+
+def find_lines(paths: Sequence[str], name: str) -> List[str]:
+    return list(paths) or [f"No files or directories found matching '{name}'"]
+
+
+def snapshot_lines(snapshots: Sequence[Dict[str, Any]]) -> List[str]:
+    return [f"{info['name']:<20} {info['created']}  {info['used']:>10} bytes  {info['changes']} inode(s) changed since"
+            for info in snapshots] or ["No snapshots"]
+
+
+def diff_lines(changes: Sequence[Tuple[str, str]]) -> List[str]:
+    return [f"{status} {path}" for status, path in changes] or ["No differences"]
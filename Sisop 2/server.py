@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Server jaringan (asyncio) untuk File System Simulator
+
+Satu proses memuat filesystem sekali dan melayani banyak client lewat
+TCP atau Unix socket. Protokolnya JSON per baris:
+    
+    request : {"id": 1, "op": "mkdir", "args": ["docs"], "kwargs": {}}
+    response: {"id": 1, "ok": true, "result": true, "output": "..."}
+              {"id": 1, "ok": false, "error": "...", "type": "ValueError",
+               "module": "builtins", "output": ""}
+
+"output" berisi teks yang dicetak operasi. Bytes dikirim sebagai
+{"__bytes__": "<base64>"}. Client boleh mengirim banyak request tanpa
+menunggu (pipelining); response dikirim urut request, dan semua request
+yang sudah ada di buffer dijawab dengan satu kali write. Setiap koneksi
+punya current directory sendiri.
+
+Penggunaan:
+    python server.py [--host 127.0.0.1] [--port 7070] [--unix PATH]
+                     [--data-file FILE] [--no-journal] [--shared] [--metrics]
+"""
+
+import io
+import json
+import time
+import base64
+import asyncio
+import argparse
+import contextlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from file_system import FileSystemSimulator, DEFAULT_DATA_FILE
+from inode import ROOT_INODE
+from operations import names
+
+DEFAULT_PORT = 7070
+READ_SIZE = 64 * 1024
+
+# Operasi FileSystemSimulator yang boleh dipanggil client
+OPERATIONS = names(remote=True)
+
+
+def encode(value: Any) -> Any:
+    """Ubah hasil operasi menjadi nilai yang bisa di-JSON-kan"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    return value
+
+
+def decode(value: Any) -> Any:
+    """Kebalikan encode()"""
+    if isinstance(value, dict):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        return {key: decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
+
+def parse_address(address: str) -> Tuple[str, Any]:
+    """'host:port', ':port' atau 'unix:/path' -> ("tcp", (host, port)) / ("unix", path)"""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Invalid address '{address}' (use HOST:PORT or unix:PATH)")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+class Session:
+    """State per koneksi client"""
+    
+    __slots__ = ("cwd_inode", "requests")
+    
+    def __init__(self):
+        self.cwd_inode = ROOT_INODE
+        self.requests = 0
+
+
+class FileSystemServer:
+    """Layani FileSystemSimulator lewat asyncio stream"""
+    
+    def __init__(self, fs: FileSystemSimulator):
+        self.fs = fs
+        self.clients = 0
+        self.requests = 0
+        self.started = time.monotonic()
+        self.listener: Optional[asyncio.AbstractServer] = None
+        self._tasks = set()
+    
+    def stats(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self.started
+        stats = {"clients": self.clients, "requests": self.requests, "uptime": uptime,
+                 "requests_per_second": self.requests / uptime if uptime > 0 else 0.0}
+        if getattr(self.fs, "metrics", None) is not None:
+            stats["metrics"] = self.fs.metrics.snapshot()
+        return stats
+    
+    def dispatch(self, session: Session, line: bytes) -> Dict[str, Any]:
+        """Jalankan satu request dan bentuk response-nya"""
+        output = io.StringIO()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            op = request["op"]
+            args = decode(request.get("args", []))
+            kwargs = decode(request.get("kwargs", {}))
+            
+            fs = self.fs
+            # Operasi dijalankan berurutan di thread event loop; cwd milik
+            # session dipasang sebelum operasi dan disimpan sesudahnya
+            fs.cwd_inode = session.cwd_inode if session.cwd_inode in fs.inodes else ROOT_INODE
+            with contextlib.redirect_stdout(output):
+                if op == "cwd":
+                    result = fs.current_directory
+                elif op == "stats":
+                    result = self.stats()
+                elif op in OPERATIONS:
+                    result = getattr(fs, op)(*args, **kwargs)
+                    if op == "iter_find":
+                        result = list(result)
+                else:
+                    raise ValueError(f"Unknown operation '{op}'")
+            session.cwd_inode = fs.cwd_inode
+            response = {"id": request_id, "ok": True, "result": encode(result)}
+        except Exception as e:
+            response = {"id": request_id, "ok": False, "error": str(e),
+                        "type": type(e).__name__, "module": type(e).__module__}
+        response["output"] = output.getvalue()
+        session.requests += 1
+        self.requests += 1
+        return response
+    
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = Session()
+        self.clients += 1
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        pending = b""
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                # Pipelining: jawab semua request lengkap di buffer sekaligus
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                responses = [json.dumps(self.dispatch(session, line), separators=(",", ":"))
+                             for line in lines if line.strip()]
+                if responses:
+                    writer.write(("\n".join(responses) + "\n").encode("utf-8"))
+                    await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients -= 1
+            self._tasks.discard(task)
+            writer.close()
+    
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        kind, target = parse_address(address)
+        if kind == "unix":
+            self.listener = await asyncio.start_unix_server(self.handle_client, path=target)
+        else:
+            self.listener = await asyncio.start_server(self.handle_client, *target)
+        return self.listener
+    
+    async def close(self):
+        """Berhenti menerima koneksi dan tutup koneksi yang masih aktif"""
+        if self.listener is not None:
+            self.listener.close()
+            await self.listener.wait_closed()
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def serve(fs: FileSystemSimulator, address: str):
+    server = await FileSystemServer(fs).start(address)
+    print(f"Serving File System Simulator on {address}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main function"""
+    parser = argparse.ArgumentParser(description="File System Simulator server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--data-file", default=DEFAULT_DATA_FILE)
+    parser.add_argument("--no-journal", action="store_true",
+                        help="rewrite the full snapshot on every mutation")
+    parser.add_argument("--shared", action="store_true",
+                        help="allow other processes to use the same data file")
+    parser.add_argument("--metrics", action="store_true",
+                        help="record per-operation latency (returned by 'stats')")
+    options = parser.parse_args(argv)
+    
+    address = f"unix:{options.unix}" if options.unix else f"{options.host}:{options.port}"
+    fs = FileSystemSimulator(data_file=options.data_file, journal=not options.no_journal,
+                             shared=options.shared, metrics=options.metrics)
+    try:
+        asyncio.run(serve(fs, address))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+    finally:
+        fs.close()
+
+if __name__ == "__main__":
+    main()
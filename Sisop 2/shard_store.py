@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Store bersharding untuk File System Simulator
+
+Setiap directory punya satu shard berisi daftar children-nya dan metadata
+semua entry di dalamnya. Metadata root dan state global disimpan di
+meta.json. Shard dibaca saat pertama kali disentuh (biasanya oleh path
+resolver) dan shard yang bersih dibuang dari memori secara LRU ketika
+perkiraan pemakaian memori melewati batas. Shard yang berubah dipin
+sampai ditulis oleh flush(), sehingga perubahan tidak pernah hilang.
+
+Lokasi entry (parent) dan ukuran agregat directory disimpan terpisah di
+index.bin sebagai record berukuran tetap. Mutasi hanya menulis ulang
+shard yang isinya berubah; agregat ancestor cukup ditulis ke record-nya.
+Lokasi entry yang shard-nya sudah dibuang dibaca lagi dari index.bin,
+jadi lokasi di memori hanya untuk shard yang resident.
+
+Layout directory:
+    meta.json        : root inode, used_space, cwd, next_inode, disk_size
+    index.bin        : record LOCATOR per inode (offset ino * ukuran record)
+    xx/<ino>.json    : shard directory <ino> (xx = ino % 256, hex)
+"""
+
+import os
+import json
+import struct
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, Set, Any, Tuple
+
+from inode import Inode, DIRECTORY, ROOT_INODE
+
+# Perkiraan memori per entry resident (record inode + entry dict)
+ENTRY_COST = 400
+# parent (0 = tidak ada), tree_size, tree_count
+LOCATOR = struct.Struct("<qqq")
+
+Record = Tuple[int, int, int]
+
+
+class Shard:
+    """Isi satu directory: children (nama -> ino) dan metadata entry"""
+    
+    __slots__ = ("children", "entries")
+    
+    def __init__(self, children: Dict[str, int], entries: Dict[int, Inode]):
+        self.children = children
+        self.entries = entries
+
+
+def _metadata(node: Inode) -> Dict[str, Any]:
+    """Bentuk dict inode tanpa children (children ada di shard sendiri)"""
+    data = node.to_dict()
+    data.pop("children", None)
+    return data
+
+
+def _record(node: Inode) -> Record:
+    if node.kind == DIRECTORY:
+        return node.parent, node.tree_size or 0, node.tree_count or 0
+    return node.parent, 0, 0
+
+
+class ShardedInodeTable(MutableMapping):
+    """Inode table yang memuat shard directory sesuai kebutuhan"""
+    
+    def __init__(self, directory: str, memory_limit: int):
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.meta: Dict[str, Any] = {}
+        self.root = Inode(DIRECTORY, 0, "")
+        self._shards: "OrderedDict[int, Shard]" = OrderedDict()
+        self._parent_of: Dict[int, int] = {}  # Lokasi entry di shard resident
+        self._index_file = os.path.join(directory, "index.bin")
+        self._records: Dict[int, Record] = {}  # Record index.bin yang belum ditulis
+        self._resident = 0
+        self._pinned: Set[int] = set()  # Shard yang berubah dan belum ditulis
+        self._deleted_dirs: Set[int] = set()
+        self.loads = 0
+        self.evictions = 0
+        self.bytes_written = 0
+        
+        meta_file = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_file):
+            with open(meta_file, "r") as f:
+                self.meta = json.load(f)
+            self.root = Inode.from_dict(self.meta["root"])
+            if not os.path.exists(self._index_file):
+                self._build_index()  # Store lama tanpa index.bin
+        self.root.children = None  # Children root ada di shard ROOT_INODE
+    
+    # ---- file shard ---------------------------------------------------
+    
+    def _shard_file(self, ino: int) -> str:
+        return os.path.join(self.directory, f"{ino % 256:02x}", f"{ino}.json")
+    
+    def _read_shard(self, dir_ino: int) -> Shard:
+        path = self._shard_file(dir_ino)
+        if not os.path.exists(path):
+            return Shard({}, {})
+        with open(path, "r") as f:
+            data = json.load(f)
+        entries = {}
+        directories = []
+        for ino, meta in data["entries"].items():
+            node = Inode.from_dict(meta)
+            if node.kind == DIRECTORY:
+                node.children = None  # Dipasang saat inode diakses
+                directories.append(int(ino))
+            entries[int(ino)] = node
+        # Agregat directory disimpan di index.bin, bukan di shard
+        for ino, record in self._read_records(directories).items():
+            entries[ino].tree_size, entries[ino].tree_count = record[1], record[2]
+        return Shard(data["children"], entries)
+    
+    def _write_shard(self, dir_ino: int, shard: Shard):
+        path = self._shard_file(dir_ino)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entries = {}
+        for ino, node in shard.entries.items():
+            entries[ino] = data = _metadata(node)
+            data.pop("tree_size", None)
+            data.pop("tree_count", None)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"children": shard.children, "entries": entries},
+                      f, separators=(",", ":"))
+            self.bytes_written += f.tell()
+        os.replace(path + ".tmp", path)
+    
+    # ---- index.bin ----------------------------------------------------
+    
+    def _read_records(self, inos: Iterable[int]) -> Dict[int, Record]:
+        """Record index.bin (yang belum ditulis didahulukan); entry terhapus dilewati"""
+        records = {}
+        f = None
+        try:
+            for ino in inos:
+                record = self._records.get(ino)
+                if record is None:
+                    if f is None:
+                        if not os.path.exists(self._index_file):
+                            continue
+                        f = open(self._index_file, "rb")
+                    f.seek(ino * LOCATOR.size)
+                    data = f.read(LOCATOR.size)
+                    if len(data) < LOCATOR.size:
+                        continue
+                    record = LOCATOR.unpack(data)
+                if record[0]:
+                    records[ino] = record
+        finally:
+            if f is not None:
+                f.close()
+        return records
+    
+    def _write_records(self):
+        if not self._records:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._index_file, "r+b" if os.path.exists(self._index_file) else "w+b") as f:
+            for ino in sorted(self._records):
+                f.seek(ino * LOCATOR.size)
+                f.write(LOCATOR.pack(*self._records[ino]))
+        self.bytes_written += len(self._records) * LOCATOR.size
+        self._records.clear()
+    
+    def _build_index(self):
+        """Isi index.bin dari semua shard (agregat lama masih ada di shard)"""
+        stack = [ROOT_INODE]
+        while stack:
+            dir_ino = stack.pop()
+            path = self._shard_file(dir_ino)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r") as f:
+                entries = json.load(f)["entries"]
+            for ino, meta in entries.items():
+                self._records[int(ino)] = (dir_ino, meta.get("tree_size") or 0,
+                                           meta.get("tree_count") or 0)
+                if meta["type"] == "directory":
+                    stack.append(int(ino))
+        self._write_records()
+    
+    def _locate(self, ino: int) -> Optional[int]:
+        """Shard (directory parent) yang menyimpan entry ino"""
+        parent = self._parent_of.get(ino)
+        if parent is None:
+            record = self._read_records((ino,)).get(ino)
+            parent = record[0] if record is not None else None
+        return parent
+    
+    def _load_shard(self, dir_ino: int, protect: Optional[int] = None) -> Shard:
+        shard = self._shards.get(dir_ino)
+        if shard is not None:
+            self._shards.move_to_end(dir_ino)
+            return shard
+        shard = self._read_shard(dir_ino)
+        self.loads += 1
+        for ino in shard.entries:
+            self._parent_of[ino] = dir_ino
+        self._shards[dir_ino] = shard
+        self._resident += len(shard.entries) + 1
+        self._evict(protect=(dir_ino, protect))
+        return shard
+    
+    def _evict(self, protect=()):
+        """Buang shard bersih yang paling lama tidak dipakai"""
+        if self._resident * ENTRY_COST <= self.memory_limit:
+            return
+        for dir_ino in list(self._shards):
+            if self._resident * ENTRY_COST <= self.memory_limit:
+                break
+            if dir_ino in self._pinned or dir_ino in protect:
+                continue
+            shard = self._shards.pop(dir_ino)
+            self._resident -= len(shard.entries) + 1
+            self.evictions += 1
+            # Lokasi entry dibaca lagi dari index.bin jika dibutuhkan
+            for ino in shard.entries:
+                if self._parent_of.get(ino) == dir_ino:
+                    del self._parent_of[ino]
+            # Lepas children dari inode directory-nya agar dimuat ulang nanti
+            owner = self._resident_node(dir_ino)
+            if owner is not None and owner.children is shard.children:
+                owner.children = None
+    
+    def _resident_node(self, ino: int) -> Optional[Inode]:
+        if ino == ROOT_INODE:
+            return self.root
+        shard = self._shards.get(self._parent_of.get(ino))
+        return shard.entries.get(ino) if shard is not None else None
+    
+    @property
+    def resident_shards(self) -> int:
+        return len(self._shards)
+    
+    @property
+    def resident_entries(self) -> int:
+        return self._resident
+    
+    # ---- MutableMapping -----------------------------------------------
+    
+    def __getitem__(self, ino: int) -> Inode:
+        if ino == ROOT_INODE:
+            node = self.root
+        else:
+            parent = self._locate(ino)
+            if parent is None:
+                raise KeyError(ino)
+            node = self._load_shard(parent).entries.get(ino)
+            if node is None:
+                raise KeyError(ino)
+        if node.kind == DIRECTORY and node.children is None:
+            node.children = self._load_shard(ino, protect=node.parent).children
+        return node
+    
+    def __contains__(self, ino: object) -> bool:
+        try:
+            self[ino]
+        except KeyError:
+            return False
+        return True
+    
+    def __setitem__(self, ino: int, node: Inode):
+        if ino == ROOT_INODE:
+            self.root = node
+        else:
+            self._load_shard(node.parent).entries[ino] = node
+            self._parent_of[ino] = node.parent
+            self._pinned.add(node.parent)
+            self._records[ino] = _record(node)
+        if node.kind == DIRECTORY:
+            self._deleted_dirs.discard(ino)
+            self._load_shard(ino, protect=node.parent).children = node.children
+            self._pinned.add(ino)
+    
+    def __delitem__(self, ino: int):
+        if ino == ROOT_INODE:
+            # Root tidak pernah dihapus, hanya diganti (rollback)
+            return
+        parent = self._locate(ino)
+        if parent is None:
+            raise KeyError(ino)
+        node = self._load_shard(parent).entries.pop(ino)
+        self._pinned.add(parent)
+        self._parent_of.pop(ino, None)
+        self._records[ino] = (0, 0, 0)
+        if node.kind == DIRECTORY:
+            # Shard tetap bisa dibaca (children dihapus sesudahnya) sampai flush
+            self._deleted_dirs.add(ino)
+    
+    def __iter__(self) -> Iterator[int]:
+        stack = [ROOT_INODE]
+        while stack:
+            ino = stack.pop()
+            yield ino
+            node = self[ino]
+            if node.kind == DIRECTORY:
+                stack.extend(node.children.values())
+    
+    def __len__(self) -> int:
+        return self.root.tree_count + 1
+    
+    # ---- persistence --------------------------------------------------
+    
+    def mark(self, ino: int):
+        """Pin shard yang akan berubah karena mutasi inode ini"""
+        parent = self._locate(ino)
+        if parent is not None:
+            self._pinned.add(parent)
+        self._pinned.add(ino)
+    
+    def adjust(self, ino: int, node: Inode):
+        """Agregat directory berubah: cukup record index.bin, shard tidak ditulis"""
+        if ino != ROOT_INODE:
+            self._records[ino] = _record(node)
+    
+    def flush(self, dirty: Set[int], state: Dict[str, Any]):
+        """Tulis shard yang berubah dan meta.json"""
+        # Entry yang dipindah (mv) berpindah shard saat flush
+        for ino in dirty:
+            if ino == ROOT_INODE:
+                continue
+            parent = self._parent_of.get(ino)
+            node = self._resident_node(ino)
+            if node is not None and node.parent != parent:
+                self._load_shard(parent).entries.pop(ino, None)
+                self._load_shard(node.parent).entries[ino] = node
+                self._parent_of[ino] = node.parent
+                self._pinned.update((parent, node.parent))
+                self._records[ino] = _record(node)
+        
+        for dir_ino in self._deleted_dirs:
+            shard = self._shards.pop(dir_ino, None)
+            if shard is not None:
+                self._resident -= len(shard.entries) + 1
+            self._pinned.discard(dir_ino)
+            try:
+                os.remove(self._shard_file(dir_ino))
+            except FileNotFoundError:
+                pass
+        self._deleted_dirs.clear()
+        
+        for dir_ino in self._pinned:
+            shard = self._shards.get(dir_ino)
+            if shard is not None:
+                self._write_shard(dir_ino, shard)
+        self._pinned.clear()
+        self._write_records()
+        
+        self.meta = dict(state, root=_metadata(self.root))
+        os.makedirs(self.directory, exist_ok=True)
+        meta_file = os.path.join(self.directory, "meta.json")
+        with open(meta_file + ".tmp", "w") as f:
+            json.dump(self.meta, f)
+            self.bytes_written += f.tell()
+        os.replace(meta_file + ".tmp", meta_file)
+        self._evict()
+    
+    def flush_all(self, state: Dict[str, Any]):
+        """Tulis semua shard resident (misalnya setelah import)"""
+        self._pinned.update(self._shards)
+        self.flush(set(), state)
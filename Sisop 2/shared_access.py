@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Akses multi-proses untuk FileSystemSimulator(shared=True)
+
+Beberapa proses boleh memakai data_file yang sama. Setiap operasi
+memegang advisory lock (flock) pada <data_file>.lock: shared untuk
+operasi baca, exclusive untuk operasi yang mengubah state, sehingga
+tidak ada update yang hilang.
+
+Setiap commit menaikkan generation dan mencatatnya di record journal
+("gen") dan di checkpoint. Lock file berisi "generation checkpoint"
+commit terakhir. Sebelum operasi berjalan, proses yang tertinggal hanya
+membaca record journal sesudah offset terakhir yang sudah diterapkan;
+load penuh hanya terjadi jika record yang terlewat sudah dilipat ke
+checkpoint oleh proses lain. Current directory milik masing-masing
+proses dan tidak ikut disinkronkan.
+
+Tanpa fcntl (Windows) flock tidak tersedia: deteksi perubahan tetap
+jalan tetapi proses tidak saling mengunci.
+"""
+
+import os
+import functools
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from inode import DIRECTORY, ROOT_INODE
+from operations import OPERATIONS, READ, MUTATE
+
+State = Tuple[int, int]
+
+
+class DataFileLock:
+    """flock pada lock file yang juga menyimpan state commit terakhir"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    
+    def acquire(self, exclusive: bool):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    
+    def release(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+    
+    def read_state(self) -> Optional[State]:
+        """(generation, generation checkpoint); None untuk lock file baru"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        fields = os.read(self._fd, 64).split()
+        if len(fields) != 2:
+            return None
+        return int(fields[0]), int(fields[1])
+    
+    def write_state(self, state: State):
+        data = f"{state[0]} {state[1]}\n".encode("ascii")
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, data)
+        os.ftruncate(self._fd, len(data))
+    
+    def close(self):
+        os.close(self._fd)
+
+
+class SharedAccess:
+    """Lock antar proses dan sinkronisasi incremental dari journal"""
+    
+    def __init__(self, fs):
+        self.fs = fs
+        self.lock = DataFileLock(os.path.splitext(fs.data_file)[0] + ".lock")
+        self._depth = 0
+        self._exclusive = False
+        self._state: Optional[State] = None  # State lock file yang terakhir dilihat
+        self.syncs = 0
+        self.full_reloads = 0
+        self.records_applied = 0
+    
+    def install(self):
+        """Ganti operasi publik instance fs dengan versi yang mengunci"""
+        fs = self.fs
+        # Operasi baca: shared lock; operasi yang mengubah state: exclusive lock
+        for name, operation in OPERATIONS.items():
+            if operation.access in (READ, MUTATE):
+                setattr(fs, name, self._wrap(getattr(fs, name), operation))
+        fs.transaction = self._wrap_transaction(fs.transaction)
+    
+    def close(self):
+        self.lock.close()
+    
+    @property
+    def state(self) -> State:
+        return self.fs.generation, self.fs._checkpoint_generation
+    
+    @contextmanager
+    def locked(self, exclusive: bool, sync: bool = True):
+        """Pegang flock selama blok; state disinkronkan dulu, commit dipublikasikan"""
+        if self._depth:
+            # Dipanggil dari operasi lain: berjalan di bawah lock terluar
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+            return
+        
+        self.lock.acquire(exclusive)
+        self._depth, self._exclusive = 1, exclusive
+        try:
+            if sync:
+                self.catch_up()
+            yield
+        finally:
+            try:
+                if exclusive and self.state != self._state:
+                    self._state = self.state
+                    self.lock.write_state(self._state)
+            finally:
+                self._depth, self._exclusive = 0, False
+                self.lock.release()
+    
+    def catch_up(self) -> bool:
+        """Terapkan commit proses lain; True jika ada yang berubah"""
+        fs = self.fs
+        self._state = self.lock.read_state()
+        if self._state is None or self._state == self.state:
+            return False
+        checkpoint = self._state[1]
+        
+        cwd = fs.cwd_inode
+        if checkpoint != fs._checkpoint_generation and fs.generation < checkpoint:
+            # Record yang belum diterapkan sudah dilipat ke checkpoint baru
+            fs.load_filesystem()
+            self.full_reloads += 1
+        else:
+            if checkpoint != fs._checkpoint_generation:
+                # Journal dimulai ulang setelah checkpoint yang sudah kita punya
+                fs._checkpoint_generation = checkpoint
+                fs._journal_offset = 0
+            self.records_applied += fs.replay_journal(fs._journal_offset)
+            fs.chunk_store.load()
+            fs.snapshots.load()
+            self.syncs += 1
+        node = fs.inodes.get(cwd)
+        fs.cwd_inode = cwd if node is not None and node.kind == DIRECTORY else ROOT_INODE
+        return True
+    
+    def refresh(self) -> bool:
+        with self.locked(False, sync=False):
+            return self.catch_up()
+    
+    def _wrap(self, method, operation):
+        exclusive = operation.access == MUTATE
+        
+        @functools.wraps(method)
+        def locked(*args, **kwargs):
+            with self.locked(exclusive):
+                before = self.fs.generation
+                result = method(*args, **kwargs)
+                if operation.iterator and result is not None:
+                    result = iter(list(result))
+                # Perubahan di luar journal dicatat sebagai record kosong
+                # agar proses lain ikut memuat ulang
+                if operation.out_of_band and self._exclusive and self.fs.generation == before:
+                    self.fs._append_journal()
+                return result
+        return locked
+    
+    def _wrap_transaction(self, method):
+        @functools.wraps(method)
+        @contextmanager
+        def transaction():
+            with self.locked(True):
+                with method() as fs:
+                    yield fs
+        return transaction
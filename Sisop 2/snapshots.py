@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Snapshot copy-on-write untuk File System Simulator
+
+Snapshot tidak menyalin inode table. Setiap snapshot hanya menyimpan
+delta: pre-image inode yang berubah sejak snapshot itu dibuat sampai
+snapshot berikutnya. Inode yang tidak berubah dibagi dengan state live,
+sehingga membuat snapshot O(1) dan restore/diff O(jumlah perubahan).
+
+Nilai inode di snapshot ke-i adalah entry pertama yang ditemukan di
+delta i, i+1, ..., terbaru; jika tidak ada, nilainya sama dengan live.
+
+Layout directory:
+    index.json   : daftar metadata snapshot (urut dari yang terlama)
+    <id>.delta   : JSON lines berisi {ino: inode dict atau null}
+"""
+
+import os
+import json
+from typing import Dict, List, Optional, Set, Any, Mapping
+
+from inode import Inode
+
+
+class Snapshot:
+    """Metadata satu snapshot beserta delta pre-image inode"""
+    
+    __slots__ = ("id", "name", "created", "used_space", "next_inode", "cwd_inode", "delta")
+    
+    def __init__(self, snapshot_id: int, name: str, created: int, used_space: int,
+                 next_inode: int, cwd_inode: int):
+        self.id = snapshot_id
+        self.name = name
+        self.created = created
+        self.used_space = used_space
+        self.next_inode = next_inode
+        self.cwd_inode = cwd_inode
+        # ino -> Inode saat snapshot dibuat (None = belum ada)
+        self.delta: Dict[int, Optional[Inode]] = {}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "name": self.name, "created": self.created,
+                "used_space": self.used_space, "next_inode": self.next_inode,
+                "cwd_inode": self.cwd_inode}
+
+
+class SnapshotStore:
+    """Daftar snapshot dan penyimpanannya di directory"""
+    
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.snapshots: List[Snapshot] = []
+        self.next_id = 1
+        self.bytes_written = 0  # Byte delta yang ditulis (metrics)
+    
+    @property
+    def latest(self) -> Optional[Snapshot]:
+        return self.snapshots[-1] if self.snapshots else None
+    
+    def position(self, name: str) -> Optional[int]:
+        for position, snapshot in enumerate(self.snapshots):
+            if snapshot.name == name:
+                return position
+        return None
+    
+    def _delta_file(self, snapshot: Snapshot) -> str:
+        return os.path.join(self.directory, f"{snapshot.id}.delta")
+    
+    def load(self):
+        """Baca index dan semua delta; baris terakhir yang terpotong diabaikan"""
+        self.snapshots = []
+        self.next_id = 1
+        index_file = os.path.join(self.directory, "index.json")
+        if not os.path.exists(index_file):
+            return
+        with open(index_file, "r") as f:
+            index = json.load(f)
+        for meta in index:
+            snapshot = Snapshot(meta["id"], meta["name"], meta["created"], meta["used_space"],
+                                meta["next_inode"], meta["cwd_inode"])
+            if os.path.exists(self._delta_file(snapshot)):
+                with open(self._delta_file(snapshot), "r") as f:
+                    for line in f:
+                        try:
+                            entries = json.loads(line)
+                        except ValueError:
+                            break
+                        for ino, entry in entries.items():
+                            snapshot.delta[int(ino)] = (Inode.from_dict(entry)
+                                                        if entry is not None else None)
+            self.snapshots.append(snapshot)
+            self.next_id = max(self.next_id, snapshot.id + 1)
+    
+    def save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        index_file = os.path.join(self.directory, "index.json")
+        with open(index_file + ".tmp", "w") as f:
+            json.dump([snapshot.to_dict() for snapshot in self.snapshots], f)
+        os.replace(index_file + ".tmp", index_file)
+    
+    def add(self, snapshot: Snapshot):
+        self.snapshots.append(snapshot)
+        self.next_id = snapshot.id + 1
+        os.makedirs(self.directory, exist_ok=True)
+        open(self._delta_file(snapshot), "w").close()
+        self.save_index()
+    
+    def remove(self, position: int):
+        snapshot = self.snapshots.pop(position)
+        self.save_index()
+        try:
+            os.remove(self._delta_file(snapshot))
+        except FileNotFoundError:
+            pass
+    
+    def clear(self):
+        while self.snapshots:
+            self.remove(len(self.snapshots) - 1)
+    
+    @staticmethod
+    def _encode(entries: Dict[int, Optional[Inode]]) -> str:
+        return json.dumps({ino: entry.to_dict() if entry is not None else None
+                           for ino, entry in entries.items()}, separators=(",", ":")) + "\n"
+    
+    def append_delta(self, snapshot: Snapshot, entries: Dict[int, Optional[Inode]]):
+        """Tambahkan pre-image baru ke file delta (append-only)"""
+        encoded = self._encode(entries)
+        with open(self._delta_file(snapshot), "a") as f:
+            f.write(encoded)
+        self.bytes_written += len(encoded)
+    
+    def rewrite_delta(self, snapshot: Snapshot):
+        """Tulis ulang seluruh delta (setelah snapshot lain digabung ke sini)"""
+        tmp_file = self._delta_file(snapshot) + ".tmp"
+        with open(tmp_file, "w") as f:
+            if snapshot.delta:
+                f.write(self._encode(snapshot.delta))
+            self.bytes_written += f.tell()
+        os.replace(tmp_file, self._delta_file(snapshot))
+    
+    def lookup(self, position: int, ino: int, live: Mapping[int, Inode]) -> Optional[Inode]:
+        """Nilai inode di snapshot ke-position (position == len berarti live)"""
+        for snapshot in self.snapshots[position:]:
+            if ino in snapshot.delta:
+                return snapshot.delta[ino]
+        return live.get(ino)
+    
+    def changed_between(self, start: int, end: int) -> Set[int]:
+        """Inode yang mungkin berubah antara snapshot start dan end"""
+        changed = set()
+        for snapshot in self.snapshots[start:end]:
+            changed.update(snapshot.delta)
+        return changed
@@ -6,22 +6,50 @@ Test Suite untuk File System Simulator
 import unittest
 import os
 import json
+import shutil
+import tempfile
+import io
+import itertools
+import re
+import asyncio
+import sys
+import random
+import threading
+import contextlib
+import multiprocessing
+import subprocess
+from datetime import datetime
 from file_system import FileSystemSimulator
+from inode import Inode, FILE, DIRECTORY
+from name_index import NameIndex
+import binary_snapshot
+import benchmark
+from chunk_store import CHUNK_SIZE
+from shard_store import ENTRY_COST
+from locking import RWLock
+from server import FileSystemServer
+from client import RemoteFileSystem, PIPELINE_WINDOW
+from cli import FileSystemCLI
+import cli
+import server
+import operations
+import errors
+from results import DirEntry, StatResult, DiskUsage, UsageEntry
 
 class TestFileSystemSimulator(unittest.TestCase):
     def setUp(self):
         """Setup untuk setiap test"""
+        # Jalankan setiap test di directory sementara agar
+        # filesystem_data.json milik repo tidak ikut terbaca/tertimpa
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
         self.fs = FileSystemSimulator(disk_size=100)  # 100MB untuk testing
-        # Hapus file test jika ada
-        test_file = "/home/Progger/Sisop 2/filesystem_data.json"
-        if os.path.exists(test_file):
-            os.remove(test_file)
     
     def tearDown(self):
         """Cleanup setelah test"""
-        test_file = "/home/Progger/Sisop 2/filesystem_data.json"
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
     
     def test_mkdir_basic(self):
         """Test basic mkdir functionality"""
@@ -98,6 +126,33 @@ class TestFileSystemSimulator(unittest.TestCase):
         self.assertTrue(self.fs.rm("test_dir", recursive=True))
         self.assertFalse(self.fs.path_exists("/test_dir"))
     
+    def test_rm_recursive_persists_once(self):
+        """Test rm -r subtree hanya persist sekali"""
+        self.fs.mkdir("tree/a/b", recursive=True)
+        for i in range(5):
+            self.fs.touch(f"tree/a/b/f{i}.txt", size=10)
+        saves = []
+        self.fs.save_filesystem = lambda: saves.append(1)
+        
+        self.assertTrue(self.fs.rm("tree", recursive=True))
+        self.assertEqual(len(saves), 1)
+        self.assertEqual(self.fs.used_space, 0)
+        self.assertEqual(list(self.fs.file_system), ["/"])
+        self.assertEqual(self.fs.file_system["/"]["children"], {})
+    
+    def test_remove_tree_summary(self):
+        """Test remove_tree mengembalikan jumlah node dan byte yang dibebaskan"""
+        self.fs.mkdir("tree/sub", recursive=True)
+        self.fs.touch("tree/a.txt", size=100)
+        self.fs.touch("tree/sub/b.txt", size=50)
+        self.fs.touch("other.txt", size=7)
+        
+        summary = self.fs.remove_tree("tree")
+        self.assertEqual(summary, {"removed": 4, "freed": 150})
+        self.assertEqual(self.fs.used_space, 7)
+        self.assertTrue(self.fs.path_exists("/other.txt"))
+        self.assertEqual(self.fs.remove_tree("/"), {})
+    
     def test_rm_nonempty_directory_no_recursive(self):
         """Test rm directory yang tidak kosong tanpa -r"""
         self.fs.mkdir("test_dir")
@@ -115,6 +170,39 @@ class TestFileSystemSimulator(unittest.TestCase):
         self.assertEqual(self.fs.file_system["/copy.txt"]["size"], 100)
         self.assertEqual(self.fs.used_space, 200)  # Original + copy
     
+    def test_cp_directory_recursive(self):
+        """Test cp -r menduplikasi seluruh subtree"""
+        self.fs.mkdir("src/sub", recursive=True)
+        self.fs.touch("src/a.txt", size=100)
+        self.fs.touch("src/sub/b.txt", size=50)
+        
+        self.assertFalse(self.fs.cp("src", "dst"))
+        self.assertTrue(self.fs.cp("src", "dst", recursive=True))
+        self.assertEqual(self.fs.file_system["/dst"]["children"],
+                         {"a.txt": "/dst/a.txt", "sub": "/dst/sub"})
+        self.assertEqual(self.fs.file_system["/dst/sub"]["children"],
+                         {"b.txt": "/dst/sub/b.txt"})
+        self.assertEqual(self.fs.used_space, 300)
+        
+        # Subtree hasil copy independen dari source
+        self.fs.rm("src", recursive=True)
+        self.assertTrue(self.fs.path_exists("/dst/sub/b.txt"))
+        self.assertEqual(self.fs.used_space, 150)
+    
+    def test_cp_directory_into_itself(self):
+        """Test cp -r ke dalam dirinya sendiri ditolak"""
+        self.fs.mkdir("src")
+        self.assertFalse(self.fs.cp("src", "src/inner", recursive=True))
+    
+    def test_cp_directory_space_check(self):
+        """Test cp -r mengecek space untuk total ukuran subtree"""
+        limit = self.fs.disk_size * 1024 * 1024
+        self.fs.mkdir("src")
+        self.fs.touch("src/a.bin", size=limit // 3)
+        self.fs.touch("src/b.bin", size=limit // 3)
+        self.assertFalse(self.fs.cp("src", "dst", recursive=True))
+        self.assertFalse(self.fs.path_exists("/dst"))
+    
     def test_mv_file(self):
         """Test move file"""
         self.fs.touch("original.txt", size=100)
@@ -123,6 +211,82 @@ class TestFileSystemSimulator(unittest.TestCase):
         self.assertTrue(self.fs.path_exists("/moved.txt"))
         self.assertEqual(self.fs.used_space, 100)  # Space should remain same
     
+    def test_mv_directory_keeps_inodes(self):
+        """Test mv directory hanya memindahkan entry, descendant tetap"""
+        self.fs.mkdir("proj/src/pkg", recursive=True)
+        self.fs.touch("proj/src/pkg/mod.py", size=10)
+        ino = self.fs._lookup("/proj/src/pkg/mod.py")
+        inode_count = len(self.fs.inodes)
+        
+        self.assertTrue(self.fs.mv("proj", "archive"))
+        self.assertFalse(self.fs.path_exists("/proj"))
+        self.assertEqual(self.fs._lookup("/archive/src/pkg/mod.py"), ino)
+        self.assertEqual(len(self.fs.inodes), inode_count)
+        self.assertEqual(self.fs.used_space, 10)
+    
+    def test_mv_into_own_subtree(self):
+        """Test mv directory ke dalam subtree sendiri ditolak"""
+        self.fs.mkdir("a/b", recursive=True)
+        self.assertFalse(self.fs.mv("a", "a/b/c"))
+        self.assertTrue(self.fs.path_exists("/a/b"))
+    
+    def test_mv_updates_current_directory(self):
+        """Test current directory mengikuti directory yang di-rename"""
+        self.fs.mkdir("old/inner", recursive=True)
+        self.fs.cd("old/inner")
+        self.fs.mv("/old", "/new")
+        self.assertEqual(self.fs.current_directory, "/new/inner")
+    
+    def test_inode_compact_record(self):
+        """Test inode memakai __slots__ dengan field ter-encode"""
+        self.fs.touch("a.txt", size=42)
+        self.fs.touch("b.txt")
+        node = self.fs.inodes[self.fs._lookup("/a.txt")]
+        other = self.fs.inodes[self.fs._lookup("/b.txt")]
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(node.kind, FILE)
+        self.assertIsInstance(node.modified, int)
+        self.assertIs(node.permissions, other.permissions)
+        
+        # View dict-compatible untuk caller lama
+        info = self.fs.file_system["/a.txt"]
+        self.assertEqual(info["type"], "file")
+        self.assertEqual(info["permissions"], "rw-r--r--")
+        self.assertEqual(info["content"], "\0" * 42)  # touch dengan size = sparse file
+        self.assertEqual(self.fs.file_system["/b.txt"]["content"], "")
+        datetime.fromisoformat(info["modified"])
+    
+    def test_inode_dict_roundtrip(self):
+        """Test konversi inode ke dict dan kembali tidak kehilangan data"""
+        node = Inode(DIRECTORY, 1, "docs")
+        node.children["a.txt"] = 7
+        clone = Inode.from_dict(node.to_dict())
+        self.assertEqual(clone.to_dict(), node.to_dict())
+        self.assertEqual(clone.created, node.created)
+        self.assertIs(clone.owner, node.owner)
+    
+    def test_load_legacy_path_format(self):
+        """Test load data lama yang di-key dengan absolute path"""
+        entry = {"created": "2024-01-01T00:00:00", "modified": "2024-01-01T00:00:00",
+                 "permissions": "rwxr-xr-x", "owner": "user"}
+        legacy = {
+            "file_system": {
+                "/": dict(entry, type="directory", size=0, children={"docs": "/docs"}),
+                "/docs": dict(entry, type="directory", size=0, children={"a.txt": "/docs/a.txt"}),
+                "/docs/a.txt": dict(entry, type="file", size=3, content="")
+            },
+            "current_directory": "/docs",
+            "used_space": 3,
+            "disk_size": 100
+        }
+        with open("filesystem_data.json", "w") as f:
+            json.dump(legacy, f)
+        
+        fs2 = FileSystemSimulator()
+        self.assertEqual(fs2.current_directory, "/docs")
+        self.assertEqual(fs2.file_system["/docs"]["children"], {"a.txt": "/docs/a.txt"})
+        self.assertEqual(fs2.file_system["/docs/a.txt"]["size"], 3)
+    
     def test_find_file(self):
         """Test find functionality"""
         self.fs.mkdir("test_dir")
@@ -133,6 +297,127 @@ class TestFileSystemSimulator(unittest.TestCase):
         results = self.fs.find("test_file.txt")
         self.assertIn("/test_dir/test_file.txt", results)
     
+    def test_find_uses_name_index(self):
+        """Test find substring/exact lewat index, difilter ke path awal"""
+        self.fs.mkdir("src/app", recursive=True)
+        self.fs.mkdir("docs")
+        self.fs.touch("src/app/config.py")
+        self.fs.touch("docs/config.md")
+        self.fs.touch("docs/readme.md")
+        
+        self.assertEqual(self.fs.find("config", "/"), ["/docs/config.md", "/src/app/config.py"])
+        self.assertEqual(self.fs.find("config", "/src"), ["/src/app/config.py"])
+        self.assertEqual(self.fs.find(".md", "/docs"), ["/docs/config.md", "/docs/readme.md"])
+        self.assertEqual(self.fs.find("config", "/", exact=True), [])
+        self.assertEqual(self.fs.find("config.md", "/", exact=True), ["/docs/config.md"])
+    
+    def test_name_index_follows_mutations(self):
+        """Test index nama ikut diperbarui oleh cp/mv/rm dan rollback"""
+        self.fs.mkdir("a")
+        self.fs.touch("a/target.txt")
+        self.fs.cp("a", "b", recursive=True)
+        self.fs.mv("b/target.txt", "b/renamed.txt")
+        self.assertEqual(self.fs.find("target", "/"), ["/a/target.txt"])
+        self.assertEqual(self.fs.find("renamed", "/"), ["/b/renamed.txt"])
+        
+        self.fs.rm("a", recursive=True)
+        self.assertEqual(self.fs.find("target", "/"), [])
+        
+        with self.assertRaises(RuntimeError):
+            with self.fs.transaction():
+                self.fs.mv("b/renamed.txt", "b/other.txt")
+                raise RuntimeError("abort")
+        self.assertEqual(self.fs.find("renamed", "/"), ["/b/renamed.txt"])
+        self.assertEqual(self.fs.find("other", "/"), [])
+        
+        index = NameIndex()
+        index.build((ino, node.name) for ino, node in self.fs.inodes.items() if ino != 1)
+        self.assertEqual(index.by_name, self.fs.name_index.by_name)
+        self.assertEqual(index.by_trigram, self.fs.name_index.by_trigram)
+    
+    def test_iter_find_patterns_and_depth(self):
+        """Test iter_find dengan glob, regex, depth dan prune"""
+        self.fs.mkdir("src/pkg/deep", recursive=True)
+        self.fs.mkdir("src/build", recursive=True)
+        self.fs.touch("src/main.py")
+        self.fs.touch("src/pkg/util.py")
+        self.fs.touch("src/pkg/deep/core.py")
+        self.fs.touch("src/build/gen.py")
+        
+        self.assertEqual(list(self.fs.iter_find("/src", name="*.py")),
+                         ["/src/build/gen.py", "/src/main.py",
+                          "/src/pkg/deep/core.py", "/src/pkg/util.py"])
+        self.assertEqual(list(self.fs.iter_find("/src", name="*.py", maxdepth=2)),
+                         ["/src/build/gen.py", "/src/main.py", "/src/pkg/util.py"])
+        self.assertEqual(list(self.fs.iter_find("/src", mindepth=3)),
+                         ["/src/pkg/deep/core.py"])
+        self.assertEqual(list(self.fs.iter_find("/src", name="*.py", prune=["build"])),
+                         ["/src/main.py", "/src/pkg/deep/core.py", "/src/pkg/util.py"])
+        self.assertEqual(list(self.fs.iter_find("/", regex=r"/src/pkg/[a-z]+\.py")),
+                         ["/src/pkg/util.py"])
+    
+    def test_iter_find_is_lazy(self):
+        """Test iter_find berhenti setelah N hasil tanpa walk penuh"""
+        self.fs.mkdir("many")
+        with self.fs.transaction():
+            for i in range(100):
+                self.fs.touch(f"many/f{i:03d}.txt")
+        
+        visited = []
+        original_get = self.fs.inodes.get
+        
+        class CountingInodes(dict):
+            def get(inner_self, key, default=None):
+                visited.append(key)
+                return original_get(key, default)
+        
+        self.fs.inodes = CountingInodes(self.fs.inodes)
+        first = list(itertools.islice(self.fs.iter_find("/many", name="*.txt"), 3))
+        self.assertEqual(first, ["/many/f000.txt", "/many/f001.txt", "/many/f002.txt"])
+        self.assertLess(len(visited), 10)
+    
+    def assertTreeStatsConsistent(self):
+        """Bandingkan agregat inkremental dengan hasil hitung ulang penuh"""
+        incremental = {ino: (node.tree_size, node.tree_count)
+                       for ino, node in self.fs.inodes.items() if node.kind == DIRECTORY}
+        self.fs.recompute_tree_stats()
+        recomputed = {ino: (node.tree_size, node.tree_count)
+                      for ino, node in self.fs.inodes.items() if node.kind == DIRECTORY}
+        self.assertEqual(incremental, recomputed)
+        self.assertEqual(self.fs.inodes[1].tree_size, self.fs.used_space)
+    
+    def test_directory_sizes_maintained(self):
+        """Test ukuran dan jumlah entry directory diperbarui per operasi"""
+        self.fs.mkdir("proj/src", recursive=True)
+        self.fs.touch("proj/src/a.py", size=100)
+        self.fs.touch("proj/readme.md", size=20)
+        self.assertEqual(self.fs.file_system["/proj"]["tree_size"], 120)
+        self.assertEqual(self.fs.file_system["/proj"]["tree_count"], 3)
+        self.assertTreeStatsConsistent()
+        
+        self.fs.cp("proj", "copy", recursive=True)
+        self.fs.mkdir("archive")
+        self.fs.mv("copy", "archive/copy")
+        self.assertEqual(self.fs.file_system["/archive"]["tree_size"], 120)
+        self.assertEqual(self.fs.file_system["/archive"]["tree_count"], 4)
+        self.assertTreeStatsConsistent()
+        
+        self.fs.rm("proj/src", recursive=True)
+        self.assertEqual(self.fs.file_system["/proj"]["tree_size"], 20)
+        self.assertTreeStatsConsistent()
+    
+    def test_du(self):
+        """Test du -s dan du -d dari agregat directory"""
+        self.fs.mkdir("logs/2024/01", recursive=True)
+        self.fs.touch("logs/2024/01/app.log", size=300)
+        self.fs.touch("logs/index.txt", size=5)
+        
+        self.assertEqual(self.fs.du("logs", summarize=True),
+                         [{"path": "/logs", "size": 305, "entries": 4}])
+        self.assertEqual([item["path"] for item in self.fs.du("/", max_depth=2)],
+                         ["/logs/2024", "/logs", "/"])
+        self.assertEqual(self.fs.du("missing"), [])
+    
     def test_disk_space_limit(self):
         """Test disk space limitation"""
         # Try to create file larger than disk
@@ -152,6 +437,42 @@ class TestFileSystemSimulator(unittest.TestCase):
         self.assertTrue(self.fs.touch("/absolute_file.txt"))
         self.assertTrue(self.fs.path_exists("/absolute_file.txt"))
     
+    def test_path_normalization(self):
+        """Test '.', '..', slash ganda dan trailing slash dinormalisasi"""
+        self.fs.mkdir("a")
+        self.fs.mkdir("b")
+        self.assertTrue(self.fs.touch("/a/../b//file.txt"))
+        self.assertTrue(self.fs.path_exists("/b/file.txt"))
+        self.assertEqual(sorted(self.fs.file_system), ["/", "/a", "/b", "/b/file.txt"])
+        
+        self.fs.cd("a")
+        self.assertEqual(self.fs.get_absolute_path("./../b/"), "/b")
+        self.assertEqual(self.fs.get_absolute_path("../../.."), "/")
+        self.assertTrue(self.fs.cd("../b"))
+        self.assertEqual(self.fs.current_directory, "/b")
+        self.assertFalse(self.fs.mkdir("."))
+    
+    def test_path_cache_invalidation(self):
+        """Test cache resolusi path di-invalidasi saat rename/delete"""
+        self.fs.mkdir("x/y", recursive=True)
+        self.assertTrue(self.fs.path_exists("/x/y"))
+        hits = self.fs.path_cache_hits
+        self.assertTrue(self.fs.path_exists("/x/y"))
+        self.assertEqual(self.fs.path_cache_hits, hits + 1)
+        
+        self.fs.mv("x", "z")
+        self.assertFalse(self.fs.path_exists("/x/y"))
+        self.assertTrue(self.fs.path_exists("/z/y"))
+        
+        self.fs.rm("z", recursive=True)
+        self.assertFalse(self.fs.path_exists("/z/y"))
+        
+        self.fs.path_cache_size = 2
+        for name in ("p", "q", "r"):
+            self.fs.mkdir(name)
+            self.fs.path_exists(name)
+        self.assertLessEqual(len(self.fs._path_cache), 2)
+    
     def test_pwd(self):
         """Test pwd functionality"""
         self.assertEqual(self.fs.pwd(), "/")
@@ -196,9 +517,1687 @@ class TestFileSystemSimulator(unittest.TestCase):
         self.assertEqual(fs2.current_directory, "/persist_dir")
         self.assertEqual(fs2.used_space, 500)
 
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=100, journal=True)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_mutation_appends_record(self):
+        """Test mutasi hanya menambah record journal"""
+        self.fs.mkdir("logs")
+        self.fs.touch("logs/a.txt", size=10)
+        self.assertFalse(os.path.exists("filesystem_data.simfs"))
+        with open("filesystem_data.journal") as f:
+            self.assertEqual(len(f.readlines()), 2)
+    
+    def test_replay_on_load(self):
+        """Test load_filesystem replay journal di atas checkpoint"""
+        self.fs.mkdir("logs")
+        self.fs.save_filesystem()
+        self.fs.touch("logs/a.txt", size=10)
+        self.fs.rm("logs/a.txt")
+        self.fs.touch("logs/b.txt", size=20)
+        self.fs.cd("logs")
+        
+        fs2 = FileSystemSimulator(journal=True)
+        self.assertTrue(fs2.path_exists("/logs/b.txt"))
+        self.assertFalse(fs2.path_exists("/logs/a.txt"))
+        self.assertEqual(fs2.file_system["/logs"]["children"], {"b.txt": "/logs/b.txt"})
+        self.assertEqual(fs2.current_directory, "/logs")
+        self.assertEqual(fs2.used_space, 20)
+    
+    def test_checkpoint_folds_journal(self):
+        """Test journal dilipat ke checkpoint setiap checkpoint_interval"""
+        self.fs.checkpoint_interval = 3
+        for i in range(3):
+            self.fs.touch(f"file{i}.txt")
+        self.assertTrue(os.path.exists("filesystem_data.simfs"))
+        self.assertFalse(os.path.exists("filesystem_data.journal"))
+        
+        fs2 = FileSystemSimulator(journal=True)
+        self.assertTrue(fs2.path_exists("/file2.txt"))
+    
+    def test_torn_record_ignored(self):
+        """Test record terakhir yang terpotong diabaikan saat replay"""
+        self.fs.touch("ok.txt")
+        with open("filesystem_data.journal", "a") as f:
+            f.write('{"set": {"/bad')
+        fs2 = FileSystemSimulator(journal=True)
+        self.assertTrue(fs2.path_exists("/ok.txt"))
+        self.assertFalse(fs2.path_exists("/bad"))
+
+class TestTransaction(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=100)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_commit_writes_once(self):
+        """Test transaksi hanya menulis filesystem sekali saat commit"""
+        saves = []
+        original_save = self.fs.save_filesystem
+        self.fs.save_filesystem = lambda: (saves.append(1), original_save())
+        
+        with self.fs.transaction():
+            self.fs.mkdir("batch")
+            for i in range(50):
+                self.fs.touch(f"batch/file{i}.txt", size=1)
+            self.assertFalse(os.path.exists("filesystem_data.simfs"))
+        
+        self.assertEqual(len(saves), 1)
+        fs2 = FileSystemSimulator()
+        self.assertTrue(fs2.path_exists("/batch/file49.txt"))
+        self.assertEqual(fs2.used_space, 50)
+    
+    def test_commit_single_journal_record(self):
+        """Test transaksi di journal mode menghasilkan satu record"""
+        fs = FileSystemSimulator(journal=True)
+        with fs.transaction():
+            fs.mkdir("a")
+            fs.touch("a/x.txt")
+            fs.cp("a/x.txt", "a/y.txt")
+        with open("filesystem_data.journal") as f:
+            self.assertEqual(len(f.readlines()), 1)
+    
+    def test_rollback_on_exception(self):
+        """Test state in-memory di-rollback jika terjadi exception"""
+        self.fs.mkdir("keep")
+        self.fs.touch("keep/old.txt", size=5)
+        
+        with self.assertRaises(RuntimeError):
+            with self.fs.transaction():
+                self.fs.touch("keep/new.txt", size=10)
+                self.fs.rm("keep/old.txt")
+                self.fs.mkdir("gone")
+                raise RuntimeError("abort")
+        
+        self.assertTrue(self.fs.path_exists("/keep/old.txt"))
+        self.assertFalse(self.fs.path_exists("/keep/new.txt"))
+        self.assertFalse(self.fs.path_exists("/gone"))
+        self.assertEqual(self.fs.file_system["/keep"]["children"], {"old.txt": "/keep/old.txt"})
+        self.assertEqual(self.fs.used_space, 5)
+
+class TestBinarySnapshot(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def build_tree(self, fs):
+        fs.mkdir("proj/src", recursive=True)
+        fs.touch("proj/src/main.py", size=120)
+        fs.touch("proj/ÄÖ notes.txt", size=7)
+        fs.cd("proj/src")
+    
+    def test_binary_roundtrip(self):
+        """Test save/load format biner dipilih otomatis dari ekstensi"""
+        fs = FileSystemSimulator(data_file="image.simfs")
+        self.build_tree(fs)
+        self.assertTrue(binary_snapshot.is_binary_snapshot("image.simfs"))
+        
+        fs2 = FileSystemSimulator(data_file="image.simfs")
+        self.assertEqual({ino: node.to_dict() for ino, node in fs2.inodes.items()},
+                         {ino: node.to_dict() for ino, node in fs.inodes.items()})
+        self.assertEqual(fs2.current_directory, "/proj/src")
+        self.assertEqual(fs2.used_space, 127)
+        self.assertEqual(fs2.next_inode, fs.next_inode)
+    
+    def test_load_detects_format(self):
+        """Test load mengenali file biner walau ekstensinya .json"""
+        fs = FileSystemSimulator()
+        self.build_tree(fs)
+        fs.export_snapshot("filesystem_data.json", "binary")
+        
+        fs2 = FileSystemSimulator()
+        self.assertEqual(fs2.snapshot_format, "binary")
+        self.assertTrue(fs2.path_exists("/proj/src/main.py"))
+    
+    def test_default_is_binary_and_migrates_json(self):
+        """Test data_file default biner; checkpoint JSON lama dimuat lalu disimpan biner"""
+        legacy = FileSystemSimulator(data_file="filesystem_data.json")
+        self.build_tree(legacy)
+        
+        fs = FileSystemSimulator()
+        self.assertEqual(fs.data_file, "filesystem_data.simfs")
+        self.assertTrue(fs.path_exists("/proj/src/main.py"))
+        self.assertEqual(fs.current_directory, "/proj/src")
+        fs.touch("/new.txt")
+        self.assertTrue(binary_snapshot.is_binary_snapshot("filesystem_data.simfs"))
+        
+        fs2 = FileSystemSimulator()
+        self.assertTrue(fs2.path_exists("/new.txt"))
+        self.assertEqual(fs2.used_space, 127)
+        with open("filesystem_data.json") as f:
+            self.assertNotIn("new.txt", f.read())
+    
+    def test_convert_between_formats(self):
+        """Test converter JSON -> biner -> JSON"""
+        fs = FileSystemSimulator(data_file="source.json")
+        self.build_tree(fs)
+        
+        binary_snapshot.convert("source.json", "image.simfs")
+        binary_snapshot.convert("image.simfs", "back.json")
+        with open("source.json") as f:
+            original = json.load(f)
+        with open("back.json") as f:
+            converted = json.load(f)
+        self.assertEqual(converted, original)
+    
+    def test_import_snapshot(self):
+        """Test import snapshot JSON ke filesystem berformat biner"""
+        source = FileSystemSimulator(data_file="source.json")
+        self.build_tree(source)
+        
+        fs = FileSystemSimulator(data_file="image.simfs")
+        self.assertTrue(fs.import_snapshot("source.json"))
+        self.assertEqual(fs.find("main", "/"), ["/proj/src/main.py"])
+        self.assertTrue(binary_snapshot.is_binary_snapshot("image.simfs"))
+
+class TestDiskImage(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def open_fs(self):
+        return FileSystemSimulator(disk_size=16, storage="image")
+    
+    def test_image_size_from_disk_size(self):
+        """Test ukuran image mengikuti disk_size"""
+        fs = self.open_fs()
+        self.assertEqual(fs.data_file, "filesystem_data.img")
+        self.assertEqual(os.path.getsize("filesystem_data.img"), 16 * 1024 * 1024)
+        self.assertEqual(fs.df()["total"], 16 * 1024 * 1024)
+        fs.close()
+    
+    def test_persist_and_lazy_reopen(self):
+        """Test data tersimpan di image dan inode dibaca malas"""
+        fs = self.open_fs()
+        fs.mkdir("a/b", recursive=True)
+        fs.touch("a/b/file.txt", size=42)
+        fs.cd("a")
+        fs.close()
+        
+        fs = self.open_fs()
+        self.assertEqual(fs.inodes.cached_count, 0)
+        self.assertEqual(fs.pwd(), "/a")
+        self.assertEqual(fs.stat("b/file.txt")["size"], 42)
+        self.assertEqual(fs.used_space, 42)
+        self.assertEqual(fs.du("/", summarize=True)[0]["entries"], 3)
+        fs.close()
+    
+    def test_permissions_survive_reopen(self):
+        """Test permission dari field berukuran tetap tidak membawa padding NUL"""
+        fs = self.open_fs()
+        fs.mkdir("docs")
+        fs.touch("docs/file.txt")
+        expected = {path: fs.stat(path)["permissions"] for path in ("docs", "docs/file.txt")}
+        fs.close()
+        
+        fs = self.open_fs()
+        for path, permissions in expected.items():
+            self.assertEqual(fs.stat(path)["permissions"], permissions)
+        fs.close()
+    
+    def test_remove_frees_inodes_and_blocks(self):
+        """Test rm membebaskan slot inode dan data blocks"""
+        fs = self.open_fs()
+        free_blocks = fs.image.free_block_count()
+        fs.mkdir("tmp")
+        for i in range(50):
+            fs.touch(f"tmp/file{i}.txt")
+        self.assertLess(fs.image.free_block_count(), free_blocks)
+        fs.rm("tmp", recursive=True)
+        self.assertEqual(fs.image.free_block_count(), free_blocks)
+        self.assertEqual(list(fs.inodes), [1])
+        fs.close()
+    
+    def test_rollback_releases_inodes(self):
+        """Test inode dari transaksi yang gagal tidak bocor"""
+        fs = self.open_fs()
+        with self.assertRaises(RuntimeError):
+            with fs.transaction():
+                fs.touch("temp.txt")
+                raise RuntimeError("abort")
+        fs.touch("keep.txt")
+        self.assertEqual(len(fs.inodes), 2)
+        fs.close()
+        
+        fs = self.open_fs()
+        self.assertEqual(fs.ls("/"), ["keep.txt"])
+        fs.close()
+    
+    def test_export_and_import(self):
+        """Test konversi antara disk image dan snapshot JSON"""
+        fs = self.open_fs()
+        fs.mkdir("docs")
+        fs.touch("docs/readme.md", size=10)
+        self.assertTrue(fs.export_snapshot("export.json"))
+        fs.close()
+        
+        other = FileSystemSimulator(disk_size=16, data_file="other.img", storage="image")
+        self.assertTrue(other.import_snapshot("export.json"))
+        other.close()
+        other = FileSystemSimulator(disk_size=16, data_file="other.img", storage="image")
+        self.assertEqual(other.find("readme", "/"), ["/docs/readme.md"])
+        other.close()
+
+class TestFileContent(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=10)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_write_read_append(self):
+        """Test write, read dengan offset, dan append"""
+        self.assertTrue(self.fs.write("note.txt", "hello world"))
+        self.assertEqual(self.fs.read("note.txt"), b"hello world")
+        self.assertTrue(self.fs.write("note.txt", b"WORLD", offset=6))
+        self.assertTrue(self.fs.append("note.txt", "!"))
+        self.assertEqual(self.fs.read("note.txt"), b"hello WORLD!")
+        self.assertEqual(self.fs.read("note.txt", offset=6, length=3), b"WOR")
+        self.assertEqual(self.fs.used_space, 12)
+        self.assertEqual(self.fs.stat("note.txt")["size"], 12)
+        self.assertIsNone(self.fs.read("missing.txt"))
+    
+    def test_streaming_across_chunks(self):
+        """Test stream besar ditulis dan dibaca per chunk"""
+        data = bytes(range(256)) * (CHUNK_SIZE // 256 * 3 + 10)
+        self.assertTrue(self.fs.write("big.bin", io.BytesIO(data)))
+        pieces = list(self.fs.read_stream("big.bin"))
+        self.assertTrue(all(len(piece) <= CHUNK_SIZE for piece in pieces))
+        self.assertEqual(b"".join(pieces), data)
+        self.assertEqual(self.fs.used_space, len(data))
+        
+        # Tulis melintasi batas chunk tanpa mengubah byte lain
+        self.fs.write("big.bin", b"x" * 10, offset=CHUNK_SIZE - 5)
+        expected = data[:CHUNK_SIZE - 5] + b"x" * 10 + data[CHUNK_SIZE + 5:]
+        self.assertEqual(self.fs.read("big.bin"), expected)
+    
+    def test_truncate_and_holes(self):
+        """Test truncate memotong isi dan bagian baru terbaca sebagai nol"""
+        self.fs.write("data.bin", b"abcdef")
+        self.assertTrue(self.fs.truncate("data.bin", 3))
+        self.assertTrue(self.fs.truncate("data.bin", 5))
+        self.assertEqual(self.fs.read("data.bin"), b"abc\0\0")
+        self.fs.write("data.bin", b"z", offset=8)
+        self.assertEqual(self.fs.read("data.bin"), b"abc\0\0\0\0\0z")
+        self.assertEqual(self.fs.used_space, 9)
+    
+    def test_content_persisted_outside_metadata(self):
+        """Test isi file tersimpan di chunk store dan bertahan setelah reload"""
+        self.fs.mkdir("docs")
+        self.fs.write("docs/a.txt", "persisted")
+        with open("filesystem_data.simfs", "rb") as f:
+            self.assertNotIn(b"persisted", f.read())
+        self.assertTrue(os.path.isdir("filesystem_data.chunks"))
+        
+        fs2 = FileSystemSimulator(disk_size=10)
+        self.assertEqual(fs2.read("docs/a.txt"), b"persisted")
+        self.assertEqual(fs2.file_system["/docs/a.txt"]["content"], "persisted")
+    
+    def test_entry_view_length(self):
+        """Test len() view file_system sama dengan jumlah key yang terlihat"""
+        self.fs.mkdir("docs")
+        self.fs.write("docs/a.txt", "x")
+        for path in ("/docs", "/docs/a.txt", "/"):
+            view = self.fs.file_system[path]
+            self.assertEqual(len(view), len(dict(view)))
+            self.assertEqual(len(view), len(list(view)))
+        self.assertEqual(len(self.fs.file_system["/docs"]), 9)
+    
+    def chunk_files(self):
+        return [name for _, _, names in os.walk("filesystem_data.chunks")
+                for name in names if name != "refs.json"]
+    
+    def test_copy_and_remove_content(self):
+        """Test cp menyalin isi dan rm membebaskan chunk"""
+        self.fs.write("a.txt", "original")
+        self.fs.cp("a.txt", "b.txt")
+        self.fs.write("b.txt", "changed!")
+        self.assertEqual(self.fs.read("a.txt"), b"original")
+        self.assertEqual(self.fs.read("b.txt"), b"changed!")
+        
+        self.fs.rm("a.txt")
+        self.fs.rm("b.txt")
+        self.assertEqual(self.chunk_files(), [])
+    
+    def test_cp_shares_chunks(self):
+        """Test cp -r hanya menambah reference count (tanpa salin byte)"""
+        data = os.urandom(CHUNK_SIZE * 2 + 100)
+        self.fs.mkdir("template")
+        self.fs.write("template/blob.bin", data)
+        self.assertEqual(len(self.chunk_files()), 3)
+        
+        for i in range(3):
+            self.fs.cp("template", f"copy{i}", recursive=True)
+        self.assertEqual(len(self.chunk_files()), 3)
+        info = self.fs.df()
+        self.assertEqual(info["logical"], 4 * len(data))
+        self.assertEqual(info["physical"], len(data))
+        self.assertEqual(info["saved"], 3 * len(data))
+        
+        # Tulisan pertama ke salinan: copy-on-write hanya untuk chunk yang diubah
+        self.fs.write("copy0/blob.bin", b"!", offset=0)
+        self.assertEqual(self.fs.read("template/blob.bin"), data)
+        self.assertEqual(self.fs.read("copy0/blob.bin"), b"!" + data[1:])
+        self.assertEqual(len(self.chunk_files()), 4)
+        
+        self.fs.rm("template", recursive=True)
+        self.fs.rm("copy1", recursive=True)
+        self.fs.rm("copy2", recursive=True)
+        self.assertEqual(self.fs.read("copy0/blob.bin"), b"!" + data[1:])
+        self.assertEqual(self.fs.df()["physical"], len(data))
+    
+    def test_df_counts_pending_refs_and_holes(self):
+        """Test df di dalam transaksi melihat chunk baru dan hole tidak dihitung saved"""
+        data = os.urandom(5000)
+        self.fs.touch("sparse.bin", CHUNK_SIZE * 3)
+        with self.fs.transaction():
+            self.fs.write("a.bin", data)
+            self.fs.cp("a.bin", "b.bin")
+            info = self.fs.df()
+            self.assertEqual(info["physical"], len(data))
+            self.assertEqual(info["saved"], len(data))
+            self.assertEqual(info["sparse"], CHUNK_SIZE * 3)
+            self.fs.rm("a.bin")
+            self.fs.rm("b.bin")
+            self.assertEqual(self.fs.df()["physical"], 0)
+        
+        self.fs.write("sparse.bin", b"x", offset=CHUNK_SIZE)
+        info = self.fs.df()
+        self.assertEqual(info["physical"], CHUNK_SIZE)
+        self.assertEqual(info["sparse"], CHUNK_SIZE * 2)
+        self.assertEqual(info["saved"], 0)
+    
+    def test_sparse_counter_matches_scan(self):
+        """Test sparse_space dijaga per operasi dan sama dengan hitung ulang penuh"""
+        fs = self.fs
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs.touch("hole.bin", CHUNK_SIZE * 2 + 10)
+            fs.write("hole.bin", b"abc", offset=CHUNK_SIZE + 5)
+            fs.write("tail.bin", io.BytesIO(os.urandom(CHUNK_SIZE + 100)), offset=50)
+            fs.truncate("tail.bin", CHUNK_SIZE + 20)
+            fs.truncate("tail.bin", CHUNK_SIZE * 3)
+            fs.append("tail.bin", "end")
+            fs.snapshot_create("s1")
+            fs.cp("hole.bin", "copy.bin")
+            fs.truncate("hole.bin", 7)
+            fs.rm("tail.bin")
+            with self.assertRaises(RuntimeError):
+                with fs.transaction():
+                    fs.touch("temp.bin", 500)
+                    fs.truncate("copy.bin", 0)
+                    raise RuntimeError("abort")
+            self.assertEqual(fs.sparse_space, fs._scan_sparse())
+            fs.snapshot_restore("s1")
+        self.assertEqual(fs.sparse_space, fs._scan_sparse())
+        self.assertGreater(fs.sparse_space, 0)
+        
+        for snapshot_format in ("json", "binary"):
+            fs.snapshot_format = snapshot_format
+            fs.save_filesystem()
+            reloaded = FileSystemSimulator(disk_size=10)
+            self.assertEqual(reloaded.sparse_space, fs.sparse_space)
+    
+    def test_failed_write_keeps_chunks_of_earlier_write(self):
+        """Test rollback savepoint tidak menghapus chunk yang dipakai write sebelumnya"""
+        data = os.urandom(CHUNK_SIZE)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            with self.fs.transaction():
+                self.fs.write("/a", data)
+                self.fs.write("/b", io.BytesIO(data + b"x" * (10 * 1024 * 1024)))
+        self.assertIn("Not enough disk space", output.getvalue())
+        self.assertFalse(self.fs.path_exists("/b"))
+        self.assertEqual(self.fs.read("/a"), data)
+        self.assertEqual(len(self.chunk_files()), 1)
+        
+        reloaded = FileSystemSimulator(disk_size=10)
+        self.assertEqual(reloaded.read("/a"), data)
+    
+    def test_identical_content_deduplicated(self):
+        """Test isi yang sama disimpan sekali dan refcount bertahan setelah reload"""
+        self.fs.write("a.txt", "same content")
+        self.fs.write("b.txt", "same content")
+        self.assertEqual(len(self.chunk_files()), 1)
+        
+        fs2 = FileSystemSimulator(disk_size=10)
+        fs2.rm("a.txt")
+        self.assertEqual(fs2.read("b.txt"), b"same content")
+        fs2.rm("b.txt")
+        self.assertEqual(self.chunk_files(), [])
+    
+    def test_rollback_restores_content(self):
+        """Test rollback mengembalikan isi dan ukuran file"""
+        self.fs.write("a.txt", "before")
+        with self.assertRaises(RuntimeError):
+            with self.fs.transaction():
+                self.fs.write("a.txt", "after!!")
+                raise RuntimeError("abort")
+        self.assertEqual(self.fs.read("a.txt"), b"before")
+        self.assertEqual(self.fs.used_space, 6)
+    
+    def test_disk_full(self):
+        """Test write ditolak jika disk penuh"""
+        fs = FileSystemSimulator(disk_size=1, data_file="small.json")
+        self.assertFalse(fs.write("big.bin", b"x" * (2 * 1024 * 1024)))
+        self.assertFalse(fs.write("big.bin", io.BytesIO(b"x" * (2 * 1024 * 1024))))
+        self.assertFalse(fs.path_exists("/big.bin"))
+        self.assertEqual(fs.used_space, 0)
+    
+    def test_image_backend_content(self):
+        """Test isi file pada backend disk image"""
+        fs = FileSystemSimulator(disk_size=16, storage="image")
+        fs.write("a.txt", "image content")
+        fs.close()
+        fs = FileSystemSimulator(disk_size=16, storage="image")
+        self.assertEqual(fs.read("a.txt"), b"image content")
+        fs.close()
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=10)
+        self.fs.mkdir("docs")
+        self.fs.write("docs/a.txt", "version 1")
+        self.fs.touch("docs/b.txt")
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_create_is_copy_on_write(self):
+        """Test snapshot tidak menyalin inode sampai ada perubahan"""
+        self.assertTrue(self.fs.snapshot_create("s1"))
+        snapshot = self.fs.snapshots.latest
+        self.assertEqual(snapshot.delta, {})
+        self.assertFalse(self.fs.snapshot_create("s1"))
+        
+        self.fs.write("docs/a.txt", "version 2!")
+        # Hanya file dan ancestor-nya (ukuran agregat berubah) yang disalin
+        self.assertEqual(set(snapshot.delta), {self.fs._lookup("/docs/a.txt"),
+                                               self.fs._lookup("/docs"), 1})
+        self.assertEqual(self.fs.snapshot_list()[0]["changes"], 3)
+    
+    def test_restore(self):
+        """Test restore mengembalikan struktur, isi, dan used_space"""
+        self.fs.snapshot_create("before")
+        self.fs.write("docs/a.txt", "version 2 is longer")
+        self.fs.rm("docs/b.txt")
+        self.fs.mkdir("new")
+        self.fs.mv("docs", "new/docs")
+        
+        self.assertTrue(self.fs.snapshot_restore("before"))
+        self.assertEqual(self.fs.ls("/"), ["docs/"])
+        self.assertEqual(self.fs.ls("/docs"), ["a.txt", "b.txt"])
+        self.assertEqual(self.fs.read("docs/a.txt"), b"version 1")
+        self.assertEqual(self.fs.used_space, 9)
+        self.assertEqual(self.fs.du("/", summarize=True)[0]["size"], 9)
+        self.assertEqual(self.fs.find("a.txt", "/", exact=True), ["/docs/a.txt"])
+        self.assertFalse(self.fs.snapshot_restore("missing"))
+    
+    def test_diff(self):
+        """Test diff antara snapshot dan state live/snapshot lain"""
+        self.fs.snapshot_create("s1")
+        self.fs.write("docs/a.txt", "version 2")
+        self.fs.touch("docs/c.txt")
+        self.fs.snapshot_create("s2")
+        self.fs.rm("docs/b.txt")
+        self.fs.mv("docs/c.txt", "c.txt")
+        
+        self.assertEqual(self.fs.snapshot_diff("s1", "s2"),
+                         [("M", "/docs/a.txt"), ("A", "/docs/c.txt")])
+        self.assertEqual(self.fs.snapshot_diff("s1"),
+                         [("A", "/c.txt"), ("M", "/docs/a.txt"), ("D", "/docs/b.txt")])
+        self.assertEqual(self.fs.snapshot_diff("s2"),
+                         [("D", "/docs/b.txt"), ("R", "/docs/c.txt -> /c.txt")])
+    
+    def test_snapshot_keeps_content_alive(self):
+        """Test chunk yang dipakai snapshot tidak dihapus saat file dihapus"""
+        self.fs.snapshot_create("s1")
+        self.fs.rm("docs", recursive=True)
+        self.fs.snapshot_restore("s1")
+        self.assertEqual(self.fs.read("docs/a.txt"), b"version 1")
+        
+        self.fs.rm("docs", recursive=True)
+        self.assertTrue(self.fs.snapshot_delete("s1"))
+        self.assertEqual(self.fs.chunk_store.physical_bytes, 0)
+    
+    def test_persisted_across_reload(self):
+        """Test snapshot dan delta-nya bertahan setelah reload"""
+        self.fs.snapshot_create("s1")
+        self.fs.write("docs/a.txt", "version 2")
+        self.fs.snapshot_create("s2")
+        self.fs.rm("docs/b.txt")
+        
+        fs2 = FileSystemSimulator(disk_size=10)
+        self.assertEqual([info["name"] for info in fs2.snapshot_list()], ["s1", "s2"])
+        self.assertTrue(fs2.snapshot_restore("s1"))
+        self.assertEqual(fs2.read("docs/a.txt"), b"version 1")
+        self.assertTrue(fs2.path_exists("/docs/b.txt"))
+    
+    def test_delete_merges_delta(self):
+        """Test hapus snapshot tengah tidak merusak snapshot sebelumnya"""
+        self.fs.snapshot_create("s1")
+        self.fs.write("docs/a.txt", "version 2")
+        self.fs.snapshot_create("s2")
+        self.fs.write("docs/a.txt", "version 3")
+        self.fs.rm("docs/b.txt")
+        
+        self.assertTrue(self.fs.snapshot_delete("s2"))
+        self.assertEqual([snapshot.name for snapshot in self.fs.snapshots.snapshots], ["s1"])
+        self.fs.snapshot_restore("s1")
+        self.assertEqual(self.fs.read("docs/a.txt"), b"version 1")
+        self.assertTrue(self.fs.path_exists("/docs/b.txt"))
+    
+    def test_rollback_discards_preimages(self):
+        """Test pre-image dari transaksi yang gagal tidak tersimpan"""
+        self.fs.snapshot_create("s1")
+        with self.assertRaises(RuntimeError):
+            with self.fs.transaction():
+                self.fs.touch("docs/temp.txt")
+                raise RuntimeError("abort")
+        self.assertEqual(self.fs.snapshots.latest.delta, {})
+
+class TestShardedStore(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def open_fs(self, memory_limit=64 * 1024 * 1024):
+        return FileSystemSimulator(disk_size=16, storage="sharded",
+                                   shard_memory_limit=memory_limit)
+    
+    def build_tree(self):
+        fs = self.open_fs()
+        for d in range(10):
+            fs.mkdir(f"d{d}/sub", recursive=True)
+            for i in range(5):
+                fs.touch(f"d{d}/f{i}", size=i)
+        fs.write("d3/sub/x.txt", "hello")
+        return fs
+    
+    def test_cold_start_reads_only_meta(self):
+        """Test membuka store hanya memuat meta.json dan shard root"""
+        self.build_tree()
+        fs = self.open_fs()
+        self.assertEqual(fs.data_file, "filesystem_data.shards")
+        self.assertEqual(fs.shards.loads, 1)
+        self.assertEqual(fs.used_space, 105)
+        self.assertEqual(fs.du("/", summarize=True)[0]["entries"], 71)
+        self.assertEqual(fs.shards.loads, 1)
+    
+    def test_df_reads_only_meta(self):
+        """Test df memakai sparse_space dari meta.json tanpa memuat shard"""
+        self.build_tree()
+        fs = self.open_fs()
+        self.assertEqual(fs.df()["sparse"], 100)
+        self.assertEqual(fs.shards.loads, 1)
+    
+    def test_lazy_load_along_path(self):
+        """Test hanya shard di sepanjang path yang dimuat"""
+        self.build_tree()
+        fs = self.open_fs()
+        self.assertEqual(fs.read("d3/sub/x.txt"), b"hello")
+        self.assertEqual(fs.shards.loads, 3)
+        self.assertEqual(fs.shards.resident_shards, 3)
+    
+    def test_eviction_under_memory_limit(self):
+        """Test shard bersih dibuang saat melewati batas memori"""
+        self.build_tree()
+        fs = self.open_fs(memory_limit=10 * ENTRY_COST)
+        self.assertEqual(len(list(fs.file_system)), 72)
+        self.assertGreater(fs.shards.evictions, 0)
+        self.assertLessEqual(fs.shards.resident_entries * ENTRY_COST, 10 * ENTRY_COST)
+        self.assertEqual(fs.stat("d9/f4")["size"], 4)
+    
+    def test_persist_moves_copies_and_removes(self):
+        """Test mv, cp -r dan rm -r tersimpan setelah reload"""
+        fs = self.build_tree()
+        fs.mv("d3/sub", "d7/moved")
+        fs.cp("d1", "d9/copy", recursive=True)
+        fs.rm("d2", recursive=True)
+        fs.cd("d7/moved")
+        expected = sorted(fs.file_system)
+        
+        fs = self.open_fs(memory_limit=10 * ENTRY_COST)
+        self.assertEqual(fs.pwd(), "/d7/moved")
+        self.assertEqual(fs.read("x.txt"), b"hello")
+        self.assertEqual(sorted(fs.file_system), expected)
+        self.assertEqual(fs.find("f4", "/d9"), ["/d9/copy/f4", "/d9/f4"])
+        self.assertFalse(os.path.exists(os.path.join("filesystem_data.shards", "10", "16.json")))
+    
+    def test_rollback_keeps_store_unchanged(self):
+        """Test transaksi yang gagal tidak mengubah shard di disk"""
+        fs = self.build_tree()
+        with self.assertRaises(RuntimeError):
+            with fs.transaction():
+                fs.rm("d4", recursive=True)
+                fs.touch("d5/temp.txt")
+                raise RuntimeError("abort")
+        self.assertTrue(fs.path_exists("/d4/f1"))
+        
+        fs = self.open_fs()
+        self.assertTrue(fs.path_exists("/d4/sub"))
+        self.assertFalse(fs.path_exists("/d5/temp.txt"))
+    
+    def test_write_rewrites_only_affected_shards(self):
+        """Test agregat ancestor ditulis ke index.bin, bukan ke shard ancestor"""
+        fs = self.open_fs()
+        fs.mkdir("a/b/c/d", recursive=True)
+        written = []
+        write_shard = fs.shards._write_shard
+        fs.shards._write_shard = lambda ino, shard: (written.append(ino),
+                                                     write_shard(ino, shard))
+        fs.write("a/b/c/d/f.txt", "hello")
+        # Shard d (entry baru) dan shard c (record d, modified berubah)
+        self.assertEqual(sorted(fs.inodes[ino].name for ino in written), ["c", "d"])
+        
+        fs = self.open_fs(memory_limit=2 * ENTRY_COST)
+        for path in ("/a", "/a/b", "/a/b/c"):
+            self.assertEqual(fs.stat(path)["tree_size"], 5)
+        self.assertEqual(fs.stat("/a")["tree_count"], 4)
+    
+    def test_locations_pruned_on_eviction_and_delete(self):
+        """Test lokasi entry tidak menumpuk dan dibaca ulang dari index.bin"""
+        self.build_tree()
+        fs = self.open_fs(memory_limit=10 * ENTRY_COST)
+        fs.snapshot_create("s1")
+        for d in range(10):
+            fs.rm(f"d{d}/f1")
+        self.assertGreater(fs.shards.evictions, 0)
+        self.assertLessEqual(len(fs.shards._parent_of), fs.shards.resident_entries)
+        self.assertEqual(len(fs.snapshot_diff("s1")), 10)
+        
+        self.assertTrue(fs.snapshot_restore("s1"))
+        self.assertEqual(fs.stat("d9/f1")["size"], 1)
+        self.assertEqual(fs.du("/", summarize=True)[0]["entries"], 71)
+    
+    def test_store_without_index_is_migrated(self):
+        """Test store lama (agregat di shard, tanpa index.bin) tetap terbaca"""
+        fs = self.build_tree()
+        for name in os.listdir("filesystem_data.shards"):
+            folder = os.path.join("filesystem_data.shards", name)
+            for shard_file in os.listdir(folder) if os.path.isdir(folder) else []:
+                path = os.path.join(folder, shard_file)
+                with open(path) as f:
+                    data = json.load(f)
+                for ino, entry in data["entries"].items():
+                    if entry["type"] == "directory":
+                        node = fs.inodes[int(ino)]
+                        entry["tree_size"], entry["tree_count"] = node.tree_size, node.tree_count
+                with open(path, "w") as f:
+                    json.dump(data, f)
+        os.remove(os.path.join("filesystem_data.shards", "index.bin"))
+        
+        fs = self.open_fs(memory_limit=10 * ENTRY_COST)
+        self.assertEqual(fs.stat("d3")["tree_size"], 15)
+        self.assertEqual(fs.du("/d3", summarize=True)[0]["entries"], 7)
+        self.assertTrue(os.path.exists(os.path.join("filesystem_data.shards", "index.bin")))
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=10, journal=True, thread_safe=True)
+        self.switch_interval = sys.getswitchinterval()
+        # Ganti thread sesering mungkin agar race condition muncul
+        sys.setswitchinterval(1e-5)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        sys.setswitchinterval(self.switch_interval)
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def run_threads(self, target, count):
+        errors = []
+        
+        def run(n):
+            try:
+                target(n)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(count)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(60)
+        self.assertFalse(any(thread.is_alive() for thread in threads), "deadlock")
+        self.assertEqual(errors, [])
+    
+    def assert_consistent(self):
+        fs = self.fs
+        files = [node for node in fs.inodes.values() if node.kind == FILE]
+        self.assertEqual(fs.used_space, sum(node.size for node in files))
+        reachable = fs._collect_subtree(1)
+        self.assertEqual(sorted(reachable), sorted(fs.inodes))
+        for ino in reachable[1:]:
+            node = fs.inodes[ino]
+            self.assertEqual(fs.inodes[node.parent].children[node.name], ino)
+        root = fs.inodes[1]
+        self.assertEqual((root.tree_size, root.tree_count), (fs.used_space, len(fs.inodes) - 1))
+    
+    def test_requires_snapshot_storage(self):
+        """Test thread_safe hanya untuk backend snapshot"""
+        with self.assertRaises(ValueError):
+            FileSystemSimulator(storage="image", thread_safe=True)
+    
+    def test_rwlock_readers_share_writer_waits(self):
+        """Test reader tidak saling memblokir, writer menunggu reader"""
+        lock = RWLock()
+        lock.acquire_read()
+        reader_done = threading.Event()
+        writer_done = threading.Event()
+        
+        def reader():
+            with lock.read():
+                reader_done.set()
+        
+        def writer():
+            with lock.write():
+                writer_done.set()
+        
+        threading.Thread(target=reader).start()
+        self.assertTrue(reader_done.wait(5))
+        threading.Thread(target=writer).start()
+        self.assertFalse(writer_done.wait(0.2))
+        lock.release_read()
+        self.assertTrue(writer_done.wait(5))
+    
+    def test_concurrent_mutations_stress(self):
+        """Test touch/mkdir/rm/mv/cp/truncate paralel bersama reader"""
+        for d in range(4):
+            self.fs.mkdir(f"/d{d}")
+        
+        def worker(n):
+            rnd = random.Random(n)
+            for i in range(150):
+                d = f"/d{rnd.randrange(4)}"
+                op = rnd.randrange(7)
+                if op == 0:
+                    self.fs.touch(f"{d}/f{n}_{i}", size=rnd.randrange(100))
+                elif op == 1:
+                    self.fs.mkdir(f"{d}/s{n}_{i}/x", recursive=True)
+                elif op == 2:
+                    names = self.fs.ls(d)
+                    if names:
+                        self.fs.rm(f"{d}/{names[0].rstrip('/')}", recursive=True, force=True)
+                elif op == 3:
+                    self.fs.mv(f"{d}/f{n}_{i - 1}", f"/d{rnd.randrange(4)}/m{n}_{i}")
+                elif op == 4:
+                    self.fs.cp(f"{d}/s{n}_{i - 3}", f"/d{rnd.randrange(4)}/c{n}_{i}", recursive=True)
+                elif op == 5:
+                    self.fs.du(d)
+                    self.fs.find("f", d)
+                else:
+                    self.fs.stat(d)
+                    self.fs.truncate(f"{d}/f{n}_{i - 2}", 5)
+        
+        self.run_threads(worker, 8)
+        self.assert_consistent()
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            reloaded = FileSystemSimulator(disk_size=10, journal=True)
+        self.assertEqual(sorted(reloaded.file_system), sorted(self.fs.file_system))
+        self.assertEqual(reloaded.used_space, self.fs.used_space)
+    
+    def test_crossing_moves_do_not_deadlock(self):
+        """Test mv berlawanan arah antar directory tidak deadlock"""
+        self.fs.mkdir("/a/x", recursive=True)
+        self.fs.mkdir("/b/y", recursive=True)
+        
+        def worker(n):
+            src, dst, name = ("/a", "/b", "x") if n % 2 == 0 else ("/b", "/a", "y")
+            for _ in range(100):
+                self.fs.mv(f"{src}/{name}", f"{dst}/{name}")
+                self.fs.mv(f"{dst}/{name}", f"{src}/{name}")
+        
+        self.run_threads(worker, 4)
+        self.assertEqual(self.fs.ls("/a"), ["x/"])
+        self.assertEqual(self.fs.ls("/b"), ["y/"])
+        self.assert_consistent()
+    
+    def test_transaction_and_write_are_exclusive(self):
+        """Test transaksi dan write tetap benar di mode thread_safe"""
+        with self.assertRaises(RuntimeError):
+            with self.fs.transaction():
+                self.fs.mkdir("tmp/a/b", recursive=True)
+                raise RuntimeError("abort")
+        self.assertFalse(self.fs.path_exists("/tmp"))
+        
+        def worker(n):
+            for i in range(20):
+                self.fs.append(f"/log{n % 2}.txt", b"x" * 10)
+        
+        self.run_threads(worker, 4)
+        self.assertEqual(self.fs.stat("/log0.txt")["size"], 400)
+        self.assertEqual(len(list(self.fs.iter_find("/", name="log*"))), 2)
+        self.assert_consistent()
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=10, journal=True)
+        self.address = "unix:" + os.path.join(self.tmp_dir, "simfs.sock")
+        self.loop = asyncio.new_event_loop()
+        self.server = FileSystemServer(self.fs)
+        self.loop.run_until_complete(self.server.start(self.address))
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.start()
+        self.clients = []
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        for client in self.clients:
+            client.close()
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def connect(self):
+        client = RemoteFileSystem(self.address, timeout=10)
+        self.clients.append(client)
+        return client
+    
+    def test_sessions_have_own_cwd(self):
+        """Test setiap koneksi punya current directory sendiri"""
+        a, b = self.connect(), self.connect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(a.mkdir("docs"))
+            self.assertTrue(a.cd("docs"))
+            self.assertTrue(a.touch("note.txt", 5))
+            self.assertEqual(b.ls(), ["docs/"])
+        self.assertEqual(a.current_directory, "/docs")
+        self.assertEqual(b.current_directory, "/")
+        self.assertTrue(b.path_exists("/docs/note.txt"))
+    
+    def test_pipelined_requests_answered_in_order(self):
+        """Test banyak request dikirim sekaligus, response urut request"""
+        client = self.connect()
+        calls = [("touch", (f"file{i}.txt", i), {}) for i in range(200)]
+        calls.append(("du", ("/",), {"summarize": True}))
+        responses = client.call_many(calls, echo=False)
+        self.assertTrue(all(response["ok"] for response in responses))
+        self.assertEqual(responses[0]["output"], "File 'file0.txt' created successfully\n")
+        self.assertEqual(responses[-1]["result"][0]["size"], sum(range(200)))
+        self.assertEqual(self.server.stats()["requests"], 201)
+    
+    def test_bytes_and_streams(self):
+        """Test isi biner dan stream lebih besar dari satu chunk"""
+        client = self.connect()
+        data = bytes(range(256)) * 600
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertTrue(client.write("blob.bin", io.BytesIO(data)))
+            self.assertTrue(client.append("blob.bin", b"\x00\xff"))
+        self.assertIn(f"{len(data)} bytes written to 'blob.bin'", output.getvalue())
+        self.assertEqual(client.read("blob.bin", 10, 5), data[10:15])
+        self.assertEqual(b"".join(client.read_stream("blob.bin")), data + b"\x00\xff")
+        self.assertEqual(self.fs.read("/blob.bin"), data + b"\x00\xff")
+    
+    def test_stream_write_bounded_window(self):
+        """Test write stream membaca chunk berikutnya hanya setelah satu window dijawab"""
+        client = self.connect()
+        server = self.server
+        chunks = 2 * PIPELINE_WINDOW + 3
+        
+        class Source:
+            """Stream yang mencatat jumlah chunk yang belum dijawab server"""
+            def __init__(self):
+                self.reads = 0
+                self.outstanding = 0
+                self.base = server.requests
+            
+            def read(self, size):
+                if self.reads == chunks:
+                    return b""
+                self.outstanding = max(self.outstanding, self.reads - (server.requests - self.base))
+                self.reads += 1
+                return bytes([self.reads % 256]) * size
+        
+        source = Source()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(client.write("big.bin", source))
+        self.assertLessEqual(source.outstanding, PIPELINE_WINDOW)
+        self.assertEqual(self.fs.file_system["/big.bin"]["size"], chunks * CHUNK_SIZE)
+        self.assertEqual(self.fs.read("/big.bin", CHUNK_SIZE * chunks - 1, 1), bytes([chunks % 256]))
+    
+    def test_errors_are_raised_on_client(self):
+        """Test exception di server dibangkitkan ulang di client"""
+        client = self.connect()
+        with self.assertRaises(ValueError):
+            client.call("format_disk")
+        with self.assertRaises(re.error):
+            list(client.iter_find("/", regex="("))
+        with self.assertRaises(AttributeError):
+            client.format_disk()
+        self.assertEqual(client.call("cwd"), "/")
+    
+    def test_cli_connect(self):
+        """Test CLI sebagai thin client"""
+        cli = FileSystemCLI(self.connect())
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            cli.execute_command("mkdir", ["-p", "a/b"])
+            cli.execute_command("write", ["a/b/hello.txt", "hi", "there"])
+            cli.execute_command("cd", ["a/b"])
+            cli.execute_command("cat", ["hello.txt"])
+        self.assertIn("hi there\n", output.getvalue())
+        self.assertEqual(cli.get_prompt(), "simfs:/a/b$ ")
+        self.assertEqual(self.fs.read("/a/b/hello.txt"), b"hi there\n")
+
+class TestSharedAccess(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.instances = []
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        for fs in self.instances:
+            fs.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def open(self, **kwargs) -> FileSystemSimulator:
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs = FileSystemSimulator(disk_size=10, data_file="shared.json", shared=True, **kwargs)
+        self.instances.append(fs)
+        return fs
+    
+    def test_changes_are_visible_to_other_instances(self):
+        """Test commit satu instance terlihat di instance lain"""
+        a, b = self.open(), self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            a.mkdir("docs")
+            a.write("docs/a.txt", "hello")
+            self.assertEqual(b.read("docs/a.txt"), b"hello")
+            b.touch("docs/b.txt", 10)
+            self.assertEqual(a.ls("docs"), ["a.txt", "b.txt"])
+        self.assertEqual(a.used_space, 15)
+        self.assertEqual(a.generation, b.generation)
+        self.assertTrue(os.path.exists("shared.lock"))
+        self.assertFalse(a.refresh())
+    
+    def test_sync_applies_only_new_records(self):
+        """Test instance yang tertinggal hanya membaca record journal baru"""
+        a, b = self.open(), self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            a.mkdir("docs")
+            self.assertTrue(b.refresh())
+            a.touch("docs/1.txt")
+            a.touch("docs/2.txt")
+            self.assertTrue(b.refresh())
+            self.assertFalse(b.refresh())
+        self.assertEqual(b.shared.records_applied, 3)
+        self.assertEqual(b.shared.full_reloads, 0)
+        self.assertEqual(b.ls("docs"), ["1.txt", "2.txt"])
+        self.assertEqual(b.find("2.txt"), ["/docs/2.txt"])
+    
+    def test_full_reload_after_foreign_checkpoint(self):
+        """Test load penuh jika record yang terlewat sudah masuk checkpoint"""
+        a, b = self.open(checkpoint_interval=3), self.open(checkpoint_interval=3)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n in range(4):
+                a.touch(f"file{n}")
+            self.assertTrue(b.refresh())
+        self.assertEqual(b.shared.full_reloads, 1)
+        self.assertEqual(b.ls("/"), ["file0", "file1", "file2", "file3"])
+        with open("shared.json") as f:
+            self.assertEqual(json.load(f)["generation"], 3)
+        # Journal baru setelah checkpoint milik a sendiri dibaca incremental
+        with contextlib.redirect_stdout(io.StringIO()):
+            b.touch("file4")
+            self.assertTrue(a.refresh())
+        self.assertEqual(a.shared.full_reloads, 0)
+        self.assertEqual(a.shared.records_applied, 1)
+        self.assertEqual(len(a.ls("/")), 5)
+    
+    def test_current_directory_is_per_process(self):
+        """Test cd tidak di-commit; cwd yang dihapus proses lain kembali ke /"""
+        a, b = self.open(), self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            a.mkdir("docs")
+            generation = a.generation
+            b.cd("docs")
+            self.assertEqual(b.generation, generation)
+            a.mkdir("other")
+            self.assertEqual(b.pwd(), "/docs")
+            a.rm("docs", recursive=True)
+            self.assertEqual(b.pwd(), "/")
+    
+    def test_snapshot_created_elsewhere_records_changes(self):
+        """Test snapshot dari proses lain ikut dicatat saat instance ini menulis"""
+        a, b = self.open(), self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            a.write("a.txt", "before")
+            a.snapshot_create("s1")
+            b.write("a.txt", "after")
+            self.assertTrue(a.snapshot_restore("s1"))
+            self.assertEqual(b.read("a.txt"), b"before")
+    
+    def test_processes_do_not_lose_updates(self):
+        """Test read-modify-write dari beberapa proses tidak kehilangan update"""
+        try:
+            context = multiprocessing.get_context("fork")
+        except ValueError:
+            self.skipTest("fork not available")
+        fs = self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs.write("counter", "0")
+        
+        def worker(n):
+            with contextlib.redirect_stdout(io.StringIO()):
+                fs = FileSystemSimulator(disk_size=10, data_file="shared.json", shared=True,
+                                         checkpoint_interval=20)
+                for i in range(25):
+                    with fs.transaction():
+                        value = int(fs.read("counter"))
+                        fs.write("counter", str(value + 1))
+                    fs.touch(f"w{n}_{i}")
+                fs.close()
+        
+        workers = [context.Process(target=worker, args=(n,)) for n in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+        self.assertEqual([process.exitcode for process in workers], [0] * 4)
+        self.assertEqual(fs.read("counter"), b"100")
+        self.assertEqual(len(fs.ls("/")), 101)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fresh = FileSystemSimulator(disk_size=10, data_file="shared.json")
+        self.assertEqual(fresh.read("counter"), b"100")
+        self.assertEqual(fresh.used_space, fs.used_space)
+    
+    def test_cli_and_gui_share_data_file_by_default(self):
+        """Test proses cli.py dan GUI pada data file default tidak kehilangan update"""
+        try:
+            import gui
+        except ImportError:
+            self.skipTest("tkinter not available")
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+        commands = "; ".join(f"mkdir /cli{{n}}_{i}" for i in range(20))
+        workers = [subprocess.Popen([sys.executable, script, "-c", commands.format(n=n)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                   for n in range(2)]
+        fs = gui.open_filesystem()
+        self.instances.append(fs)
+        for i in range(20):
+            fs.mkdir(f"/gui_{i}")
+        self.assertEqual([process.wait() for process in workers], [0, 0])
+        
+        self.assertEqual(len(fs.ls("/")), 60)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fresh = FileSystemSimulator(quiet=True)
+        self.assertEqual(len(fresh.ls("/")), 60)
+    
+    def test_every_registered_operation_is_wrapped(self):
+        """Test wrapper shared/thread_safe/metrics mengikuti registry operasi"""
+        shared = self.open()
+        with contextlib.redirect_stdout(io.StringIO()):
+            threaded = FileSystemSimulator(disk_size=10, data_file="threaded.json",
+                                           thread_safe=True)
+            measured = FileSystemSimulator(disk_size=10, data_file="measured.json",
+                                           metrics=True)
+        self.instances += [threaded, measured]
+        for name, operation in operations.OPERATIONS.items():
+            self.assertTrue(callable(getattr(FileSystemSimulator, name)), name)
+            self.assertIn(name, threaded.__dict__)
+            self.assertIn(name, measured.__dict__)
+            # Operasi reload dipakai sinkronisasi shared sendiri (tanpa flock)
+            self.assertEqual(name in shared.__dict__, operation.access != operations.RELOAD)
+        self.assertEqual(set(server.OPERATIONS) - set(operations.OPERATIONS), set())
+    
+    def test_binary_checkpoint_stores_generation(self):
+        """Test checkpoint biner (versi 3) menyimpan generation"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs = FileSystemSimulator(disk_size=10, data_file="shared.simfs")
+            fs.mkdir("docs")
+            fs.touch("docs/a.txt")
+        with open("shared.simfs", "rb") as f:
+            self.assertEqual(binary_snapshot.load(f)["generation"], 2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs = FileSystemSimulator(disk_size=10, data_file="shared.simfs", journal=True)
+            fs.touch("docs/b.txt")
+        self.assertEqual(fs.generation, 3)
+        self.assertEqual(FileSystemSimulator(disk_size=10, data_file="shared.simfs").generation, 3)
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_generate_tree_is_deterministic(self):
+        """Test tree sintetis sama untuk seed yang sama dan jumlah entry tepat"""
+        listings = []
+        for name in ("a.json", "b.json"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                fs = FileSystemSimulator(disk_size=10, data_file=name)
+                tree = benchmark.generate_tree(fs, 300, fanout=4, files_per_dir=5,
+                                               size_dist="lognormal", mean_size=100, seed=7)
+            self.assertEqual(tree.entries, 300)
+            self.assertEqual(len(fs.inodes), 301)
+            listings.append(sorted((path, fs.file_system[path]["size"]) for path in fs.file_system))
+        self.assertEqual(listings[0], listings[1])
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs = FileSystemSimulator(disk_size=10, data_file="c.json")
+            benchmark.generate_tree(fs, 300, fanout=4, files_per_dir=5,
+                                    size_dist="lognormal", mean_size=100, seed=8)
+        self.assertNotEqual(listings[0], sorted((path, fs.file_system[path]["size"])
+                                                for path in fs.file_system))
+    
+    def test_max_depth_limits_tree(self):
+        """Test kapasitas tree dibatasi fan-out dan depth"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            fs = FileSystemSimulator(disk_size=10)
+            tree = benchmark.generate_tree(fs, 10000, fanout=1, files_per_dir=1, max_depth=2)
+        self.assertEqual((len(tree.directories), tree.files), (2, 3))
+        self.assertEqual(tree.directories, ["/dir1", "/dir1/dir3"])
+    
+    def test_results_file_and_compare(self):
+        """Test hasil JSON berisi metrik setiap operasi dan regresi terdeteksi"""
+        argv = ["--sizes", "200", "--samples", "5", "--io-samples", "1", "--fanout", "3",
+                "--output", "results.json"]
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(benchmark.main(argv), 0)
+        self.assertIn("Results written to 'results.json'", output.getvalue())
+        with open("results.json") as f:
+            results = json.load(f)
+        self.assertEqual(results["meta"]["config"]["sizes"], [200])
+        [result] = results["results"]
+        self.assertEqual(result["actual_entries"], 200)
+        self.assertEqual(list(result["operations"]), list(benchmark.OPERATIONS))
+        for op in result["operations"].values():
+            self.assertGreater(op["ops_per_second"], 0)
+            self.assertLessEqual(op["p50_ms"], op["p99_ms"])
+            self.assertIn("peak_memory_bytes", op)
+        
+        faster = json.loads(json.dumps(results))
+        faster["results"][0]["operations"]["ls"]["ops_per_second"] *= 10
+        with contextlib.redirect_stdout(io.StringIO()):
+            regressions = benchmark.compare(faster, results, 0.2)
+            self.assertEqual(benchmark.compare(results, results, 0.2), [])
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("ls @ 200"))
+    
+    def test_every_storage_backend(self):
+        """Test harness berjalan untuk setiap pilihan --storage"""
+        for storage in ("snapshot", "image", "sharded"):
+            argv = ["--sizes", "150", "--samples", "3", "--io-samples", "1", "--no-memory",
+                    "--storage", storage, "--output", f"{storage}.json"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(benchmark.main(argv), 0, storage)
+            with open(f"{storage}.json") as f:
+                [result] = json.load(f)["results"]
+            self.assertEqual(result["actual_entries"], 150)
+        # Disk image sparse sebesar disk_size: harus diturunkan dari ukuran tree
+        options = benchmark.parse_args(["--storage", "image"])
+        self.assertLess(benchmark.disk_size_for(options, 1000000), 1 << 20)
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.fs = FileSystemSimulator(disk_size=10, metrics=True)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        self.fs.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def run_quiet(self, *calls):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for name, *args in calls:
+                getattr(self.fs, name)(*args)
+    
+    def test_counts_outermost_operations_only(self):
+        """Test setiap operasi dihitung sekali, termasuk yang memanggil operasi lain"""
+        self.fs.metrics.reset()
+        self.run_quiet(("mkdir", "/a/b/c", True), ("touch", "/a/f"), ("write", "/a/f", "hello"),
+                       ("ls", "/a"), ("ls", "/a"), ("rm", "/missing"))
+        operations = self.fs.metrics.snapshot()["operations"]
+        self.assertEqual(operations["mkdir"]["count"], 1)
+        self.assertEqual(operations["ls"]["count"], 2)
+        self.assertNotIn("path_exists", operations)
+        self.assertEqual(operations["rm"]["failures"], 1)
+        self.assertEqual(operations["write"]["failures"], 0)
+        self.assertGreater(operations["persist"]["count"], 0)
+        for op in operations.values():
+            self.assertLessEqual(op["p50_ms"], op["p99_ms"])
+            self.assertLessEqual(op["p99_ms"], op["max_ms"])
+        resolutions = self.fs.metrics.snapshot()["path_resolutions"]
+        self.assertGreater(resolutions["total"], 0)
+    
+    def test_iterators_and_transactions(self):
+        """Test iterator dicatat saat habis dan transaksi dicatat sebagai satu entri"""
+        self.fs.metrics.reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with self.fs.transaction():
+                self.fs.mkdir("/d")
+                self.fs.write("/d/f", b"x" * (CHUNK_SIZE + 1))
+            chunks = list(self.fs.read_stream("/d/f"))
+            self.assertEqual(sum(map(len, chunks)), CHUNK_SIZE + 1)
+            self.assertEqual(self.fs.read_stream("/missing"), None)
+        operations = self.fs.metrics.snapshot()["operations"]
+        self.assertEqual(operations["transaction"]["count"], 1)
+        self.assertEqual(operations["read_stream"]["count"], 2)
+        self.assertEqual(operations["read_stream"]["failures"], 1)
+        self.assertEqual(operations["persist"]["count"], 1)
+    
+    def test_bytes_persisted_and_export(self):
+        """Test byte yang di-persist terhitung dan export menulis JSON"""
+        self.fs.close()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.fs = FileSystemSimulator(disk_size=10, journal=True, metrics=True)
+        self.run_quiet(("write", "/f", "x" * 1000), ("save_filesystem",))
+        data = self.fs.metrics.snapshot()
+        self.assertGreater(data["bytes_persisted"]["journal"], 0)
+        self.assertGreater(data["bytes_persisted"]["checkpoint"], 0)
+        self.assertGreaterEqual(data["bytes_persisted"]["chunks"], 1000)
+        self.assertEqual(data["operations"]["save_filesystem"]["count"], 1)
+        
+        self.fs.metrics.export("stats.json")
+        with open("stats.json") as f:
+            exported = json.load(f)
+        self.assertEqual(exported["operations"]["write"]["count"], 1)
+        self.assertEqual(exported["bytes_persisted"]["total"], data["bytes_persisted"]["total"])
+    
+    def test_disable_removes_wrappers(self):
+        """Test disable mengembalikan method asli tanpa overhead"""
+        self.assertIn("mkdir", self.fs.__dict__)
+        self.fs.disable_metrics()
+        self.assertIsNone(self.fs.metrics)
+        for name in ("mkdir", "read_stream", "_persist", "transaction"):
+            self.assertNotIn(name, self.fs.__dict__)
+        self.run_quiet(("mkdir", "/a"),)
+        self.assertTrue(self.fs.path_exists("/a"))
+    
+    def test_cli_stats_command(self):
+        """Test perintah stats di CLI"""
+        cli = FileSystemCLI(self.fs)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            cli.execute_command("stats", ["reset"])
+            cli.execute_command("mkdir", ["/a"])
+            cli.execute_command("stats", [])
+            cli.execute_command("stats", ["export", "out.json"])
+            cli.execute_command("stats", ["off"])
+            cli.execute_command("stats", [])
+        text = output.getvalue()
+        self.assertRegex(text, r"mkdir\s+1\s+0")
+        self.assertIn("Metrics exported to 'out.json'", text)
+        self.assertIn("Metrics are disabled", text)
+        self.assertTrue(os.path.exists("out.json"))
+        self.assertNotIn("mkdir", self.fs.__dict__)
+
+
+class TestQuietMode(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=1, quiet=True)
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        self.fs.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_no_output_and_typed_results(self):
+        """Test mode quiet tidak mencetak apa pun dan mengembalikan objek hasil"""
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertTrue(self.fs.mkdir("/docs/sub", recursive=True))
+            self.assertTrue(self.fs.write("/docs/a.txt", "hello"))
+            entries = self.fs.ls("/docs")
+            info = self.fs.stat("/docs")
+            usage = self.fs.df()
+            du = self.fs.du("/", summarize=True)
+            found = self.fs.find("a.txt", "/")
+            self.assertEqual(self.fs.pwd(), "/")
+            self.assertTrue(self.fs.rm("/docs", recursive=True))
+            self.assertEqual(self.fs.ls("/"), [])
+        self.assertEqual(output.getvalue(), "")
+        
+        self.assertTrue(all(isinstance(entry, DirEntry) for entry in entries))
+        self.assertEqual([(e.display_name, e.is_directory, e.size) for e in entries],
+                         [("a.txt", False, 5), ("sub/", True, 0)])
+        self.assertIsInstance(info, StatResult)
+        self.assertEqual((info.type, info.children, info.tree_size), ("directory", 2, 5))
+        self.assertIsInstance(usage, DiskUsage)
+        self.assertEqual((usage.used, usage.total), (5, 1024 * 1024))
+        self.assertEqual(set(usage.to_dict()), {"total", "used", "free", "usage_percent",
+                                                "logical", "physical", "saved", "sparse"})
+        self.assertIsInstance(du[0], UsageEntry)
+        self.assertEqual((du[0].path, du[0].size, du[0].entries), ("/", 5, 3))
+        self.assertEqual(found, ["/docs/a.txt"])
+    
+    def test_typed_errors(self):
+        """Test kegagalan dibangkitkan sebagai subclass FileSystemError"""
+        self.fs.mkdir("/d")
+        self.fs.touch("/d/f")
+        cases = [
+            (lambda: self.fs.mkdir("/d"), errors.PathExistsError, FileExistsError),
+            (lambda: self.fs.rm("/missing"), errors.PathNotFoundError, FileNotFoundError),
+            (lambda: self.fs.rm("/d"), errors.DirectoryNotEmptyError, OSError),
+            (lambda: self.fs.rm("/"), errors.InvalidOperationError, ValueError),
+            (lambda: self.fs.ls("/d/f"), errors.NotDirectoryError, NotADirectoryError),
+            (lambda: self.fs.cp("/d", "/e"), errors.IsDirectoryError, IsADirectoryError),
+            (lambda: self.fs.read("/d"), errors.IsDirectoryError, IsADirectoryError),
+            (lambda: self.fs.touch("/big", size=2 * 1024 * 1024), errors.DiskFullError, OSError),
+            (lambda: self.fs.write("/big", b"x" * (2 * 1024 * 1024)), errors.DiskFullError, OSError),
+            (lambda: self.fs.write("/big", io.BytesIO(b"x" * (2 * 1024 * 1024))),
+             errors.DiskFullError, OSError),
+            (lambda: self.fs.snapshot_restore("nope"), errors.SnapshotError, LookupError),
+        ]
+        for call, error, builtin in cases:
+            with self.assertRaises(error) as context:
+                call()
+            self.assertIsInstance(context.exception, builtin)
+            self.assertIsInstance(context.exception, errors.FileSystemError)
+        self.assertEqual(str(context.exception), "Snapshot 'nope' does not exist")
+        # rm -f tidak menganggap path yang hilang sebagai error
+        self.assertFalse(self.fs.rm("/missing", force=True))
+    
+    def test_error_rolls_back_transaction(self):
+        """Test error di dalam transaksi membatalkan seluruh batch"""
+        with self.assertRaises(errors.PathNotFoundError):
+            with self.fs.transaction():
+                self.fs.mkdir("/a")
+                self.fs.write("/missing/f", "x")
+        self.assertFalse(self.fs.path_exists("/a"))
+    
+    def test_cli_renders_same_output(self):
+        """Test CLI di atas fs quiet menghasilkan output yang sama dengan mode biasa"""
+        commands = [["mkdir", "a", "a/b"], ["touch", "a/f", "a/f"], ["ls", "a"],
+                    ["write", "a/f", "hello"], ["cat", "a/f"], ["rm", "a/missing"],
+                    ["mkdir", "a"], ["du", "a"], ["cp", "-r", "a", "c"], ["mv", "c", "d"],
+                    ["find", "f"], ["rm", "a/b", "nothing"], ["cd", "nowhere"], ["pwd"], ["df"],
+                    ["snapshot", "create", "s1"], ["snapshot", "diff", "s1"],
+                    ["snapshot", "delete", "s2"], ["ls", "a/f"]]
+        outputs = []
+        for quiet in (True, False):
+            directory = os.path.join(self.tmp_dir, str(quiet))
+            os.mkdir(directory)
+            os.chdir(directory)
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                fs = FileSystemSimulator(disk_size=1, quiet=quiet)
+                cli = FileSystemCLI(fs)
+                for command in commands:
+                    cli.execute_command(command[0], command[1:])
+            outputs.append(output.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertIn("Directory 'a' already exists", outputs[0])
+        self.assertIn("'a/missing' does not exist", outputs[0])
+
+
+class TestScriptMode(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=10, quiet=True)
+        self.cli = FileSystemCLI(self.fs)
+        # Hitung berapa kali snapshot penuh ditulis
+        self.saves = 0
+        save = self.fs.save_filesystem
+        def counting_save():
+            self.saves += 1
+            save()
+        self.fs.save_filesystem = counting_save
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        self.fs.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def run_script(self, text, stop_on_error=False):
+        with contextlib.redirect_stdout(io.StringIO()) as output, \
+                contextlib.redirect_stderr(io.StringIO()) as summary:
+            failed = self.cli.run_script(text, stop_on_error)
+        return failed, output.getvalue(), summary.getvalue()
+    
+    def test_parse_script(self):
+        """Test perintah dipisah baris baru dan ';' di luar tanda kutip"""
+        commands, errors = self.cli.parse_script(
+            'mkdir a; touch "a/b; c"\n# komentar\n\n  ls -l a;;pwd\nwrite "x')
+        self.assertEqual(commands, [(1, "mkdir", ["a"]), (1, "touch", ["a/b; c"]),
+                                    (4, "ls", ["-l", "a"]), (4, "pwd", [])])
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("line 5:"))
+        
+        failed, output, summary = self.run_script('mkdir a\nwrite "x')
+        self.assertEqual(failed, 1)
+        self.assertEqual(output, "")
+        self.assertIn("nothing executed", summary)
+        self.assertFalse(self.fs.path_exists("/a"))
+    
+    def test_batch_persists_once(self):
+        """Test seluruh script di-persist sekali walaupun ada error"""
+        script = "\n".join(["mkdir /d"] + [f"touch /d/f{i}" for i in range(50)]
+                           + ["rm /missing", "write /d/f0 hello"])
+        failed, output, summary = self.run_script(script)
+        self.assertEqual(failed, 1)
+        self.assertEqual(self.saves, 1)
+        self.assertIn("'/missing' does not exist", output)
+        self.assertRegex(summary, r"53 command\(s\), 1 failed in [0-9.]+s")
+        with contextlib.redirect_stdout(io.StringIO()):
+            other = FileSystemSimulator(disk_size=10)
+        self.assertEqual(len(other.ls("/d")), 50)
+        self.assertEqual(other.read("/d/f0"), b"hello\n")
+    
+    def test_stop_on_error_and_snapshots(self):
+        """Test --stop-on-error berhenti di perintah gagal; snapshot di luar batch"""
+        script = "mkdir /a; snapshot create s1; touch /a/f\nmv /nope /x\ntouch /b"
+        failed, output, summary = self.run_script(script, stop_on_error=True)
+        self.assertEqual(failed, 1)
+        self.assertIn("Snapshot 's1' created", output)
+        self.assertIn("stopped at line 2", summary)
+        self.assertTrue(self.fs.path_exists("/a/f"))
+        self.assertFalse(self.fs.path_exists("/b"))
+        self.assertEqual(self.fs.snapshot_diff("s1"), [("A", "/a/f")])
+        # Dua batch: sebelum dan sesudah snapshot
+        self.assertEqual(self.saves, 2)
+    
+    def test_failed_write_rolled_back_in_batch(self):
+        """Test write yang gagal di tengah stream tidak meninggalkan isi parsial di batch"""
+        with open("host.bin", "wb") as f:
+            f.write(b"x" * (1024 * 1024))
+        self.fs.touch("/fill", 9 * 1024 * 1024 + 512 * 1024)
+        failed, output, _ = self.run_script("write /a old\nwrite /a -f host.bin\ntouch /after")
+        self.assertEqual(failed, 1)
+        self.assertIn("Not enough disk space", output)
+        self.assertEqual(self.fs.read("/a"), b"old\n")
+        self.assertEqual(self.fs.used_space, 9 * 1024 * 1024 + 512 * 1024 + 4)
+        self.assertTrue(self.fs.path_exists("/after"))
+        self.assertEqual(self.fs.stat("/").tree_size, self.fs.used_space)
+    
+    def test_main_modes(self):
+        """Test cli.py -c, file script, stdin dan exit code"""
+        with open("setup.simfs", "w") as f:
+            f.write("mkdir /etc\nwrite /etc/hosts 127.0.0.1\n")
+        with contextlib.redirect_stdout(io.StringIO()), \
+                contextlib.redirect_stderr(io.StringIO()) as summary:
+            self.assertEqual(cli.main(["setup.simfs"]), 0)
+            self.assertEqual(cli.main(["-c", "touch /etc/a; cat /etc/hosts"]), 0)
+            stdin = sys.stdin
+            sys.stdin = io.StringIO("rm /etc/a\nrm /etc/a\ntouch /etc/b\n")
+            try:
+                self.assertEqual(cli.main(["--stop-on-error", "-"]), 1)
+            finally:
+                sys.stdin = stdin
+        self.assertEqual(summary.getvalue().count("command(s)"), 3)
+        with contextlib.redirect_stdout(io.StringIO()) as output, \
+                contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(cli.main(["-c", "ls /etc"]), 0)
+        self.assertEqual(output.getvalue(), "hosts  \n")
+
+
+class TestBulkCreate(unittest.TestCase):
+    def setUp(self):
+        """Setup untuk setiap test"""
+        self.old_cwd = os.getcwd()
+        self.tmp_dir = tempfile.mkdtemp()
+        os.chdir(self.tmp_dir)
+        self.fs = FileSystemSimulator(disk_size=1, quiet=True)
+        self.cli = FileSystemCLI(self.fs)
+        self.saves = 0
+        save = self.fs.save_filesystem
+        def counting_save():
+            self.saves += 1
+            save()
+        self.fs.save_filesystem = counting_save
+    
+    def tearDown(self):
+        """Cleanup setelah test"""
+        self.fs.close()
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+    
+    def test_mkdir_many(self):
+        """Test mkdir_many membuat semua directory (termasuk parent -p) dengan satu persist"""
+        paths = [f"logs/{year}/{month:02d}" for year in range(2025, 2019, -1) for month in range(1, 13)]
+        self.assertEqual(self.fs.mkdir_many(paths, recursive=True), 1 + 6 + 72)
+        self.assertEqual(self.saves, 1)
+        self.assertEqual(len(self.fs.ls("/logs")), 6)
+        self.assertEqual(self.fs.stat("/logs").tree_count, 78)
+        self.assertEqual(self.fs.inodes[1].tree_count, 79)
+        
+        # Tanpa -p parent harus ada; path yang sudah ada gagal seperti mkdir
+        with self.assertRaises(errors.PathNotFoundError):
+            self.fs.mkdir_many(["/x/y"])
+        with self.assertRaises(errors.PathExistsError):
+            self.fs.mkdir_many(["/new", "/logs/2020"], recursive=True)
+        with self.assertRaises(errors.PathExistsError):
+            self.fs.mkdir_many(["/dup", "/dup"])
+        self.assertFalse(self.fs.path_exists("/new"))
+        self.assertEqual(self.saves, 1)
+    
+    def test_touch_many(self):
+        """Test touch_many: validasi dan cek space sekali untuk seluruh batch"""
+        self.fs.mkdir("/d")
+        self.fs.touch("/d/old")
+        saves = self.saves
+        self.assertEqual(self.fs.touch_many(["/d/a", "/d/b", "/d/old"], [100, 200, 0]), 2)
+        self.assertEqual(self.saves, saves + 1)
+        self.assertEqual(self.fs.used_space, 300)
+        self.assertEqual(self.fs.stat("/d").tree_size, 300)
+        
+        # Masing-masing muat, totalnya tidak: tidak ada yang dibuat
+        half = 600 * 1024
+        with self.assertRaises(errors.DiskFullError):
+            self.fs.touch_many(["/d/c", "/d/e"], [half, half])
+        with self.assertRaises(errors.NotDirectoryError):
+            self.fs.touch_many(["/d/f", "/d/a/g"])
+        with self.assertRaises(errors.InvalidOperationError):
+            self.fs.touch_many(["/d/f"], [1, 2])
+        self.assertEqual(sorted(entry.name for entry in self.fs.ls("/d")), ["a", "b", "old"])
+        self.assertEqual(self.fs.used_space, 300)
+    
+    def test_brace_expansion(self):
+        """Test brace expansion gaya shell di parse_command"""
+        self.assertEqual(cli.expand_braces("logs/{2020..2021}/{01..03}"),
+                         [f"logs/{year}/0{month}" for year in (2020, 2021) for month in (1, 2, 3)])
+        self.assertEqual(cli.expand_braces("a{b,c{1,2}}d"), ["abd", "ac1d", "ac2d"])
+        self.assertEqual(cli.expand_braces("{c..a}{9..11..2}"), ["c9", "c11", "b9", "b11", "a9", "a11"])
+        for literal in ("{a}", "x{}", "{1..b}", "{a,b"):
+            self.assertEqual(cli.expand_braces(literal), [literal])
+        # Brace di dalam kutip atau setelah backslash tidak di-expand
+        self.assertEqual(self.cli.parse_command('touch f{1,2} "g{1,2}" h\\{1,2} \'i{1..2}\''),
+                         ("touch", ["f1", "f2", "g{1,2}", "h{1,2}", "i{1..2}"]))
+        commands, _ = self.cli.parse_script("mkdir d{1,2}; touch 'x;{a,b}'")
+        self.assertEqual(commands, [(1, "mkdir", ["d1", "d2"]), (1, "touch", ["x;{a,b}"])])
+    
+    def test_cli_bulk_and_fallback(self):
+        """Test mkdir -p dengan brace expansion memakai satu batch; path salah tetap per path"""
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.cli.execute_command(*self.cli.parse_command("mkdir -p logs/{2020..2025}/{01..12}"))
+        self.assertEqual(self.saves, 1)
+        self.assertEqual(output.getvalue().count("created successfully"), 72)
+        self.assertTrue(self.fs.path_exists("/logs/2025/12"))
+        
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            ok = self.cli.execute_command("mkdir", ["a", "missing/b", "c"])
+        self.assertFalse(ok)
+        self.assertEqual(output.getvalue(), "Directory 'a' created successfully\n"
+                         "Parent directory '/missing' does not exist\n"
+                         "Directory 'c' created successfully\n")
+
+
 def run_tests():
     """Run all tests"""
     unittest.main(verbosity=2)
 
+
 if __name__ == "__main__":
     run_tests()